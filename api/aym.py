@@ -0,0 +1,15 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import sources
+from core.serverless import JSONHandler
+
+
+class handler(JSONHandler):
+    """Anayasa Mahkemesi norm denetimi kararları ara (/aym)"""
+    route = '/aym'
+
+    def get(self, params):
+        return sources.search_response('aym', params)
@@ -0,0 +1,15 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import documents
+from core.serverless import JSONHandler
+
+
+class handler(JSONHandler):
+    """Anayasa Mahkemesi karar metni getir (/aym/document)"""
+    route = '/aym/document'
+
+    def get(self, params):
+        return documents.document_response('aym', params.get('id', ''), params)
@@ -0,0 +1,15 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import documents
+from core.serverless import JSONHandler
+
+
+class handler(JSONHandler):
+    """Danıştay karar içeriği getir (/danistay/document)"""
+    route = '/danistay/document'
+
+    def get(self, params):
+        return documents.document_response('danistay', params.get('id', ''), params)
@@ -0,0 +1,14 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import mevzuat
+from core.serverless import JSONHandler
+
+
+class handler(JSONHandler):
+    """Kanun maddeleri (/mevzuat); ayrıştırılmış kanunlar core.mevzuat önbelleğinde tutulur"""
+
+    def get(self, params):
+        return mevzuat.sayfa_yaniti(params)
@@ -0,0 +1,14 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import mevzuat
+from core.serverless import JSONHandler
+
+
+class handler(JSONHandler):
+    """Kanun maddesi içeriği (/mevzuat/madde, madde=1,5,10-15 ile birden çok madde)"""
+
+    def get(self, params):
+        return mevzuat.madde_yaniti(params.get('kanun', ''), params.get('madde', ''))
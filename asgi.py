@@ -0,0 +1,225 @@
+"""ASGI sunum modu: app.py ile aynı uçlar, bloklamayan kaynak istekleri.
+
+    uvicorn asgi:app --workers 2
+
+Flask uygulaması her kaynak isteği için bir iş parçacığını bekletir; burada
+istekler core.aio (httpx) ile olay döngüsünde beklenir, HTML/lxml
+ayrıştırması ASYNC_PARSE_WORKERS boyutlu havuzda yapılır. Böylece tek süreç
+yüzlerce kaynak isteğini aynı anda açık tutabilir.
+
+Uç gövdeleri app.py ve api/ ile aynı core işlevleridir (kaynağa gidenlerin
+core.asources karşılıkları); önbellek anahtarları, ETag/304, süresi dolmuş
+yanıt sunma ve sıkıştırma core.responses'tadır. Mevzuat uçları kanunları
+önbellekten/anlık görüntüden sunduğu için senkron kodu aio.run_blocking()
+havuzunda çalıştırır; yerel derlem ve atıf dizini (SQLite) işleri de aynı
+havuzdadır.
+"""
+import contextlib
+import functools
+import os
+import time
+
+from starlette.applications import Starlette
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from core import aio, asources, citations, corpus, mevzuat, metrics
+from core.responses import CACHED, SERVICE_INFO, Reply, ResponseCache, render, render_text
+
+response_cache = ResponseCache()
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+}
+
+# Sık kullanılan kanunlar arka planda indirilip ayrıştırılır ve periyodik olarak yenilenir
+if os.environ.get('MEVZUAT_WARMUP') == '1':
+    from core import warmup
+    warmup.start()
+
+
+# ==================== YANITLAR ====================
+def _reply(request, reply):
+    """core.responses yanıtını Starlette yanıtına çevirir."""
+    status, data, headers = render(reply, request.headers.get('Accept-Encoding'), request.headers.get('If-None-Match'))
+    return Response(data, status, headers=headers)
+
+
+def _json(request, code, payload):
+    return _reply(request, Reply(code, payload))
+
+
+def cached(path):
+    """app.py'deki cached ile aynı: core.responses.CACHED[path] anahtarı, ETag ve 304."""
+    route = CACHED[path]
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def endpoint(request):
+            key = route.key(request.query_params)
+            reply = response_cache.lookup(route, key)
+            if reply is None:
+                reply = response_cache.store(route, key, *await view(request))
+            return _reply(request, reply)
+        return endpoint
+    return decorator
+
+
+# ==================== UÇLAR ====================
+async def index(request):
+    return _json(request, 200, SERVICE_INFO)
+
+
+@cached('/search')
+async def search(request):
+    return await asources.search_response('yargitay', request.query_params)
+
+
+@cached('/search/all')
+async def search_all(request):
+    return await asources.search_all_response(request.query_params)
+
+
+async def search_stream(request):
+    code, lines = asources.stream_response(request.query_params)
+    if code != 200:
+        return _json(request, code, lines)
+    return StreamingResponse(lines, media_type='application/x-ndjson')
+
+
+async def search_local(request):
+    return _json(request, *await aio.run_blocking(corpus.search_response, request.query_params))
+
+
+@cached('/document')
+async def document(request):
+    return await asources.document_response('yargitay', request.query_params.get('id', ''), request.query_params)
+
+
+async def documents(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        body = {}
+    return _json(request, *await asources.documents_response(body or {}, response_cache))
+
+
+@cached('/danistay')
+async def danistay_search(request):
+    return await asources.search_response('danistay', request.query_params)
+
+
+@cached('/danistay/document')
+async def danistay_document(request):
+    return await asources.document_response('danistay', request.query_params.get('id', ''), request.query_params)
+
+
+async def mevzuat_search(request):
+    return _json(request, *await aio.run_blocking(mevzuat.sayfa_yaniti, request.query_params))
+
+
+async def mevzuat_madde(request):
+    args = request.query_params
+    return _json(request, *await aio.run_blocking(mevzuat.madde_yaniti, args.get('kanun', ''), args.get('madde', '')))
+
+
+async def mevzuat_madde_atiflar(request):
+    return _json(request, *await aio.run_blocking(citations.atif_yaniti, request.query_params))
+
+
+@cached('/aym')
+async def aym_search(request):
+    return await asources.search_response('aym', request.query_params)
+
+
+@cached('/aym/document')
+async def aym_document(request):
+    return await asources.document_response('aym', request.query_params.get('id', ''), request.query_params)
+
+
+async def metrics_endpoint(request):
+    data, headers = render_text(metrics.render(), 'text/plain; version=0.0.4', request.headers.get('Accept-Encoding'))
+    return Response(data, headers=headers)
+
+
+# ==================== UYGULAMA ====================
+async def _not_found(request, exc):
+    return _json(request, 404, {"error": "bulunamadı"})
+
+
+async def _method_not_allowed(request, exc):
+    return _json(request, 405, {"error": "yöntem desteklenmiyor"})
+
+
+async def _server_error(request, exc):
+    return _json(request, 500, {"success": False, "error": str(exc)})
+
+
+class RequestTiming:
+    """İstek süresi, Server-Timing dökümü ve CORS başlıkları (app.py'deki before/after_request).
+
+    OPTIONS (CORS ön kontrol) istekleri uca gitmeden yanıtlanır.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        if scope['method'] == 'OPTIONS':
+            return await Response(status_code=200, headers=CORS_HEADERS)(scope, receive, send)
+
+        started = time.perf_counter()
+        token = metrics.start_request()
+
+        async def send_with_headers(message):
+            if message['type'] == 'http.response.start':
+                headers = MutableHeaders(scope=message)
+                headers.update(CORS_HEADERS)
+                elapsed = time.perf_counter() - started
+                # Eşleşen uç, yönlendirici tarafından scope'a yazılır
+                route = scope['path'] if 'endpoint' in scope else 'bilinmeyen'
+                metrics.REQUEST_SECONDS.observe(elapsed, route=route, status=message['status'])
+                if metrics.server_timing_enabled(Headers(scope=scope)):
+                    headers['Server-Timing'] = metrics.server_timing(total=elapsed)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            metrics.end_request(token)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    await aio.close_all()
+    aio.shutdown_executors()
+
+
+app = Starlette(
+    routes=[
+        Route('/', index),
+        Route('/search', search),
+        Route('/search/all', search_all),
+        Route('/search/stream', search_stream),
+        Route('/search/local', search_local),
+        Route('/document', document),
+        Route('/documents', documents, methods=['POST']),
+        Route('/danistay', danistay_search),
+        Route('/danistay/document', danistay_document),
+        Route('/mevzuat', mevzuat_search),
+        Route('/mevzuat/madde', mevzuat_madde),
+        Route('/mevzuat/madde/atiflar', mevzuat_madde_atiflar),
+        Route('/aym', aym_search),
+        Route('/aym/document', aym_document),
+        Route('/metrics', metrics_endpoint),
+    ],
+    exception_handlers={404: _not_found, 405: _method_not_allowed, Exception: _server_error},
+    lifespan=lifespan,
+)
+app.add_middleware(RequestTiming)
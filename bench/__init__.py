@@ -0,0 +1,9 @@
+"""Uç noktalar ve ayrıştırıcılar için yerel, tekrarlanabilir ölçüm araçları.
+
+    python -m bench.run --out sonuc.json
+    python -m bench.run --baseline onceki.json
+    python -m bench.startup --baseline startup-onceki.json
+
+Kaynak sunucular yerine kayıtlı (ya da sentetik) yanıtları sunan yerel bir
+sunucu kullanılır; canlı kaynaklara hiç istek gitmez.
+"""
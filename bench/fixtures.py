@@ -0,0 +1,274 @@
+"""Ölçümlerde sunulan kaynak yanıtları.
+
+bench/fixtures/ altında kayıtlı bir yanıt varsa o kullanılır; kayıtlar
+`python -m bench.fixtures --record` ile canlı kaynaklardan indirilir. Kayıt
+yoksa aynı yapıda ve gerçeğine yakın boyutta sentetik içerik üretilir.
+Sentetik içerik sabit tohumla üretildiği için her çalıştırmada aynıdır;
+sentetik aramalar istenen sayfayı ve sayfa boyutunu uygular, son sayfa
+toplam sonuç sayısında biter. Kayıtlı aramalar her sayfa için aynı yanıtı
+döndürür.
+"""
+import argparse
+import base64
+import functools
+import json
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Kanun no: (ad, kısaltma, yaklaşık madde sayısı)
+KANUNLAR = {
+    '5237': ('TÜRK CEZA KANUNU', 'TCK', 345),
+    '6098': ('TÜRK BORÇLAR KANUNU', 'TBK', 649),
+    '6102': ('TÜRK TİCARET KANUNU', 'TTK', 1535),
+}
+
+_KELIMELER = (
+    "mahkeme karar dava davacı davalı tazminat işçilik alacağı hüküm temyiz bozma onama "
+    "gerekçe delil bilirkişi rapor yasa madde fıkra uyarınca hakkında ilişkin tarafından "
+    "sözleşme borç alacaklı borçlu faiz zarar kusur sorumluluk süre içinde yerinde "
+    "görülmediğinden reddine kabulüne oybirliğiyle oyçokluğuyla karar verildi idare işlem "
+    "iptal yürütmenin durdurulması kamu görevlisi ceza hapis adli para suç fail mağdur"
+).split()
+
+ORNEK_KAYITLAR = {
+    'bedesten_search.json': 'Bedesten searchDocuments yanıtı (20 karar)',
+    'bedesten_document.json': 'Bedesten getDocumentContent yanıtı',
+    'danistay_search.json': 'Danıştay aramalist yanıtı (20 karar)',
+    'danistay_document.html': 'Danıştay getDokuman sayfası',
+    'aym_ara.html': 'AYM /Ara sonuç sayfası',
+    'aym_document.html': 'AYM karar sayfası',
+    **{f'mevzuat_{no}.html': f'{kisaltma} ({no}) tam metni' for no, (_, kisaltma, _) in KANUNLAR.items()},
+}
+
+
+def _recorded(name):
+    path = os.path.join(FIXTURE_DIR, name)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    return None
+
+
+def kaynak(name):
+    """Yanıtın kayıtlı mı sentetik mi olduğunu döndürür."""
+    return 'recorded' if os.path.exists(os.path.join(FIXTURE_DIR, name)) else 'synthetic'
+
+
+def _cumle(rng, words):
+    text = ' '.join(rng.choice(_KELIMELER) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def _paragraf(rng, sentences):
+    return ' '.join(_cumle(rng, rng.randint(8, 20)) for _ in range(sentences))
+
+
+# Sentetik aramalardaki toplam sonuç sayıları; sayfalar bu toplama göre kesilir
+BEDESTEN_TOTAL = 48213
+DANISTAY_TOTAL = 9120
+AYM_TOTAL = 1482
+AYM_PAGE_SIZE = 10
+
+
+def _sayfa(total, page, page_size):
+    """page. sayfadaki kayıtların [başlangıç, bitiş) sırası; toplamı aşan sayfa boştur."""
+    start = min(max(page - 1, 0) * page_size, total)
+    return start, min(start + page_size, total)
+
+
+@functools.lru_cache(maxsize=256)
+def bedesten_search(page=1, page_size=20):
+    recorded = _recorded('bedesten_search.json')
+    if recorded is not None:
+        return recorded
+    start, stop = _sayfa(BEDESTEN_TOTAL, page, page_size)
+    rng = random.Random(f'bedesten-{page}-{page_size}')
+    karar_list = [
+        {
+            "documentId": str(1000000 + i),
+            "birimAdi": f"{rng.randint(1, 23)}. Hukuk Dairesi",
+            "esasNo": f"2023/{rng.randint(1, 9999)}",
+            "kararNo": f"2024/{rng.randint(1, 9999)}",
+            "kararTarihiStr": f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.2024",
+            "itemType": {"name": "YARGITAYKARARI", "description": "Yargıtay Kararı"},
+        }
+        for i in range(start, stop)
+    ]
+    body = {"data": {"emsalKararList": karar_list, "total": BEDESTEN_TOTAL, "start": start},
+            "metadata": {"FMTY": "SUCCESS"}}
+    return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+
+def _karar_html(rng, paragraphs):
+    parts = ['<html><head><style>p{margin:0}</style></head><body>']
+    parts.append('<p align="center"><b>T.C.<br>YARGITAY<br>9. HUKUK DAİRESİ</b></p>')
+    parts.append(f'<p><b>ESAS NO:</b> 2023/{rng.randint(1, 9999)} <b>KARAR NO:</b> 2024/{rng.randint(1, 9999)}</p>')
+    for _ in range(paragraphs):
+        parts.append(f'<p style="text-align:justify"><span style="font-family:Times New Roman">'
+                     f'{_paragraf(rng, rng.randint(3, 8))}</span></p>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+@functools.lru_cache(maxsize=None)
+def bedesten_document():
+    recorded = _recorded('bedesten_document.json')
+    if recorded is not None:
+        return recorded
+    html = _karar_html(random.Random(2), 60)
+    content = base64.b64encode(html.encode('utf-8')).decode('ascii')
+    body = {"data": {"content": content, "mimeType": "text/html", "version": 0}, "metadata": {"FMTY": "SUCCESS"}}
+    return json.dumps(body).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=256)
+def danistay_search(page=1, page_size=20):
+    recorded = _recorded('danistay_search.json')
+    if recorded is not None:
+        return recorded
+    start, stop = _sayfa(DANISTAY_TOTAL, page, page_size)
+    rng = random.Random(f'danistay-{page}-{page_size}')
+    rows = [
+        {
+            "id": f"{i:04x}{rng.getrandbits(48):012x}",
+            "dpiDaire": f"{rng.randint(1, 15)}. Daire",
+            "esasNo": f"2022/{rng.randint(1, 9999)}",
+            "kararNo": f"2024/{rng.randint(1, 9999)}",
+            "kararTarihi": f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.2024",
+            "konu": _cumle(rng, 30),
+        }
+        for i in range(start, stop)
+    ]
+    body = {"data": {"data": rows, "recordsTotal": DANISTAY_TOTAL, "recordsFiltered": DANISTAY_TOTAL}}
+    return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=None)
+def danistay_document():
+    recorded = _recorded('danistay_document.html')
+    if recorded is not None:
+        return recorded
+    rng = random.Random(4)
+    chrome = '<script>' + 'var x=1;' * 2000 + '</script><div class="menu">' + '<a href="#">Bağlantı</a>' * 200 + '</div>'
+    return (chrome + _karar_html(rng, 80)).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=256)
+def aym_search(page=1):
+    recorded = _recorded('aym_ara.html')
+    if recorded is not None:
+        return recorded
+    start, stop = _sayfa(AYM_TOTAL, page, AYM_PAGE_SIZE)
+    rng = random.Random(f'aym-{page}')
+    parts = ['<html><head><title>Norm Denetimi</title>',
+             '<script>' + 'function f(){return 1};' * 1500 + '</script></head><body>',
+             '<div class="menu">' + '<a href="/Ara?x=1">Filtre</a>' * 300 + '</div>',
+             f'<div class="bulunankararsayisi">{AYM_TOTAL} Karar Bulundu</div>']
+    for i in range(start, stop):
+        esas = f"E. {rng.randint(2010, 2023)}/{rng.randint(1, 200)}, K. {rng.randint(2011, 2024)}/{rng.randint(1, 200)}"
+        parts.append(
+            f'<div class="birkarar"><div class="bkararbaslik"><a href="/ND/2024/{i + 1}">{esas}</a></div>'
+            f'<div class="kararbilgileri"><span>Norm Denetimi</span><span>İtiraz Yolu</span>'
+            f'<span>İptal</span><span>Karar Tarihi: {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2024</span></div>'
+            f'<div class="kararozet">{_paragraf(rng, 4)}</div></div>'
+        )
+    parts.append('</body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=None)
+def aym_document():
+    recorded = _recorded('aym_document.html')
+    if recorded is not None:
+        return recorded
+    rng = random.Random(7)
+    chrome = ('<html><head><script>' + 'function g(){return 2};' * 1500 + '</script></head><body>'
+              '<div class="menu">' + '<a href="/Ara?x=1">Filtre</a>' * 300 + '</div>')
+    body = ''.join(f'<p>{_paragraf(rng, rng.randint(3, 8))}</p>' for _ in range(150))
+    return (chrome + f'<div class="KararMetni">{body}</div></body></html>').encode('utf-8')
+
+
+@functools.lru_cache(maxsize=None)
+def mevzuat(kanun_no):
+    recorded = _recorded(f'mevzuat_{kanun_no}.html')
+    if recorded is not None:
+        return recorded
+    title, _, count = KANUNLAR.get(kanun_no, KANUNLAR['5237'])
+    rng = random.Random(int(kanun_no) if kanun_no.isdigit() else 6)
+    sira = ('BİRİNCİ', 'İKİNCİ', 'ÜÇÜNCÜ', 'DÖRDÜNCÜ', 'BEŞİNCİ', 'ALTINCI', 'YEDİNCİ', 'SEKİZİNCİ')
+    parts = [f'<html><body><div class="mevzuatBaslik">{title}</div>']
+    for no in range(1, count + 1):
+        if no % 200 == 1:
+            parts.append(f'<p class="MsoNormal" align="center"><b>{sira[no // 200 % len(sira)]} KİTAP</b></p>'
+                         f'<p class="MsoNormal" align="center"><b>{_cumle(rng, 3)}</b></p>')
+        if no % 40 == 1:
+            parts.append(f'<p class="MsoNormal" align="center"><b>{sira[no // 40 % len(sira)]} BÖLÜM</b></p>'
+                         f'<p class="MsoNormal" align="center"><b>{_cumle(rng, 3)}</b></p>')
+        # Madde başlıkları cümle değildir, nokta ile bitmez
+        parts.append(f'<p class="MsoNormal"><b>{_cumle(rng, 3)[:-1]}</b></p>')
+        fikralar = rng.randint(1, 4)
+        for fikra in range(1, fikralar + 1):
+            prefix = f'<b>MADDE {no}-</b> ' if fikra == 1 else ''
+            parts.append(f'<p class="MsoNormal">{prefix}({fikra}) {_paragraf(rng, rng.randint(1, 3))}</p>')
+            if rng.random() < 0.2:
+                for harf in 'abc'[:rng.randint(1, 3)]:
+                    parts.append(f'<p class="MsoNormal">{harf}) {_cumle(rng, 12)}</p>')
+    parts.append('<p class="MsoNormal"><b>Geçici hüküm</b></p>'
+                 f'<p class="MsoNormal"><b>Geçici Madde 1-</b> (1) {_paragraf(rng, 2)}</p>')
+    parts.append('</body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+def record():
+    """Örnek yanıtları canlı kaynaklardan indirip bench/fixtures/ altına yazar."""
+    from core import http, sources
+    from core.mevzuat import HEADERS as MEVZUAT_HEADERS, MEVZUAT_URL
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+
+    def save(name, body):
+        with open(os.path.join(FIXTURE_DIR, name), 'wb') as f:
+            f.write(body)
+        print(f"{name}: {len(body)} bayt")
+
+    search = {"data": {"pageSize": 20, "pageNumber": 1, "itemTypeList": ["YARGITAYKARARI"], "phrase": "tazminat",
+                       "sortFields": ["KARAR_TARIHI"], "sortDirection": "desc"},
+              "applicationName": "UyapMevzuat", "paging": True}
+    body = http.post_json(sources.BEDESTEN_SEARCH_URL, search, headers=sources.BEDESTEN_HEADERS).body
+    save('bedesten_search.json', body)
+    doc_id = json.loads(body)['data']['emsalKararList'][0]['documentId']
+    save('bedesten_document.json', http.post_json(
+        sources.BEDESTEN_DOCUMENT_URL, {"data": {"documentId": doc_id}, "applicationName": "UyapMevzuat"},
+        headers=sources.BEDESTEN_HEADERS).body)
+
+    search = {"data": {"andKelimeler": ['"tazminat"'], "orKelimeler": [], "notAndKelimeler": [],
+                       "notOrKelimeler": [], "pageSize": 20, "pageNumber": 1}}
+    body = http.post_json(sources.DANISTAY_SEARCH_URL, search, headers=sources.DANISTAY_HEADERS).body
+    save('danistay_search.json', body)
+    doc_id = json.loads(body)['data']['data'][0]['id']
+    save('danistay_document.html', http.get(sources.DANISTAY_DOCUMENT_URL.format(doc_id=doc_id),
+                                            headers=sources.DANISTAY_DOCUMENT_HEADERS).body)
+
+    body = http.get(f"{sources.AYM_BASE_URL}/Ara?KelimeAra[]=m%C3%BClkiyet", headers=sources.AYM_HEADERS).body
+    save('aym_ara.html', body)
+    doc_id = sources.parse_aym_search(body.decode('utf-8'))['decisions'][0]['id']
+    save('aym_document.html', http.get(f"{sources.AYM_BASE_URL}/{doc_id}", headers=sources.AYM_HEADERS).body)
+    for kanun_no in KANUNLAR:
+        save(f'mevzuat_{kanun_no}.html', http.get(MEVZUAT_URL.format(kanun_no=kanun_no), headers=MEVZUAT_HEADERS).body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ölçüm yanıtlarını listele ya da canlı kaynaklardan kaydet")
+    parser.add_argument('--record', action='store_true', help="canlı kaynaklardan indirip bench/fixtures/ altına yaz")
+    args = parser.parse_args(argv)
+    if args.record:
+        record()
+        return
+    for name, description in ORNEK_KAYITLAR.items():
+        print(f"{name:28} {kaynak(name):10} {description}")
+
+
+if __name__ == '__main__':
+    main()
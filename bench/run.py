@@ -0,0 +1,343 @@
+"""Ayrıştırıcı ve uç nokta ölçümleri; sonuçları JSON olarak yazar.
+
+Örnek:
+    python -m bench.run --out bench-sonuc.json
+    python -m bench.run --only document,mevzuat_madde --requests 500 --concurrency 16
+    python -m bench.run --baseline bench-onceki.json
+
+Ayrıştırma ölçümleri her işlev için çağrı süresi yüzdeliklerini ve
+tracemalloc ile tepe bellek kullanımını verir. Uç nokta ölçümleri Flask
+uygulamasını ve api/ işleyicilerini yerel HTTP sunucularında çalıştırır,
+kaynak yerine bench.upstream'i kullanır; istek/saniye ve gecikme
+yüzdeliklerini verir. Arama ve karar istekleri her seferinde farklı
+parametreyle yapılır, yani yanıt önbelleği atlanır ve soğuk yol ölçülür.
+"""
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench import fixtures, upstream  # noqa: E402
+
+
+def percentile(sorted_values, p):
+    """Sıralı listede en yakın sıra yöntemiyle p. yüzdelik."""
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def _summary(samples_ms):
+    samples = sorted(samples_ms)
+    return {
+        "p50": round(percentile(samples, 50), 3),
+        "p90": round(percentile(samples, 90), 3),
+        "p99": round(percentile(samples, 99), 3),
+        "max": round(samples[-1], 3),
+        "mean": round(sum(samples) / len(samples), 3),
+    }
+
+
+# ==================== AYRIŞTIRMA ====================
+def parse_cases():
+    """(ad, girdi boyutu, çağrılabilir) üçlüleri; girdiler önceden hazırlanır."""
+    from core import sources
+    from core.mevzuat import parse_kanun
+    from core.text import b64_html_to_text, html_to_text
+
+    content_b64 = json.loads(fixtures.bedesten_document())['data']['content']
+    danistay_html = fixtures.danistay_document()
+    aym_html = fixtures.aym_search().decode('utf-8')
+    aym_document_html = fixtures.aym_document().decode('utf-8')
+
+    cases = [
+        ('document', len(content_b64),
+         lambda: b64_html_to_text(content_b64, sources.CONTENT_LIMITS['yargitay'])),
+        ('document[full]', len(content_b64), lambda: b64_html_to_text(content_b64)),
+        ('danistay_document', len(danistay_html),
+         lambda: html_to_text(danistay_html, sources.CONTENT_LIMITS['danistay'])),
+        ('aym_search', len(aym_html), lambda: sources.parse_aym_search(aym_html)),
+        ('aym_document', len(aym_document_html),
+         lambda: sources.parse_aym_document(aym_document_html, sources.CONTENT_LIMITS['aym'])),
+    ]
+    for kanun_no, (_, kisaltma, _) in fixtures.KANUNLAR.items():
+        html = fixtures.mevzuat(kanun_no).decode('utf-8')
+        cases.append((f'mevzuat_search[{kisaltma}]', len(html),
+                      lambda kanun_no=kanun_no, html=html: parse_kanun(kanun_no, html)))
+
+        kanun = parse_kanun(kanun_no, html)
+        numbers = [m['no'] for m in kanun.maddeler]
+        # Tek ölçüm kanunun bütün maddelerine sırayla bakar
+        cases.append((f'mevzuat_madde[{kisaltma}]x{len(numbers)}', len(kanun.full_text),
+                      lambda kanun=kanun, numbers=numbers: [kanun.madde(no) for no in numbers]))
+    return cases
+
+
+def bench_parse(only=None, repeat=20):
+    results = []
+    for name, size, fn in parse_cases():
+        if only and name.split('[')[0] not in only:
+            continue
+        fn()  # ısınma
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results.append({
+            "name": name,
+            "input_bytes": size,
+            "repeat": repeat,
+            "time_ms": _summary(samples),
+            "peak_memory_kb": round(peak / 1024, 1),
+        })
+    return results
+
+
+# ==================== UÇ NOKTALAR ====================
+def endpoint_cases():
+    """(ad, sunucu, yol üreticisi) üçlüleri; sunucu 'app' ya da 'api/<dosya>'."""
+    return [
+        ('search', 'app', lambda i: f'/search?keyword=bench{i}'),
+        ('search_all', 'app', lambda i: f'/search/all?keyword=bench{i}'),
+        ('document', 'app', lambda i: f'/document?id=bench{i}'),
+        ('danistay', 'app', lambda i: f'/danistay?keyword=bench{i}'),
+        ('danistay_document', 'app', lambda i: f'/danistay/document?id=bench{i}'),
+        ('mevzuat_search', 'app', lambda i: f'/mevzuat?no=6102&page={i % 30 + 1}'),
+        ('mevzuat_madde', 'app', lambda i: f'/mevzuat/madde?kanun=TTK&madde={i % 1500 + 1}'),
+        ('aym_search', 'app', lambda i: f'/aym?keyword=bench{i}'),
+        ('aym_document', 'app', lambda i: f'/aym/document?id=ND/2024/{i + 1000}'),
+        ('api/search', 'api/search', lambda i: f'/api/search?keyword=bench{i}'),
+        ('api/document', 'api/document', lambda i: f'/api/document?id=bench{i}'),
+        ('api/danistay', 'api/danistay', lambda i: f'/api/danistay?keyword=bench{i}'),
+        ('api/danistay_document', 'api/danistay_document', lambda i: f'/api/danistay/document?id=bench{i}'),
+        ('api/mevzuat', 'api/mevzuat', lambda i: f'/api/mevzuat?no=6102&page={i % 30 + 1}'),
+        ('api/mevzuat_madde', 'api/mevzuat_madde', lambda i: f'/api/mevzuat/madde?kanun=TTK&madde={i % 1500 + 1}'),
+        ('api/aym', 'api/aym', lambda i: f'/api/aym?keyword=bench{i}'),
+        ('api/aym_document', 'api/aym_document', lambda i: f'/api/aym/document?id=ND/2024/{i + 1000}'),
+    ]
+
+
+def _serve_app():
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    import app as flask_app
+
+    class Handler(WSGIRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Kalıcı bağlantıda Nagle + gecikmeli ACK beklemesi ölçülmesin (bkz. bench.upstream)
+        disable_nagle_algorithm = True
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, flask_app.app, threaded=True, request_handler=Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _serve_api(name):
+    path = os.path.join(ROOT, 'api', f'{name}.py')
+    spec = importlib.util.spec_from_file_location(f'bench_api_{name}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    class Handler(module.handler):
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _load(port, paths, concurrency):
+    """Yolları `concurrency` iş parçacığıyla ister; (gecikmeler_ms, hatalar, süre_s) döndürür."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    queue = iter(paths)
+
+    def worker():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        while True:
+            with lock:
+                path = next(queue, None)
+            if path is None:
+                break
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                body = response.read()
+                ok = response.status == 200 and b'"success": false' not in body and b'"success":false' not in body
+                error = None if ok else f'{response.status} {body[:120]!r}'
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                error = f'{type(e).__name__}: {e}'
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if error:
+                    errors.append(error)
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def bench_endpoints(only=None, requests=200, concurrency=8, warmup=5):
+    servers = {}
+    results = []
+    try:
+        for name, target, make_path in endpoint_cases():
+            if only and name not in only:
+                continue
+            if target not in servers:
+                servers[target] = _serve_app() if target == 'app' else _serve_api(target.split('/', 1)[1])
+            port = servers[target].server_address[1]
+
+            # Isınma; ilk mevzuat isteği kanunu indirip ayrıştırır
+            _load(port, [make_path(-i - 1) for i in range(warmup)], 1)
+            latencies, errors, elapsed = _load(port, [make_path(i) for i in range(requests)], concurrency)
+            results.append({
+                "name": name,
+                "path": make_path(0),
+                "requests": requests,
+                "concurrency": concurrency,
+                "errors": len(errors),
+                "first_error": errors[0] if errors else None,
+                "elapsed_s": round(elapsed, 3),
+                "rps": round(requests / elapsed, 1),
+                "latency_ms": _summary(latencies),
+            })
+    finally:
+        for server in servers.values():
+            server.shutdown()
+    return results
+
+
+# ==================== ÇIKTI ====================
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(result, baseline):
+    """Önceki bir sonuçla karşılaştırma satırları (p50 süre ve istek/saniye oranları)."""
+    lines = []
+    before = {r['name']: r for r in baseline.get('parse', [])}
+    for r in result.get('parse', []):
+        old = before.get(r['name'])
+        if old:
+            ratio = r['time_ms']['p50'] / old['time_ms']['p50'] if old['time_ms']['p50'] else float('inf')
+            lines.append(f"parse    {r['name']:32} p50 {old['time_ms']['p50']:>10.3f} -> "
+                         f"{r['time_ms']['p50']:>10.3f} ms  x{ratio:.2f}")
+    before = {r['name']: r for r in baseline.get('endpoints', [])}
+    for r in result.get('endpoints', []):
+        old = before.get(r['name'])
+        if old:
+            ratio = r['rps'] / old['rps'] if old['rps'] else float('inf')
+            lines.append(f"endpoint {r['name']:32} rps {old['rps']:>10.1f} -> {r['rps']:>10.1f}     x{ratio:.2f}")
+    return lines
+
+
+def _report(result):
+    lines = []
+    for r in result['parse']:
+        t = r['time_ms']
+        lines.append(f"parse    {r['name']:32} p50 {t['p50']:>10.3f} ms  p90 {t['p90']:>10.3f} ms  "
+                     f"peak {r['peak_memory_kb']:>9.1f} KB")
+    for r in result['endpoints']:
+        t = r['latency_ms']
+        lines.append(f"endpoint {r['name']:32} {r['rps']:>8.1f} rps  p50 {t['p50']:>8.2f} ms  "
+                     f"p99 {t['p99']:>8.2f} ms  hata {r['errors']}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="yargi-api ayrıştırıcı ve uç nokta ölçümleri")
+    parser.add_argument('--only', default='', help="virgülle ayrılmış ölçüm adları (örn. document,mevzuat_madde)")
+    parser.add_argument('--skip-parse', action='store_true', help="ayrıştırma ölçümlerini atla")
+    parser.add_argument('--skip-endpoints', action='store_true', help="uç nokta ölçümlerini atla")
+    parser.add_argument('--repeat', type=int, default=20, help="ayrıştırma ölçümü başına tekrar")
+    parser.add_argument('--requests', type=int, default=200, help="uç nokta başına istek")
+    parser.add_argument('--concurrency', type=int, default=8, help="eşzamanlı istemci sayısı")
+    parser.add_argument('--upstream-delay', type=float, default=0.0, help="yerel kaynak gecikmesi (ms)")
+    parser.add_argument('--out', help="JSON sonucun yazılacağı dosya (varsayılan: stdout)")
+    parser.add_argument('--baseline', help="karşılaştırılacak önceki JSON sonuç")
+    args = parser.parse_args(argv)
+    only = {name.strip() for name in args.only.split(',') if name.strip()}
+
+    # Kaynak adresleri core modülleri içe aktarılmadan önce yerel sunuculara çevrilir;
+    # her kaynağa ayrı port verilir ki ölçümler kaynak bazında ayrışsın
+    servers = []
+    for name in ('BEDESTEN_BASE_URL', 'DANISTAY_BASE_URL', 'AYM_BASE_URL', 'MEVZUAT_BASE_URL'):
+        server, os.environ[name] = upstream.start(delay=args.upstream_delay / 1000)
+        servers.append(server)
+    os.environ.pop('CORPUS_PATH', None)
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'memory'
+
+    result = {
+        "meta": {
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "upstream_delay_ms": args.upstream_delay,
+            "fixtures": {name: fixtures.kaynak(name) for name in fixtures.ORNEK_KAYITLAR},
+        },
+        "parse": [] if args.skip_parse else bench_parse(only, args.repeat),
+        "endpoints": [] if args.skip_endpoints else bench_endpoints(only, args.requests, args.concurrency),
+    }
+    for server in servers:
+        server.shutdown()
+
+    for line in _report(result):
+        print(line, file=sys.stderr)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            for line in compare(result, json.load(f)):
+                print(line, file=sys.stderr)
+
+    output = json.dumps(result, ensure_ascii=False, indent=1)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Soğuk başlangıç ölçümü: uygulamanın ve her api/ fonksiyonunun içe aktarılma süresi.
+
+Örnek:
+    python -m bench.startup --out startup.json
+    python -m bench.startup --root /tmp/onceki --out startup-onceki.json
+    python -m bench.startup --baseline startup-onceki.json
+
+Her hedef, her tekrarda yeni bir Python sürecinde yüklenir (Vercel'in
+soğuk başlangıcı gibi); süreler bu süreçlerin medyanıdır. Yükleme
+sırasında ağır modüllerin (flask, lxml) içe aktarılıp aktarılmadığı ve
+TLS bağlamı kurulup kurulmadığı da raporlanır. --root ile başka bir
+çalışma ağacı (örn. `git worktree add /tmp/onceki HEAD~1`) ölçülebilir.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Alt süreçte çalışan yükleyici: hedefi içe aktarır, süreyi ve yüklenen modülleri yazar
+_LOADER = r'''
+import importlib.util, json, sys, time
+root, target = sys.argv[1], sys.argv[2]
+sys.path.insert(0, root)
+before = set(sys.modules)
+start = time.perf_counter()
+if target == 'app':
+    import app
+else:
+    spec = importlib.util.spec_from_file_location('handler_' + target.replace('/', '_'), f'{root}/{target}.py')
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+elapsed = time.perf_counter() - start
+http = sys.modules.get('core.http')
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "modules": len(set(sys.modules) - before),
+    "flask": 'flask' in sys.modules,
+    "lxml": 'lxml.html' in sys.modules or 'lxml.etree' in sys.modules,
+    "bs4": 'bs4' in sys.modules,
+    "ssl_context": bool(getattr(http, '_contexts', None) or getattr(http, '_default_context', None)),
+}))
+'''
+
+
+def targets(root):
+    """Ölçülecek hedefler: 'app' ve kökteki api/*.py dosyaları."""
+    names = ['app'] if os.path.exists(os.path.join(root, 'app.py')) else []
+    api = os.path.join(root, 'api')
+    if os.path.isdir(api):
+        names += sorted(f'api/{name[:-3]}' for name in os.listdir(api) if name.endswith('.py'))
+    return names
+
+
+def measure(root, target, repeat):
+    samples = []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-c', _LOADER, root, target], cwd=root,
+                              capture_output=True, text=True, timeout=60)
+        if proc.returncode != 0:
+            return {"name": target, "error": proc.stderr.strip().splitlines()[-1:]}
+        samples.append(json.loads(proc.stdout))
+    times = sorted(s['import_ms'] for s in samples)
+    result = {
+        "name": target,
+        "repeat": repeat,
+        "import_ms": {
+            "p50": round(statistics.median(times), 2),
+            "min": round(times[0], 2),
+            "max": round(times[-1], 2),
+        },
+    }
+    result.update({key: samples[-1][key] for key in ('modules', 'flask', 'lxml', 'bs4', 'ssl_context')})
+    return result
+
+
+def compare(result, baseline):
+    lines = []
+    before = {r['name']: r for r in baseline.get('startup', []) if 'import_ms' in r}
+    for r in result['startup']:
+        old = before.get(r['name'])
+        if old and 'import_ms' in r:
+            new_ms, old_ms = r['import_ms']['p50'], old['import_ms']['p50']
+            ratio = new_ms / old_ms if old_ms else float('inf')
+            lines.append(f"startup  {r['name']:28} p50 {old_ms:>9.2f} -> {new_ms:>9.2f} ms  x{ratio:.2f}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="yargi-api soğuk başlangıç (içe aktarma) ölçümü")
+    parser.add_argument('--root', default=ROOT, help="ölçülecek çalışma ağacı (varsayılan: bu depo)")
+    parser.add_argument('--only', default='', help="virgülle ayrılmış hedefler (örn. app,api/search)")
+    parser.add_argument('--repeat', type=int, default=15, help="hedef başına yeni süreç sayısı")
+    parser.add_argument('--out', help="JSON sonucun yazılacağı dosya (varsayılan: stdout)")
+    parser.add_argument('--baseline', help="karşılaştırılacak önceki JSON sonuç")
+    args = parser.parse_args(argv)
+    root = os.path.abspath(args.root)
+    only = {name.strip() for name in args.only.split(',') if name.strip()}
+
+    result = {
+        "root": root,
+        "python": sys.version.split()[0],
+        "startup": [measure(root, target, args.repeat) for target in targets(root)
+                    if not only or target in only],
+    }
+
+    for r in result['startup']:
+        if 'error' in r:
+            print(f"startup  {r['name']:28} hata: {r['error']}", file=sys.stderr)
+            continue
+        flags = ' '.join(name for name in ('flask', 'lxml', 'bs4', 'ssl_context') if r[name])
+        print(f"startup  {r['name']:28} p50 {r['import_ms']['p50']:>9.2f} ms  modül {r['modules']:>4}  "
+              f"{flags}", file=sys.stderr)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            for line in compare(result, json.load(f)):
+                print(line, file=sys.stderr)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Bedesten, Danıştay, mevzuat.gov.tr ve AYM yerine geçen yerel sunucu.
+
+Kaynakların kullandığımız yollarına bench.fixtures yanıtlarını döndürür.
+Kalıcı bağlantıları (HTTP/1.1) destekler; `delay` ile kaynak gecikmesi,
+`max_page_size` ile kaynağın sayfa boyutunu sınırlaması taklit edilebilir.
+Arama yanıtları istekteki sayfa numarasına ve sayfa boyutuna göre üretilir.
+"""
+import json
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench import fixtures
+
+
+class UpstreamServer(ThreadingHTTPServer):
+    # ASGI modunda yüzlerce eşzamanlı bağlantı açılabilir; varsayılan kuyruk (5) bağlantıları düşürür
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Kalıcı bağlantıda küçük yanıtlar Nagle + gecikmeli ACK yüzünden ~40 ms bekler;
+    # kapatılmazsa gecikme ölçümleri bu beklemeyi ölçer
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, body, content_type):
+        delay = self.server.delay
+        if delay:
+            time.sleep(delay)
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_found(self):
+        self.send_response(404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _paging(self, data):
+        """İstek gövdesindeki (sayfa, sayfa boyutu); sayfa boyutu max_page_size ile sınırlanır."""
+        data = data.get('data') or {}
+        page_size = int(data.get('pageSize') or 10)
+        if self.server.max_page_size:
+            page_size = min(page_size, self.server.max_page_size)
+        return int(data.get('pageNumber') or 1), page_size
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            data = {}
+        path = urllib.parse.urlsplit(self.path).path
+        if path == '/emsal-karar/searchDocuments':
+            self._reply(fixtures.bedesten_search(*self._paging(data)), 'application/json')
+        elif path == '/emsal-karar/getDocumentContent':
+            self._reply(fixtures.bedesten_document(), 'application/json')
+        elif path == '/aramalist':
+            self._reply(fixtures.danistay_search(*self._paging(data)), 'application/json')
+        else:
+            self._not_found()
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(parts.query)
+        if parts.path == '/getDokuman':
+            self._reply(fixtures.danistay_document(), 'text/html; charset=utf-8')
+        elif parts.path == '/Ara':
+            page = query.get('page', ['1'])[0]
+            self._reply(fixtures.aym_search(int(page) if page.isdigit() else 1), 'text/html; charset=utf-8')
+        elif re.match(r'^/[A-Za-z]+/\d+/\d+$', parts.path):
+            self._reply(fixtures.aym_document(), 'text/html; charset=utf-8')
+        elif parts.path == '/anasayfa/MevzuatFihristDetayIframe':
+            self._reply(fixtures.mevzuat(query.get('MevzuatNo', ['5237'])[0]), 'text/html; charset=utf-8')
+        else:
+            self._not_found()
+
+
+def start(host='127.0.0.1', port=0, delay=0.0, max_page_size=None):
+    """Sunucuyu arka planda başlatır; (server, base_url) döndürür."""
+    server = UpstreamServer((host, port), UpstreamHandler)
+    server.delay = delay
+    server.max_page_size = max_page_size
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
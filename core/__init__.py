@@ -0,0 +1 @@
+"""Flask uygulaması ve Vercel fonksiyonlarının paylaştığı çekirdek modüller."""
@@ -0,0 +1,202 @@
+"""httpx üzerinde bloklamayan kaynak istekleri ve iş havuzları.
+
+ASGI modunda (asgi.py) kaynak istekleri iş parçacığı tutmadan bekler; tek
+süreç yüzlerce isteği aynı anda açık tutabilir. Bağlantılar core.http gibi
+host başına keep-alive havuzunda (httpx.AsyncClient) tekrar kullanılır;
+zaman aşımı, devre kesici, host bütçesi, yönlendirme ve ölçümler senkron
+istemciyle aynıdır, yanıtlar aynı Response nesnesidir (core.http.Response).
+
+CPU ağırlıklı ayrıştırma (BeautifulSoup/lxml, HTML temizleme) offload() ile
+ASYNC_PARSE_WORKERS boyutlu havuza, SQLite ve mevzuat gibi senkron G/Ç
+işleri run_blocking() ile ASYNC_BLOCKING_WORKERS boyutlu havuza gönderilir;
+olay döngüsü bu işlerle tıkanmaz.
+"""
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from core import metrics
+from core.breaker import get_breaker, is_failure
+from core.http import (DEFAULT_TIMEOUT, HOST_POOL_SIZES, HOST_TIMEOUTS, INSECURE_HOSTS, MAX_REDIRECTS,
+                       POOL_SIZE, HTTPError, Response, _ssl_context, remaining)
+
+PARSE_WORKERS = int(os.environ.get('ASYNC_PARSE_WORKERS', os.cpu_count() or 2))
+BLOCKING_WORKERS = int(os.environ.get('ASYNC_BLOCKING_WORKERS', 32))
+
+
+# ==================== İŞ HAVUZLARI ====================
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _executor(name, workers):
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = ThreadPoolExecutor(max_workers=max(workers, 1),
+                                                                 thread_name_prefix=f'aio-{name}')
+    return executor
+
+
+async def _run_in(name, workers, fn, args, kwargs):
+    # İşçi, isteğin bağlamıyla (Server-Timing dökümü) çalışır
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_executor(name, workers), call)
+
+
+async def offload(fn, *args, **kwargs):
+    """CPU ağırlıklı işi (ayrıştırma) sınırlı havuzda çalıştırıp sonucunu bekler."""
+    return await _run_in('parse', PARSE_WORKERS, fn, args, kwargs)
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Senkron G/Ç işini (SQLite, core.http kullanan kod) ayrı havuzda çalıştırıp bekler."""
+    return await _run_in('blocking', BLOCKING_WORKERS, fn, args, kwargs)
+
+
+def shutdown_executors():
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=False)
+        _executors.clear()
+
+
+# ==================== İSTEMCİLER ====================
+_clients = {}
+
+
+def get_client(scheme, host, port):
+    """(olay döngüsü, scheme, host, port) başına keep-alive havuzlu httpx istemcisi."""
+    key = (id(asyncio.get_running_loop()), scheme, host, port)
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = httpx.AsyncClient(
+            # TLS bağlamı core.http ile paylaşılır; http için hiç kurulmaz
+            verify=_ssl_context(host in INSECURE_HOSTS) if scheme == 'https' else False,
+            limits=httpx.Limits(max_connections=None,
+                                max_keepalive_connections=HOST_POOL_SIZES.get(host, POOL_SIZE)),
+            # Yönlendirmeler request() içinde (her adım için devre ve bütçe) izlenir
+            follow_redirects=False,
+            trust_env=False)
+    return client
+
+
+async def close_all():
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+# ==================== İSTEK ====================
+async def _send(client, host, port, method, url, data, headers, timeout):
+    """İsteği gönderir ve yanıtı tamamen okur; süreler metrics'e kaydedilir.
+
+    Bağlantı ve ilk bayt süreleri httpcore'un "trace" olaylarından alınır;
+    havuzdaki bağlantı kullanıldıysa bağlantı süresi yoktur.
+    """
+    marks = {}
+
+    async def trace(event, info):
+        marks[event] = time.perf_counter()
+
+    request = client.build_request(method, url, content=data, headers={'Accept-Encoding': 'identity', **headers},
+                                   timeout=timeout, extensions={'trace': trace})
+    start = time.perf_counter()
+    try:
+        response = await client.send(request, stream=True)
+        try:
+            body_start = time.perf_counter()
+            body = await response.aread()
+            download = time.perf_counter() - body_start
+        finally:
+            await response.aclose()
+    except httpx.TimeoutException:
+        raise TimeoutError(f"{host} zaman aşımı ({timeout:.1f} sn)") from None
+    except httpx.TransportError as e:
+        # Devre kesici ve ölçümler OSError bekler (core.breaker.is_failure)
+        raise ConnectionError(f"{host}: {e}") from e
+
+    connect = None
+    if 'connection.connect_tcp.started' in marks:
+        connect_end = marks.get('connection.start_tls.complete', marks.get('connection.connect_tcp.complete'))
+        connect = connect_end - marks['connection.connect_tcp.started']
+    sent = marks.get('http11.send_request_headers.started', start)
+    ttfb = marks.get('http11.receive_response_headers.complete', body_start) - sent
+    metrics.record_upstream(host, port, connect, ttfb, download, len(body))
+    return response, body
+
+
+async def request(method, url, data=None, headers=None, timeout=None):
+    """URL'e istek gönderir ve Response döndürür; 4xx/5xx için HTTPError fırlatır."""
+    headers = dict(headers or {})
+    # timeout çağıranın toplam süresidir: sırada bekleme ve yönlendirmeler de bu süreden düşer
+    deadline = time.monotonic() + timeout if timeout else None
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        client = get_client(parts.scheme, parts.hostname, port)
+
+        # Hostun bütçesinden yer alınır (gerekirse öncelik sırasıyla beklenir); bkz. core.scheduler
+        from core import scheduler
+        async with scheduler.aslot(parts.hostname, port, remaining(deadline)):
+            # Devre açıksa kaynağa gidilmeden hata döner; zaman aşımı gözlenen gecikmeye göre kısalır
+            breaker = get_breaker(parts.hostname, port)
+            limit = HOST_TIMEOUTS.get(parts.hostname, DEFAULT_TIMEOUT)
+            left = remaining(deadline)
+            request_timeout = breaker.timeout(min(left, limit) if left is not None else limit)
+            breaker.before(request_timeout)
+            metrics.UPSTREAM_TIMEOUT.set(request_timeout, source=breaker.source)
+            started = time.perf_counter()
+            try:
+                response, body = await _send(client, parts.hostname, port, method, url, data, headers,
+                                             request_timeout)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                metrics.record_upstream_error(parts.hostname, port, e)
+                if is_failure(e):
+                    breaker.failure()
+                else:
+                    breaker.release()
+                raise
+            status = response.status_code
+            if status >= 500:
+                breaker.failure()
+            else:
+                breaker.success(time.perf_counter() - started)
+
+        location = response.headers.get('Location')
+        if status in (301, 302, 303, 307, 308) and location:
+            url = urllib.parse.urljoin(url, location)
+            if status == 303 or (status in (301, 302) and method == 'POST'):
+                method, data = 'GET', None
+                headers.pop('Content-Type', None)
+            continue
+
+        if status >= 400:
+            error = HTTPError(url, status, response.reason_phrase)
+            metrics.record_upstream_error(parts.hostname, port, error)
+            raise error
+        return Response(url, status, response.reason_phrase, dict(response.headers), body)
+
+    raise HTTPError(url, status, "Too many redirects")
+
+
+async def get(url, headers=None, timeout=None):
+    return await request('GET', url, headers=headers, timeout=timeout)
+
+
+async def post_json(url, payload, headers=None, timeout=None):
+    return await request('POST', url, data=json.dumps(payload).encode('utf-8'), headers=headers, timeout=timeout)
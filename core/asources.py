@@ -0,0 +1,270 @@
+"""core.sources, core.federated ve core.documents'ın asyncio karşılıkları (ASGI modu, asgi.py).
+
+İstek gövdeleri ve ayrıştırıcılar core.sources'takilerle aynıdır; istekler
+core.aio ile iş parçacığı tutmadan beklenir. JSON yanıtlar olay döngüsünde,
+HTML temizleme ve lxml ayrıştırması aio.offload() ile sınırlı havuzda
+çözülür. Aynı argümanlı eşzamanlı çağrılar senkron işlevlerdeki gibi
+birleştirilir (coalesce).
+
+Uç yanıtları (*_response) parametre ayrıştırma ve yanıt gövdesini senkron
+karşılıklarıyla paylaşır; yalnızca kaynak istekleri beklenir. Yerel derlem
+ve atıf dizini (SQLite) yazmaları aio.run_blocking() havuzundadır.
+"""
+import asyncio
+import time
+
+from core import aio, corpus, documents, federated, sources
+from core.federated import DEFAULT_DEADLINE, DOCUMENTS_CONCURRENCY, SOURCES, STREAM_PAGE_SIZE, next_page_size
+from core.singleflight import coalesce
+
+
+# ==================== KAYNAKLAR ====================
+@coalesce
+async def yargitay_search(keyword, court='YARGITAYKARARI', page=1, page_size=10,
+                          birim=None, date_from=None, date_to=None, timeout=None):
+    data = sources.yargitay_search_body(keyword, court, page, page_size, birim, date_from, date_to)
+    response = await aio.post_json(sources.BEDESTEN_SEARCH_URL, data, headers=sources.BEDESTEN_HEADERS,
+                                   timeout=timeout)
+    return sources.parse_yargitay_search(response)
+
+
+@coalesce
+async def yargitay_document(doc_id, limit=None, timeout=None):
+    response = await aio.post_json(sources.BEDESTEN_DOCUMENT_URL, sources.yargitay_document_body(doc_id),
+                                   headers=sources.BEDESTEN_HEADERS, timeout=timeout)
+    return await aio.offload(sources.parse_yargitay_document, response, limit)
+
+
+@coalesce
+async def danistay_search(keyword, page=1, page_size=10, timeout=None):
+    response = await aio.post_json(sources.DANISTAY_SEARCH_URL, sources.danistay_search_body(keyword, page, page_size),
+                                   headers=sources.DANISTAY_HEADERS, timeout=timeout)
+    return sources.parse_danistay_search(response)
+
+
+@coalesce
+async def danistay_document(doc_id, limit=None, timeout=None):
+    response = await aio.get(sources.DANISTAY_DOCUMENT_URL.format(doc_id=doc_id),
+                             headers=sources.DANISTAY_DOCUMENT_HEADERS, timeout=timeout)
+    return await aio.offload(sources.parse_danistay_document, response, limit)
+
+
+@coalesce
+async def aym_search(keyword, page=1, timeout=None):
+    response = await aio.get(sources.aym_search_url(keyword, page), headers=sources.AYM_HEADERS, timeout=timeout)
+    return await aio.offload(sources.parse_aym_search_response, response)
+
+
+@coalesce
+async def aym_document(doc_id, limit=None, timeout=None):
+    response = await aio.get(sources.aym_document_url(doc_id), headers=sources.AYM_HEADERS, timeout=timeout)
+    return await aio.offload(sources.parse_aym_document_response, response, limit)
+
+
+# sources.SEARCHES/DOCUMENTS karşılığı; kaynak adından arama ve karar metni fonksiyonu
+SEARCHES = {'yargitay': yargitay_search, 'danistay': danistay_search, 'aym': aym_search}
+DOCUMENTS = {'yargitay': yargitay_document, 'danistay': danistay_document, 'aym': aym_document}
+
+
+def _search_page(source, keyword, court='YARGITAYKARARI', page=1, page_size=10, timeout=None):
+    if source == 'yargitay':
+        return yargitay_search(keyword, court=court, page=page, page_size=page_size, timeout=timeout)
+    if source == 'aym':
+        return aym_search(keyword, page=page, timeout=timeout)
+    return danistay_search(keyword, page=page, page_size=page_size, timeout=timeout)
+
+
+# ==================== BİRLEŞİK ARAMA ====================
+async def _timed(coro):
+    started = time.monotonic()
+    result = await coro
+    return result, time.monotonic() - started
+
+
+async def search_all(keyword, court='YARGITAYKARARI', page=1, deadline=DEFAULT_DEADLINE, only=SOURCES):
+    """federated.search_all ile aynı yanıt; kaynaklar aynı olay döngüsünde paralel beklenir."""
+    tasks = {
+        source: asyncio.ensure_future(_timed(_search_page(source, keyword, court, page, timeout=deadline)))
+        for source in only
+    }
+    await asyncio.wait(tasks.values(), timeout=deadline)
+
+    decisions = []
+    status = {}
+    for source, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            status[source] = {"success": False, "error": "timeout"}
+            continue
+        try:
+            result, elapsed = task.result()
+        except Exception as e:
+            status[source] = {"success": False, "error": str(e)}
+            continue
+        items = [sources.normalize_decision(source, d) for d in result['decisions']]
+        decisions.extend(items)
+        status[source] = {
+            "success": True,
+            "total": result['total'],
+            "count": len(items),
+            "elapsed_ms": round(elapsed * 1000)
+        }
+
+    return {"decisions": decisions, "sources": status}
+
+
+async def fetch_documents(source, ids, concurrency=DOCUMENTS_CONCURRENCY, limit=None, timeout=None):
+    """Kararları en fazla `concurrency` eşzamanlı istekle getirir; tamamlanma sırasıyla (id, metin, hata) üretir."""
+    fetch = DOCUMENTS[source]
+    semaphore = asyncio.Semaphore(max(1, min(concurrency, DOCUMENTS_CONCURRENCY, len(ids) or 1)))
+
+    async def one(doc_id):
+        async with semaphore:
+            try:
+                return doc_id, await fetch(doc_id, limit=limit, timeout=timeout), None
+            except Exception as e:
+                return doc_id, None, str(e)
+
+    tasks = [asyncio.ensure_future(one(doc_id)) for doc_id in ids]
+    try:
+        for future in asyncio.as_completed(tasks):
+            yield await future
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def iter_search(source, keyword, court='YARGITAYKARARI', limit=1000, page_size=STREAM_PAGE_SIZE):
+    """federated.iter_search karşılığı: sayfa tüketilirken sonraki sayfa arka planda istenir."""
+    if source == 'aym':
+        # AYM sayfa boyutu sabittir
+        page_size = sources.AYM_PAGE_SIZE
+    page_size = max(1, min(page_size, limit))
+    task = asyncio.ensure_future(_search_page(source, keyword, court, 1, page_size))
+    first = True
+    received = 0
+    sent = 0
+    try:
+        while True:
+            result = await task
+            if first:
+                yield {"total": result['total']}
+                first = False
+            decisions = result['decisions']
+            received += len(decisions)
+            last = not decisions or sent + len(decisions) >= limit or received >= result['total']
+            if not last:
+                page_size = next_page_size(page_size, len(decisions))
+                task = asyncio.ensure_future(_search_page(source, keyword, court, received // page_size + 1,
+                                                          page_size))
+            for d in decisions[:limit - sent]:
+                yield sources.normalize_decision(source, d)
+            sent += min(len(decisions), limit - sent)
+            if last:
+                return
+    finally:
+        # İstemci akışı yarıda bırakırsa önceden istenen sayfa iptal edilir
+        task.cancel()
+
+
+# ==================== KARAR METİNLERİ ====================
+async def full_text(source, doc_id, on_fetch=None):
+    """documents.full_text karşılığı; aynı tam metin önbelleğini kullanır."""
+    entry = documents.cached_full_text(source, doc_id)
+    if entry is None:
+        try:
+            text = await DOCUMENTS[source](doc_id)
+        except Exception:
+            # Kaynak hata verdiyse (ya da devresi açıksa) süresi dolmuş kopya kullanılır
+            entry = documents.stale_full_text(source, doc_id)
+            if entry is None:
+                raise
+            return entry
+        entry = await aio.offload(documents.store_full_text, source, doc_id, text)
+        if on_fetch is not None:
+            await on_fetch(text)
+    return entry
+
+
+async def document_response(source, doc_id, args):
+    """documents.document_response karşılığı."""
+    try:
+        doc_id = documents.document_id(source, doc_id)
+        rng = documents.parse_range(args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+    async def fetched(text):
+        await aio.run_blocking(documents.index_fetched, source, doc_id, text)
+
+    limit = sources.CONTENT_LIMITS[source]
+    try:
+        entry = await full_text(source, doc_id, on_fetch=fetched)
+        if rng is None:
+            return 200, {"success": True, "content": entry['text'][:limit]}
+        return 200, {"success": True, **documents.read_range(entry, *rng, default_length=limit)}
+    except Exception as e:
+        return 200, {"success": False, "error": str(e)}
+
+
+async def documents_response(body, cache):
+    """documents.documents_response karşılığı (POST /documents)."""
+    try:
+        ids, source, concurrency = documents.batch_request(body)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+    results, missing = documents.cached_documents(cache, source, ids)
+    async for doc_id, text, error in fetch_documents(source, missing, concurrency=concurrency):
+        if error is None:
+            await aio.offload(documents.store_full_text, source, doc_id, text)
+            await aio.run_blocking(documents.index_fetched, source, doc_id, text)
+        results[doc_id] = documents.batch_result(cache, source, doc_id, text, error)
+    return 200, documents.batch_payload(source, ids, results)
+
+
+# ==================== UÇ YANITLARI ====================
+async def search_response(source, args):
+    """sources.search_response karşılığı (/search, /danistay, /aym)."""
+    try:
+        request = sources.search_request(source, args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    try:
+        result = await SEARCHES[source](**request)
+    except Exception as e:
+        return 200, {"success": False, "error": str(e)}
+    if corpus.get_corpus() is not None:
+        await aio.run_blocking(corpus.ingest_decisions, source, sources.corpus_decisions(source, result['decisions']))
+    return 200, sources.search_payload(source, result, request['page'])
+
+
+async def search_all_response(args):
+    """federated.search_all_response karşılığı (/search/all)."""
+    try:
+        request = federated.search_all_request(args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    return 200, federated.search_all_payload(await search_all(**request))
+
+
+def stream_response(args):
+    """federated.stream_response karşılığı: (400, hata) ya da (200, NDJSON satırlarının eşzamansız üreteci)."""
+    try:
+        request = federated.stream_request(args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+    async def generate():
+        count = 0
+        try:
+            async for item in iter_search(**request):
+                if 'source' in item:
+                    count += 1
+                yield federated.stream_line(item)
+        except Exception as e:
+            yield federated.stream_end(count, e)
+            return
+        yield federated.stream_end(count)
+
+    return 200, generate()
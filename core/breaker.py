@@ -0,0 +1,138 @@
+"""Kaynak host'ları için devre kesici ve gözlenen gecikmeye göre uyarlanan zaman aşımı.
+
+Bir host art arda BREAKER_FAILURES kez bağlantı hatası, zaman aşımı ya da
+5xx verdiğinde devre açılır: BREAKER_COOLDOWN saniye boyunca o hosta
+istek gönderilmez, çağrılar hemen CircuitOpenError ile döner. Süre
+dolunca devre yarı açık olur ve tek bir deneme isteğine izin verilir;
+deneme başarılıysa devre kapanır, değilse bekleme süresi ikiye katlanarak
+(en fazla BREAKER_MAX_COOLDOWN) yeniden açılır.
+
+Zaman aşımı, son başarılı isteklerin p99 süresinin BREAKER_TIMEOUT_FACTOR
+katıdır; BREAKER_MIN_TIMEOUT ile host için ayarlı üst sınır arasında
+tutulur. Yeterli örnek yoksa ayarlı zaman aşımı kullanılır.
+"""
+import collections
+import os
+import threading
+import time
+
+from core import metrics
+
+FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURES', 5))
+COOLDOWN = float(os.environ.get('BREAKER_COOLDOWN', 30))
+MAX_COOLDOWN = float(os.environ.get('BREAKER_MAX_COOLDOWN', 300))
+TIMEOUT_FACTOR = float(os.environ.get('BREAKER_TIMEOUT_FACTOR', 3))
+MIN_TIMEOUT = float(os.environ.get('BREAKER_MIN_TIMEOUT', 2))
+
+# Uyarlanan zaman aşımı için gereken en az örnek ve tutulan son örnek sayısı
+MIN_SAMPLES = 20
+WINDOW = 200
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Devre açıkken kaynağa gidilmeden fırlatılır."""
+
+    def __init__(self, source, retry_after):
+        super().__init__(f"{source} kaynağı geçici olarak devre dışı, {retry_after:.0f} sn sonra yeniden denenecek")
+        self.source = source
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, source):
+        self.source = source
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = COOLDOWN
+        self._opened_at = 0.0
+        self._probe_started = None
+        self._latencies = collections.deque(maxlen=WINDOW)
+        self._lock = threading.Lock()
+
+    def before(self, timeout):
+        """İstekten önce çağrılır; devre açıksa CircuitOpenError fırlatır."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.monotonic()
+            remaining = self._opened_at + self.cooldown - now
+            if self.state == OPEN and remaining > 0:
+                metrics.UPSTREAM_REJECTED.inc(source=self.source)
+                raise CircuitOpenError(self.source, remaining)
+            # Yarı açık: aynı anda yalnızca bir deneme isteği (takılı kalan deneme zaman aşımıyla düşer)
+            if self._probe_started is not None and now - self._probe_started < timeout:
+                metrics.UPSTREAM_REJECTED.inc(source=self.source)
+                raise CircuitOpenError(self.source, max(remaining, 1))
+            self._set_state(HALF_OPEN)
+            self._probe_started = now
+
+    def success(self, elapsed):
+        with self._lock:
+            self._latencies.append(elapsed)
+            self.failures = 0
+            if self.state != CLOSED:
+                self.cooldown = COOLDOWN
+                self._probe_started = None
+                self._set_state(CLOSED)
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, MAX_COOLDOWN)
+                self._open()
+            elif self.state == CLOSED and self.failures >= FAILURE_THRESHOLD:
+                self._open()
+
+    def release(self):
+        """Sonucu devre durumunu etkilemeyen (ör. 4xx) bir deneme isteğini bırakır."""
+        with self._lock:
+            self._probe_started = None
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._probe_started = None
+        self._set_state(OPEN)
+
+    def _set_state(self, state):
+        self.state = state
+        metrics.UPSTREAM_CIRCUIT_OPEN.set(0 if state == CLOSED else 1, source=self.source)
+
+    def timeout(self, limit):
+        """Gözlenen gecikmeye göre zaman aşımı; `limit` üst sınırdır."""
+        with self._lock:
+            if len(self._latencies) < MIN_SAMPLES:
+                return limit
+            samples = sorted(self._latencies)
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        return min(limit, max(MIN_TIMEOUT, p99 * TIMEOUT_FACTOR))
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host, port):
+    key = (host, port)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(key)
+            if breaker is None:
+                breaker = _breakers[key] = CircuitBreaker(metrics.source_for(host, port))
+    return breaker
+
+
+def is_failure(exc):
+    """Devreyi açmaya sayılan hatalar: bağlantı, zaman aşımı ve 5xx (4xx sayılmaz)."""
+    status = getattr(exc, 'status', None)
+    if isinstance(status, int):
+        return status >= 500
+    return isinstance(exc, OSError)
+
+
+def states():
+    """Kaynak adı -> devre durumu."""
+    return {breaker.source: breaker.state for breaker in list(_breakers.values())}
@@ -0,0 +1,230 @@
+"""Önbellek yardımcıları: süreç içi LRU, isteğe bağlı SQLite katmanı ve ETag."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """LRU tahliyeli, her girdisi belirli bir süre geçerli kalan önbellek."""
+
+    def __init__(self, maxsize=128, ttl=3600, stale_ttl=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Süresi dolan girdi bu kadar saniye daha get_stale() ile okunabilir
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            now = time.monotonic()
+            if expires < now:
+                if expires + self.stale_ttl < now:
+                    del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def get_stale(self, key, default=None):
+        """Süresi dolmuş olsa da bayatlık süresi içindeki değeri döndürür."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] + self.stale_ttl < time.monotonic():
+                return default
+            return item[1]
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class SQLiteCache:
+    """Süreçler ve yeniden başlatmalar arasında paylaşılan, JSON değer tutan disk önbelleği."""
+
+    def __init__(self, path, ttl=3600, stale_ttl=0):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires REAL)'
+        )
+
+    @staticmethod
+    def _key(key):
+        return json.dumps(key, ensure_ascii=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires FROM cache WHERE key = ?', (self._key(key),)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return default
+        return json.loads(row[0])
+
+    def get_stale(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires FROM cache WHERE key = ?', (self._key(key),)
+            ).fetchone()
+        if row is None or row[1] + self.stale_ttl < time.time():
+            return default
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)',
+                (self._key(key), json.dumps(value, ensure_ascii=False), expires)
+            )
+
+    def pop(self, key, default=None):
+        value = self.get(key, default)
+        with self._lock:
+            self._conn.execute('DELETE FROM cache WHERE key = ?', (self._key(key),))
+        return value
+
+    def purge(self):
+        """Süresi ve bayatlık süresi dolmuş girdileri siler."""
+        with self._lock:
+            self._conn.execute('DELETE FROM cache WHERE expires < ?', (time.time() - self.stale_ttl,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM cache')
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+
+class TieredCache:
+    """Önce bellekteki LRU'ya, sonra disk önbelleğine bakan iki katmanlı önbellek."""
+
+    def __init__(self, memory, disk):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key, default=None):
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is None:
+                return default
+            self.memory.set(key, value)
+        return value
+
+    def get_stale(self, key, default=None):
+        value = self.memory.get_stale(key)
+        if value is None:
+            value = self.disk.get_stale(key)
+        return default if value is None else value
+
+    def set(self, key, value, ttl=None):
+        self.memory.set(key, value, ttl)
+        self.disk.set(key, value, ttl)
+
+    def pop(self, key, default=None):
+        value = self.memory.pop(key)
+        disk_value = self.disk.pop(key)
+        value = disk_value if value is None else value
+        return default if value is None else value
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self.disk)
+
+
+# Kaynak hata verdiğinde süresi dolmuş yanıtların sunulabileceği ek süre (saniye); 0 kapatır
+STALE_CACHE_TTL = int(os.environ.get('STALE_CACHE_TTL', 24 * 3600))
+
+
+def make_cache(maxsize=1024, ttl=3600, stale_ttl=None):
+    """RESPONSE_CACHE_BACKEND ortam değişkenine göre önbellek oluşturur.
+
+    "memory" (varsayılan) yalnızca süreç içi LRU kullanır; "sqlite" buna ek
+    olarak RESPONSE_CACHE_PATH dosyasında kalıcı bir katman açar.
+    """
+    stale_ttl = STALE_CACHE_TTL if stale_ttl is None else stale_ttl
+    memory = TTLCache(maxsize=maxsize, ttl=ttl, stale_ttl=stale_ttl)
+    if os.environ.get('RESPONSE_CACHE_BACKEND', 'memory') == 'sqlite':
+        path = os.environ.get('RESPONSE_CACHE_PATH', 'yargi-cache.sqlite3')
+        return TieredCache(memory, SQLiteCache(path, ttl=ttl, stale_ttl=stale_ttl))
+    return memory
+
+
+def cache_key(args, params):
+    """İstek parametrelerinden önbellek anahtarı parçası.
+
+    params (ad, varsayılan) çiftleridir; varsayılanı None olan parametre
+    yalnızca istekte varsa (ad, değer) olarak eklenir, böylece yeni isteğe
+    bağlı parametreler mevcut anahtarları değiştirmez.
+    """
+    key = []
+    for name, default in params:
+        if default is not None:
+            key.append(args.get(name, default))
+        elif name in args:
+            key.append((name, args.get(name)))
+    return tuple(key)
+
+
+def etag_for(body):
+    """Yanıt gövdesinden (bytes) güçlü ETag üretir."""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match listesinde (virgülle ayrılmış) etiketin kendisi var mı.
+
+    etag tırnaklı güçlü etikettir ("abc"). Etiketler bütün olarak
+    karşılaştırılır: W/"abc" ya da "abc-gzip" eşleşmez; "*" her etikete uyar.
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*' or tag == etag:
+            return True
+    return False
@@ -0,0 +1,287 @@
+"""Karar metinlerindeki kanun maddesi atıflarının çıkarımı ve ters dizini.
+
+"5237 sayılı TCK'nın 141. maddesi", "HMK m. 353/1-b", "Türk Borçlar
+Kanunu'nun 49 ve 50. maddeleri", "İİK'nın geçici 1. maddesi" gibi atıflar
+(kanun no, madde, fıkra, bent) olarak çıkarılır; kanun kısaltmaları ve adları
+KANUN_NUMARALARI / KANUN_ADLARI ile numaraya çevrilir, madde anahtarları
+mevzuat ile aynıdır ("141", "5/A", "gecici-1").
+
+Ters dizin (madde -> kararlar) /document, /danistay/document ve
+/aym/document'tan geçen metinlerle artımlı olarak büyür. CITATION_INDEX_PATH
+ayarlıysa SQLite dosyasında kalıcıdır, değilse süreç içi bellektedir.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from core.mevzuat import KANUN_ADLARI, KANUN_NUMARALARI, parse_madde_no
+from core.responses import int_arg
+
+# Kanun numarası -> gösterilecek kısaltma (ilk tanımlanan)
+KISALTMALAR = {}
+for _ad, _no in KANUN_NUMARALARI.items():
+    KISALTMALAR.setdefault(_no, _ad)
+
+# Metinde büyük harfle geçen kısaltmalar ve tam adlar; uzun adlar önce denenir
+_ADLAR = {ad: no for ad, no in KANUN_NUMARALARI.items() if len(ad) <= 5}
+_ADLAR.update(KANUN_ADLARI)
+_AD_RE = '|'.join(re.escape(ad) for ad in sorted(_ADLAR, key=len, reverse=True))
+
+_HARF = '[a-zçğıöşü]'
+_SIRA_EKI = r"(?:\.|\s*['’]?\s*(?:inci|ıncı|üncü|uncu|nci|ncı|ncü|ncu|ci|cı|cü|cu)\b)"
+# "141", "5/A", "353/1", "353/1-b", "25/II-e", "353/1-b-2" (alt bent yok sayılır);
+# I, V ve X tek başına Roma rakamıyla yazılmış fıkradır, madde harfi değil
+_HARF_NO = '[A-HJ-UWYZÇĞÖŞÜ]'
+_FIKRA = r'(?:\d+|[IVX]+)'
+_NO = rf'\d+(?:/{_HARF_NO}(?![\w]))?(?:/{_FIKRA}(?![\w/]))?(?:\s*-\s*{_HARF}\b(?:\s*-\s*\d+)?)?'
+
+CITATION_RE = re.compile(
+    rf"""
+    (?:
+        (?P<no>\d{{1,5}})\s+sayılı\s+(?:(?P<ad1>{_AD_RE})|Kanun(?:u|un)?)
+      | (?<![\w])(?P<ad2>{_AD_RE})
+    )
+    (?!\w)(?:\s*['’]\s*{_HARF}+)?                       # TCK'nın, Kanunu'nun
+    \s*,?\s*
+    (?:
+        (?P<tur1>[Gg]eçici|[Ee]k)?\s*(?:m\.|md\.|mad\.|[Mm]adde)\s*(?P<madde>{_NO})
+      | (?:(?P<tur2>[Gg]eçici|[Ee]k)\s+)?
+        (?P<liste>{_NO}(?:\s*(?:,|ve|ile)\s*{_NO})*){_SIRA_EKI}?\s*[Mm]adde
+    )
+    """,
+    re.X
+)
+# "... maddesinin 1. fıkrasının (b) bendi"
+_KUYRUK_RE = re.compile(
+    rf"{_HARF}*\s+(?P<fikra>\d+){_SIRA_EKI}?\s*fıkra{_HARF}*"
+    rf"(?:\s+(?:\(\s*(?P<bent>{_HARF})\s*\)|(?P<bent2>{_HARF})\))\s*bend)?"
+)
+_PARCA_RE = re.compile(
+    rf'^(?P<madde>\d+(?:/{_HARF_NO})?)(?:/(?P<fikra>{_FIKRA}))?(?:\s*-\s*(?P<bent>{_HARF})(?:\s*-\s*\d+)?)?$'
+)
+_ROMA = {'I': 1, 'II': 2, 'III': 3, 'IV': 4, 'V': 5, 'VI': 6, 'VII': 7, 'VIII': 8, 'IX': 9, 'X': 10}
+
+
+def madde_anahtari(madde_no):
+    """"141", "5/a", "gecici-1" gibi bir madde numarasını dizin anahtarına çevirir; geçersizse None."""
+    key = parse_madde_no(madde_no)
+    if key is None:
+        return None
+    tur, no, harf = key
+    madde = f"{no}/{harf}" if harf else str(no)
+    return madde if tur == 'madde' else f"{tur}-{madde}"
+
+
+def _fikra_no(fikra):
+    if not fikra:
+        return None
+    return int(fikra) if fikra.isdigit() else _ROMA.get(fikra)
+
+
+def _atif(kanun_no, tur, parca):
+    match = _PARCA_RE.match(parca.strip())
+    if not match:
+        return None
+    no = match.group('madde')
+    madde = madde_anahtari(f"{tur}-{no}" if tur else no)
+    if madde is None:
+        return None
+    return {
+        "kanun_no": kanun_no,
+        "kanun": KISALTMALAR.get(kanun_no),
+        "madde": madde,
+        "fikra": _fikra_no(match.group('fikra')),
+        "bent": match.group('bent'),
+    }
+
+
+def extract_citations(text):
+    """Metindeki madde atıfları; her (kanun, madde, fıkra, bent) bir kez, metindeki sırayla."""
+    citations = {}
+    for match in CITATION_RE.finditer(text):
+        ad = match.group('ad1') or match.group('ad2')
+        kanun_no = match.group('no') or _ADLAR[ad]
+        tur = (match.group('tur1') or match.group('tur2') or '').lower()
+        parcalar = [match.group('madde')] if match.group('madde') else \
+            re.split(r'\s*(?:,|\bve\b|\bile\b)\s*', match.group('liste'))
+        kuyruk = None
+        if len(parcalar) == 1 and match.group('liste'):
+            kuyruk = _KUYRUK_RE.match(text, match.end())
+        for parca in parcalar:
+            atif = _atif(kanun_no, tur, parca)
+            if atif is None:
+                continue
+            if kuyruk and atif['fikra'] is None:
+                atif['fikra'] = int(kuyruk.group('fikra'))
+                atif['bent'] = kuyruk.group('bent') or kuyruk.group('bent2')
+            citations.setdefault((atif['kanun_no'], atif['madde'], atif['fikra'], atif['bent']), atif)
+    return list(citations.values())
+
+
+def format_citation(atif):
+    """Atfın kısa gösterimi: "TCK m. 141/1-b"."""
+    text = f"{atif['kanun'] or atif['kanun_no'] + ' s. Kanun'} m. {atif['madde']}"
+    if atif['fikra'] is not None:
+        text += f"/{atif['fikra']}"
+    if atif['bent']:
+        text += f"-{atif['bent']}"
+    return text
+
+
+# ==================== TERS DİZİN ====================
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS atiflar (
+    kanun_no TEXT NOT NULL,
+    madde TEXT NOT NULL,
+    fikra INTEGER NOT NULL,     -- 0: fıkra belirtilmemiş
+    bent TEXT NOT NULL,
+    source TEXT NOT NULL,
+    id TEXT NOT NULL,
+    eklendi REAL NOT NULL,
+    PRIMARY KEY (kanun_no, madde, fikra, bent, source, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS atiflar_karar ON atiflar (source, id);
+"""
+
+
+def _atif_satiri(kanun_no, madde, fikra, bent):
+    return {"kanun_no": kanun_no, "kanun": KISALTMALAR.get(kanun_no), "madde": madde,
+            "fikra": fikra or None, "bent": bent or None}
+
+
+class CitationIndex:
+    """Madde -> kararlar ters dizini; aynı karar yeniden eklendiğinde yeni atıflar birleştirilir."""
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    def add(self, source, doc_id, citations, now=None):
+        rows = [(a['kanun_no'], a['madde'], a['fikra'] or 0, a['bent'] or '', source, str(doc_id), now or time.time())
+                for a in citations]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany('INSERT OR IGNORE INTO atiflar VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def decisions(self, kanun_no, madde, fikra=None, limit=50, offset=0):
+        """Maddeye atıf yapan kararlar, en son eklenen önce: {"total", "decisions"}."""
+        where = 'kanun_no = ? AND madde = ?'
+        params = [kanun_no, madde]
+        if fikra is not None:
+            where += ' AND fikra = ?'
+            params.append(fikra)
+        with self._lock:
+            total = self._conn.execute(
+                f'SELECT COUNT(*) FROM (SELECT 1 FROM atiflar WHERE {where} GROUP BY source, id)', params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"""SELECT source, id, group_concat(fikra || '|' || bent, ','), MAX(eklendi) AS son
+                    FROM atiflar WHERE {where} GROUP BY source, id
+                    ORDER BY son DESC, source, id LIMIT ? OFFSET ?""",
+                params + [limit, offset]
+            ).fetchall()
+        decisions = []
+        for source, doc_id, parcalar, _ in rows:
+            atiflar = []
+            for parca in sorted(parcalar.split(',')):
+                f, b = parca.split('|')
+                atiflar.append(format_citation(_atif_satiri(kanun_no, madde, int(f), b)))
+            decisions.append({"source": source, "id": doc_id, "atiflar": atiflar})
+        return {"total": total, "decisions": decisions}
+
+    def citations(self, source, doc_id):
+        """Kararın atıf yaptığı maddeler."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT kanun_no, madde, fikra, bent FROM atiflar WHERE source = ? AND id = ?',
+                (source, str(doc_id))
+            ).fetchall()
+        # Kanun no, sonra madde numarasına göre doğal sıra
+        rows.sort(key=lambda r: (r[0], parse_madde_no(r[1]) or ('', 0, ''), r[2], r[3]))
+        return [_atif_satiri(*row) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM atiflar').fetchone()[0]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_citation_index():
+    """Paylaşılan ters dizin; CITATION_INDEX_PATH ayarlıysa dosyada, değilse bellekte."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CitationIndex(os.environ.get('CITATION_INDEX_PATH') or ':memory:')
+    return _index
+
+
+def index_document(source, doc_id, text):
+    """Karar metnindeki atıfları ters dizine ekler; dizin yazılamazsa sessizce geçer."""
+    try:
+        citations = extract_citations(text)
+        get_citation_index().add(source, doc_id, citations)
+        return citations
+    except sqlite3.Error:
+        return []
+
+
+def atif_yaniti(args):
+    """/mevzuat/madde/atiflar yanıtı: (durum kodu, sözlük).
+
+    kanun ve madde[, fikra] verilirse maddeye atıf yapan kararlar, source ve
+    id verilirse kararın atıf yaptığı maddeler döner; kaynağa gidilmez.
+    """
+    index = get_citation_index()
+    doc_id = args.get('id', '')
+    if doc_id:
+        source = args.get('source', 'yargitay')
+        return 200, {
+            "success": True,
+            "karar": {"source": source, "id": doc_id},
+            "atiflar": index.citations(source, doc_id),
+            "source": "atıf dizini"
+        }
+
+    kanun = args.get('kanun', '').strip().upper()
+    madde_no = args.get('madde', '').strip()
+    kanun_no = KANUN_NUMARALARI.get(kanun, kanun)
+    madde = madde_anahtari(madde_no)
+    fikra = int_arg(args, 'fikra')
+    limit = min(max(int_arg(args, 'limit', 50), 1), 500)
+    page = max(int_arg(args, 'page', 1), 1)
+
+    if not kanun_no or not madde_no:
+        return 400, {"error": "kanun ve madde (ya da id) parametreleri gerekli"}
+    if madde is None:
+        return 400, {"error": f"geçersiz madde numarası: {madde_no}"}
+
+    result = index.decisions(kanun_no, madde, fikra=fikra, limit=limit, offset=(page - 1) * limit)
+    return 200, {
+        "success": True,
+        "kanun": KISALTMALAR.get(kanun_no, kanun),
+        "kanun_no": kanun_no,
+        "madde": madde,
+        "fikra": fikra,
+        "total": result['total'],
+        "page": page,
+        "decisions": result['decisions'],
+        "source": "atıf dizini"
+    }
@@ -0,0 +1,247 @@
+"""Getirilen kararlardan oluşan yerel tam metin dizini (SQLite FTS5).
+
+CORPUS_PATH ayarlandığında etkinleşir. /document ve /danistay/document'tan
+geçen her karar metni, arama sonuçlarından gelen künye bilgileriyle
+birlikte dizine eklenir. Dizin ve sorgular Türkçe'ye uygun biçimde
+katlanır (İ/ı, ş/ç/ğ/ö/ü → ASCII), böylece "iscilik" "işçilik"i bulur.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from core.responses import int_arg
+
+# Harf başına bir harf: katlanmış metin asıl metinle aynı uzunlukta kalır
+_TR_FOLD = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i',
+    'Ş': 's', 'ş': 's', 'Ç': 'c', 'ç': 'c', 'Ğ': 'g', 'ğ': 'g',
+    'Ö': 'o', 'ö': 'o', 'Ü': 'u', 'ü': 'u',
+    'Â': 'a', 'â': 'a', 'Î': 'i', 'î': 'i', 'Û': 'u', 'û': 'u',
+})
+
+SNIPPET_CHARS = 240
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kararlar (
+    rowid INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    id TEXT NOT NULL,
+    daire TEXT,
+    esas_no TEXT,
+    karar_no TEXT,
+    tarih TEXT,
+    text TEXT,
+    indexed_at REAL,
+    UNIQUE (source, id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS kararlar_fts USING fts5(daire, metin, tokenize='unicode61');
+"""
+
+
+def fold(text):
+    """Türkçe büyük/küçük harf ve aksan katlaması."""
+    return text.translate(_TR_FOLD).lower()
+
+
+def _match_query(query):
+    terms = re.findall(r'\w+', fold(query))
+    # Türkçe ekler için dört harf ve üzeri terimler önek olarak aranır
+    return ' '.join(f'"{t}"*' if len(t) >= 4 else f'"{t}"' for t in terms), terms
+
+
+def _snippet(text, terms):
+    folded = fold(text)
+    if len(folded) != len(text):
+        folded = folded[:len(text)]
+    positions = [p for p in (folded.find(t) for t in terms) if p >= 0]
+    start = max(0, min(positions) - SNIPPET_CHARS // 3) if positions else 0
+    end = start + SNIPPET_CHARS
+    snippet = text[start:end].strip()
+    return ('…' if start else '') + snippet + ('…' if end < len(text) else '')
+
+
+class Corpus:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    def _reindex(self, rowid):
+        row = self._conn.execute('SELECT daire, text FROM kararlar WHERE rowid = ?', (rowid,)).fetchone()
+        self._conn.execute('DELETE FROM kararlar_fts WHERE rowid = ?', (rowid,))
+        if row and row[1]:
+            self._conn.execute(
+                'INSERT INTO kararlar_fts (rowid, daire, metin) VALUES (?, ?, ?)',
+                (rowid, fold(row[0] or ''), fold(row[1]))
+            )
+
+    def add_decisions(self, source, decisions):
+        """Arama sonuçlarındaki künye bilgilerini (daire, esas/karar no, tarih) kaydeder."""
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                for d in decisions:
+                    if not d.get('id'):
+                        continue
+                    rowid = self._conn.execute(
+                        """INSERT INTO kararlar (source, id, daire, esas_no, karar_no, tarih)
+                           VALUES (?, ?, ?, ?, ?, ?)
+                           ON CONFLICT (source, id) DO UPDATE SET
+                               daire = excluded.daire, esas_no = excluded.esas_no,
+                               karar_no = excluded.karar_no, tarih = excluded.tarih
+                           RETURNING rowid, text IS NOT NULL""",
+                        (source, str(d['id']), d.get('daire'), d.get('esasNo'),
+                         d.get('kararNo'), d.get('tarih'))
+                    ).fetchone()
+                    if rowid[1]:
+                        self._reindex(rowid[0])
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def add_document(self, source, doc_id, text):
+        """Karar metnini kaydedip dizine ekler (varsa eski dizin kaydının yerine)."""
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                rowid = self._conn.execute(
+                    """INSERT INTO kararlar (source, id, text, indexed_at) VALUES (?, ?, ?, ?)
+                       ON CONFLICT (source, id) DO UPDATE SET
+                           text = excluded.text, indexed_at = excluded.indexed_at
+                       RETURNING rowid""",
+                    (source, str(doc_id), text, time.time())
+                ).fetchone()[0]
+                self._reindex(rowid)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def has_document(self, source, doc_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM kararlar WHERE source = ? AND id = ? AND text IS NOT NULL',
+                (source, str(doc_id))
+            ).fetchone()
+        return row is not None
+
+    def search(self, query, source=None, limit=20, offset=0):
+        """Sıralı (bm25) sonuçlar ve metinden kesitler döndürür."""
+        match, terms = _match_query(query)
+        if not terms:
+            return {"total": 0, "results": []}
+
+        where = 'kararlar_fts MATCH ?'
+        params = [match]
+        if source:
+            where += ' AND k.source = ?'
+            params.append(source)
+
+        with self._lock:
+            total = self._conn.execute(
+                f'SELECT COUNT(*) FROM kararlar_fts JOIN kararlar k ON k.rowid = kararlar_fts.rowid WHERE {where}',
+                params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"""SELECT k.source, k.id, k.daire, k.esas_no, k.karar_no, k.tarih, k.text,
+                           bm25(kararlar_fts) AS score
+                    FROM kararlar_fts JOIN kararlar k ON k.rowid = kararlar_fts.rowid
+                    WHERE {where} ORDER BY score LIMIT ? OFFSET ?""",
+                params + [limit, offset]
+            ).fetchall()
+
+        results = [
+            {
+                "source": source,
+                "id": doc_id,
+                "daire": daire,
+                "esasNo": esas_no,
+                "kararNo": karar_no,
+                "tarih": tarih,
+                "score": round(-score, 4),
+                "snippet": _snippet(text, terms)
+            }
+            for source, doc_id, daire, esas_no, karar_no, tarih, text, score in rows
+        ]
+        return {"total": total, "results": results}
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM kararlar_fts').fetchone()[0]
+
+
+_corpus = None
+_corpus_lock = threading.Lock()
+
+
+def get_corpus():
+    """CORPUS_PATH ayarlıysa paylaşılan Corpus nesnesini, değilse None döndürür."""
+    global _corpus
+    path = os.environ.get('CORPUS_PATH')
+    if not path:
+        return None
+    if _corpus is None:
+        with _corpus_lock:
+            if _corpus is None:
+                _corpus = Corpus(path)
+    return _corpus
+
+
+def _log_exception(message, *args):
+    # logging yalnızca hata olduğunda yüklenir (Vercel soğuk başlangıcı)
+    import logging
+    logging.getLogger(__name__).exception(message, *args)
+
+
+def ingest_decisions(source, decisions):
+    """Arama sonuçlarının künyelerini yerel derleme kaydeder (etkinse); hata yanıtı bozmaz."""
+    corpus = get_corpus()
+    if corpus is None:
+        return
+    try:
+        corpus.add_decisions(source, decisions)
+    except Exception:
+        _log_exception("yerel derleme künye eklenemedi")
+
+
+def ingest_document(source, doc_id, text):
+    """Karar metnini yerel derleme ekler (etkinse); hata yanıtı bozmaz."""
+    corpus = get_corpus()
+    if corpus is None:
+        return
+    try:
+        corpus.add_document(source, doc_id, text)
+    except Exception:
+        _log_exception("yerel derleme karar eklenemedi: %s/%s", source, doc_id)
+
+
+def search_response(args):
+    """/search/local yanıtı: (durum kodu, sözlük)."""
+    query = args.get('q') or args.get('keyword', '')
+    source = args.get('source') or None
+    limit = min(max(int_arg(args, 'limit', 20), 1), 100)
+    page = max(int_arg(args, 'page', 1), 1)
+
+    if not query:
+        return 400, {"error": "q parameter required"}
+
+    corpus = get_corpus()
+    if corpus is None:
+        return 503, {"success": False, "error": "yerel derlem etkin değil (CORPUS_PATH)"}
+
+    try:
+        result = corpus.search(query, source=source, limit=limit, offset=(page - 1) * limit)
+        return 200, {
+            "success": True,
+            "total": result['total'],
+            "results": result['results'],
+            "source": "yerel derlem"
+        }
+    except Exception as e:
+        return 200, {"success": False, "error": str(e)}
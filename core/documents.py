@@ -0,0 +1,252 @@
+"""Karar tam metinlerinin önbelleği ve parça parça okunması.
+
+/document, /danistay/document ve /aym/document varsayılan olarak metni
+CONTENT_LIMITS sınırında keser. Karar bir kez sınırsız indirilip temizlenir
+ve paragraf ofsetleriyle birlikte önbelleğe alınır; madde atıfları bu tam
+metinden çıkarılır, offset/length ya da para ile istenen sonraki parçalar
+kaynağa gitmeden bu kopyadan kesilir. Ofset ve uzunluklar karakter
+cinsindendir.
+
+/document ve POST /documents yanıtları da buradadır; Flask uygulaması ve
+Vercel fonksiyonları doğrudan, ASGI modu core.asources karşılıklarıyla
+kullanır.
+"""
+import os
+import re
+
+from core import corpus, metrics, sources
+from core.cache import make_cache
+from core.responses import DOCUMENT_CACHE_TTL, document_key, int_arg
+
+# Tam metin önbelleği karar yanıtlarıyla aynı süre tutulur
+FULLTEXT_CACHE_TTL = DOCUMENT_CACHE_TTL
+
+# Tek istekte dönebilecek en fazla karakter
+MAX_RANGE_LENGTH = 50000
+
+# POST /documents ile tek seferde istenebilecek en fazla karar
+MAX_BATCH_DOCUMENTS = 50
+
+# "3" ya da "3-7" (1'den başlayan, uçlar dahil) paragraf aralığı
+PARA_RE = re.compile(r'^(\d+)(?:\s*-\s*(\d+))?$')
+
+_cache = make_cache(maxsize=int(os.environ.get('FULLTEXT_CACHE_SIZE', 256)), ttl=FULLTEXT_CACHE_TTL)
+
+
+def paragraph_offsets(text):
+    """Boş olmayan her satırın [başlangıç, bitiş) ofseti."""
+    return [[m.start(), m.end()] for m in re.finditer(r'[^\n]+', text)]
+
+
+def parse_range(args):
+    """İstek parametrelerinden (offset, length, para) aralığı; parametre yoksa None.
+
+    Geçersiz değerlerde ValueError fırlatır.
+    """
+    offset = args.get('offset')
+    length = args.get('length')
+    para = args.get('para')
+    if offset is None and length is None and para is None:
+        return None
+    try:
+        offset = int(offset or 0)
+        length = int(length) if length else None
+    except ValueError:
+        raise ValueError("offset ve length tam sayı olmalı")
+    if offset < 0 or (length is not None and length <= 0):
+        raise ValueError("offset negatif, length sıfır ya da negatif olamaz")
+    if para:
+        match = PARA_RE.match(para.strip())
+        if not match or int(match.group(1)) < 1 or int(match.group(2) or match.group(1)) < int(match.group(1)):
+            raise ValueError("para 3 ya da 3-7 biçiminde olmalı")
+        para = (int(match.group(1)), int(match.group(2) or match.group(1)))
+    return offset, length, para or None
+
+
+def cached_full_text(source, doc_id):
+    """Önbellekteki tam metin girdisi ya da None (isabet ölçülür)."""
+    entry = _cache.get(('fulltext', source, doc_id))
+    metrics.record_cache(f'fulltext:{source}', entry is not None)
+    return entry
+
+
+def stale_full_text(source, doc_id):
+    return _cache.get_stale(('fulltext', source, doc_id))
+
+
+def store_full_text(source, doc_id, text):
+    entry = {"text": text, "paragraphs": paragraph_offsets(text)}
+    _cache.set(('fulltext', source, doc_id), entry)
+    return entry
+
+
+def full_text(source, doc_id, on_fetch=None):
+    """Kararın temizlenmiş tam metni ve paragraf ofsetleri: {"text", "paragraphs"}.
+
+    Metin önbellekte yoksa kaynaktan bir kez indirilir; on_fetch(text)
+    yalnızca indirmede çağrılır (ör. yerel derleme ekleme).
+    """
+    entry = cached_full_text(source, doc_id)
+    if entry is None:
+        try:
+            text = sources.DOCUMENTS[source](doc_id)
+        except Exception:
+            # Kaynak hata verdiyse (ya da devresi açıksa) süresi dolmuş kopya kullanılır
+            entry = stale_full_text(source, doc_id)
+            if entry is None:
+                raise
+            return entry
+        entry = store_full_text(source, doc_id, text)
+        if on_fetch is not None:
+            on_fetch(text)
+    return entry
+
+
+def read_range(entry, offset=0, length=None, para=None, default_length=MAX_RANGE_LENGTH):
+    """Tam metinden bir parça keser; yanıta eklenecek alanları döndürür.
+
+    para=(ilk, son) verilirse parça o paragrafların başından sonuna kadardır;
+    offset ve next_offset paragraf başına göre ölçülür. Uzunluk
+    MAX_RANGE_LENGTH ile sınırlıdır; devamı varsa next_offset sonraki isteğin
+    offset'idir, aralığın sonunda None olur.
+    """
+    text = entry['text']
+    paragraphs = entry['paragraphs']
+    total = len(text)
+    start, end = 0, total
+    if para is not None:
+        first, last = para
+        if first > len(paragraphs):
+            start = end = total
+        else:
+            start = paragraphs[first - 1][0]
+            end = paragraphs[min(last, len(paragraphs)) - 1][1]
+    offset = min(start + offset, end)
+    length = min(length or default_length, MAX_RANGE_LENGTH)
+    stop = min(offset + length, end)
+    return {
+        "content": text[offset:stop],
+        "offset": offset - start,
+        "length": stop - offset,
+        "total_length": total,
+        "next_offset": stop - start if stop < end else None,
+        "paragraphs": paragraphs,
+    }
+
+
+def index_fetched(source, doc_id, text):
+    """Kaynaktan gelen karar metninin madde atıflarını ters dizine, metni yerel derleme ekler."""
+    # Atıf çıkarıcı (büyük düzenli ifadeler, mevzuat tabloları) ilk karar metninde yüklenir
+    from core import citations
+    citations.index_document(source, doc_id, text)
+    corpus.ingest_document(source, doc_id, text)
+
+
+def document_id(source, doc_id):
+    """İstekteki karar kimliği (AYM kimliklerinde baştaki/sondaki / atılır); geçersizse ValueError."""
+    if source == 'aym':
+        doc_id = doc_id.strip('/')
+    if not doc_id:
+        raise ValueError("id parameter required")
+    if source == 'aym' and (not sources.AYM_ID_RE.match(doc_id) or '..' in doc_id):
+        raise ValueError("geçersiz AYM karar kimliği")
+    return doc_id
+
+
+def document_response(source, doc_id, args):
+    """/document yanıtı: (durum kodu, sözlük).
+
+    Tam metin (önbellekte yoksa) kaynaktan sınırsız indirilir; aralık
+    parametresi yoksa CONTENT_LIMITS sınırında kesilmiş hali, varsa
+    istenen parçası döner. Madde atıfları ve yerel derlem kesilmemiş
+    metinden beslenir.
+    """
+    try:
+        doc_id = document_id(source, doc_id)
+        rng = parse_range(args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+    def fetched(text):
+        index_fetched(source, doc_id, text)
+
+    limit = sources.CONTENT_LIMITS[source]
+    try:
+        entry = full_text(source, doc_id, on_fetch=fetched)
+        if rng is None:
+            return 200, {"success": True, "content": entry['text'][:limit]}
+        return 200, {"success": True, **read_range(entry, *rng, default_length=limit)}
+    except Exception as e:
+        return 200, {"success": False, "error": str(e)}
+
+
+# ==================== TOPLU GETİRME ====================
+# POST /documents; /document, /danistay/document ve /aym/document ile aynı önbellek
+# girdilerini kullanır. Eşyordam karşılığı core.asources.documents_response'tadır.
+def batch_request(body):
+    """İstek gövdesinden (kimlikler, kaynak, eşzamanlılık); geçersizse ValueError."""
+    if not isinstance(body, dict):
+        body = {}
+    ids = list(dict.fromkeys(str(doc_id) for doc_id in body.get('ids', []) if doc_id))
+    source = body.get('source', 'yargitay')
+
+    if not ids:
+        raise ValueError("ids parameter required")
+    if source not in sources.CONTENT_LIMITS:
+        raise ValueError("source must be yargitay, danistay or aym")
+    if len(ids) > MAX_BATCH_DOCUMENTS:
+        raise ValueError(f"en fazla {MAX_BATCH_DOCUMENTS} karar istenebilir")
+    # Eşzamanlılık verilmezse fetch_documents'in üst sınırı (DOCUMENTS_CONCURRENCY) geçerlidir
+    return ids, source, int_arg(body, 'concurrency', MAX_BATCH_DOCUMENTS)
+
+
+def cached_documents(cache, source, ids):
+    """Yanıt önbelleğinde bulunan kararlar ve getirilecek kimlikler: (sonuçlar, eksikler)."""
+    results = {}
+    missing = []
+    for doc_id in ids:
+        payload = cache.get(document_key(source, doc_id))
+        metrics.record_cache(f'document:{source}', payload is not None)
+        if payload is None:
+            missing.append(doc_id)
+        else:
+            results[doc_id] = {"id": doc_id, **payload}
+    return results, missing
+
+
+def batch_result(cache, source, doc_id, text, error):
+    """Getirilen (tam) metnin kesilmiş sonucu; hata verdiyse süresi dolmuş kopya kullanılır."""
+    key = document_key(source, doc_id)
+    if error is None:
+        payload = {"success": True, "content": text[:sources.CONTENT_LIMITS[source]]}
+        cache.set(key, payload, DOCUMENT_CACHE_TTL)
+        return {"id": doc_id, **payload}
+    stale = cache.get_stale(key)
+    if stale is not None:
+        return {"id": doc_id, **stale, "stale": True}
+    return {"id": doc_id, "success": False, "error": error}
+
+
+def batch_payload(source, ids, results):
+    # Sonuçlar istekteki sırayla döner
+    documents = [results[doc_id] for doc_id in ids]
+    return {"success": any(d['success'] for d in documents), "source": source, "documents": documents}
+
+
+def documents_response(body, cache):
+    """POST /documents yanıtı: birden çok karar, sınırlı paralellikle. cache bir responses.ResponseCache'tir."""
+    try:
+        ids, source, concurrency = batch_request(body)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    # Paralel getirme havuzu yalnızca toplu istekte yüklenir (soğuk başlangıç)
+    from core import federated
+
+    results, missing = cached_documents(cache, source, ids)
+    # Metinler sınırsız indirilir: atıflar tam metinden çıkarılır, /document aralıkları da bu kopyayı kullanır
+    for doc_id, text, error in federated.fetch_documents(source, missing, concurrency=concurrency):
+        if error is None:
+            store_full_text(source, doc_id, text)
+            index_fetched(source, doc_id, text)
+        results[doc_id] = batch_result(cache, source, doc_id, text, error)
+    return 200, batch_payload(source, ids, results)
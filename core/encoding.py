@@ -0,0 +1,134 @@
+"""Yanıt gövdeleri: hızlı JSON kodlama, sıkıştırma pazarlığı ve önceden kodlanmış gövdeler.
+
+dumps() orjson kuruluysa onu, değilse json'u kullanır (JSON_ENCODER=json
+ile zorlanabilir); Türkçe karakterler kaçışsız UTF-8 yazılır. Önbellekten
+sunulan yanıtlar BodyCache'te bir kez kodlanır: isabetlerde yeniden
+serileştirme ve ETag hesabı yapılmaz, sıkıştırılmış halleri de kodlama
+başına bir kez üretilir.
+
+Accept-Encoding'e göre br (brotli kuruluysa) ya da gzip seçilir; gövdesi
+COMPRESS_MIN_SIZE bayttan küçük yanıtlar sıkıştırılmaz.
+
+orjson, brotli ve gzip ilk kullanımda yüklenir (orjson içe aktarılırken
+zoneinfo/uuid/platform da yüklenir); Vercel fonksiyonlarının soğuk
+başlangıcı bunları beklemez.
+"""
+import functools
+import importlib
+import importlib.util
+import json
+import os
+
+from core.cache import TTLCache, etag_for
+
+JSON_ENCODER = os.environ.get('JSON_ENCODER', 'orjson' if importlib.util.find_spec('orjson') else 'json')
+
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 5))
+
+# Sıkıştırılan içerik türleri (önek)
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+# Sunucunun tercih sırası; eşit q değerinde önce gelen seçilir
+ENCODINGS = ('br', 'gzip') if importlib.util.find_spec('brotli') else ('gzip',)
+
+
+@functools.lru_cache(maxsize=None)
+def _module(name):
+    """İsteğe bağlı modülü ilk kullanımda yükler; kurulu değilse None."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def dumps(payload):
+    """Sözlüğü UTF-8 JSON baytlarına çevirir."""
+    orjson = _module('orjson') if JSON_ENCODER == 'orjson' else None
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            # orjson'un desteklemediği değerler (ör. 64 bitten büyük tam sayılar)
+            pass
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+def negotiate(accept_encoding):
+    """Accept-Encoding başlığına göre kullanılacak kodlama ('br', 'gzip') ya da None."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    best = None
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > 0 and (best is None or q > best[1]):
+            best = (encoding, q)
+    return best and best[0]
+
+
+def compressible(content_type, size):
+    return size >= COMPRESS_MIN_SIZE and (content_type or '').startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return _module('brotli').compress(body, quality=BROTLI_QUALITY)
+    return _module('gzip').compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def variant_etag(etag, encoding):
+    """Sıkıştırılmış gövdenin güçlü ETag'i; kodlama başına farklıdır."""
+    return etag if encoding is None else f'{etag}-{encoding}'
+
+
+class Body:
+    """Bir kez kodlanmış JSON gövdesi, ETag'i ve sıkıştırılmış halleri."""
+
+    __slots__ = ('body', 'etag', '_variants')
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = etag_for(body)
+        self._variants = {}
+
+    def encode(self, accept_encoding, content_type='application/json'):
+        """(gövde, kodlama, ETag); kodlama None ise sıkıştırılmamıştır."""
+        encoding = negotiate(accept_encoding) if compressible(content_type, len(self.body)) else None
+        if encoding is None:
+            return self.body, None, self.etag
+        data = self._variants.get(encoding)
+        if data is None:
+            data = self._variants[encoding] = compress(self.body, encoding)
+        return data, encoding, variant_etag(self.etag, encoding)
+
+
+class BodyCache:
+    """Yanıt önbelleğindeki sözlüklerin kodlanmış gövdeleri.
+
+    Girdi, sözlük nesnesiyle birlikte tutulur; yanıt önbelleği aynı anahtara
+    yeni bir sözlük koyduğunda (ya da diskten yeni okunduğunda) gövde
+    yeniden kodlanır, yani süresi yanıt önbelleğine bağlıdır.
+    """
+
+    def __init__(self, maxsize=2048):
+        self._data = TTLCache(maxsize=maxsize, ttl=float('inf'))
+
+    def get(self, key, payload):
+        item = self._data.get(key)
+        if item is not None and item[0] is payload:
+            return item[1]
+        body = Body(dumps(payload))
+        self._data.set(key, (payload, body))
+        return body
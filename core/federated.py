@@ -0,0 +1,247 @@
+"""Kaynaklara eşzamanlı istekler: birleşik arama ve toplu karar getirme.
+
+/search/all ve /search/stream gövdeleri de buradadır; ASGI modu aynı
+parametre ayrıştırma ve yanıtları core.asources ile kullanır.
+"""
+import contextvars
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+
+from core import encoding, sources
+from core.responses import int_arg
+
+DEFAULT_DEADLINE = float(os.environ.get('SEARCH_ALL_DEADLINE', 10))
+
+# Tüm /search/all istekleri tarafından paylaşılan sınırlı iş parçacığı havuzu
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('SEARCH_ALL_WORKERS', 16)),
+    thread_name_prefix='search-all'
+)
+
+SOURCES = ('yargitay', 'danistay', 'aym')
+
+# Toplu karar getirmede aynı anda yapılabilecek en fazla istek
+DOCUMENTS_CONCURRENCY = int(os.environ.get('DOCUMENTS_CONCURRENCY', 8))
+
+DOCUMENT_SOURCES = ('yargitay', 'danistay', 'aym')
+
+# /search/all'da kaynak başına en uzun süre sınırı (saniye)
+MAX_DEADLINE = 30
+
+# /search/stream ile tek istekte alınabilecek en fazla karar
+MAX_STREAM_LIMIT = 5000
+
+
+def _submit(executor, fn, *args, **kwargs):
+    """İşi çağıranın bağlamıyla (ör. istek başına süre dökümü) çalıştırır."""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def _run(source, keyword, court, page, deadline):
+    started = time.monotonic()
+    if source == 'yargitay':
+        result = sources.yargitay_search(keyword, court=court, page=page, timeout=deadline)
+    elif source == 'danistay':
+        result = sources.danistay_search(keyword, page=page, timeout=deadline)
+    else:
+        result = sources.aym_search(keyword, page=page, timeout=deadline)
+    return result, time.monotonic() - started
+
+
+def search_all(keyword, court='YARGITAYKARARI', page=1, deadline=DEFAULT_DEADLINE, only=SOURCES):
+    """Kaynakları paralel sorgular; toplam süre en yavaş kaynağın süresi kadardır.
+
+    Süresi (deadline) dolan ya da hata veren kaynaklar yanıtı bozmaz, yalnızca
+    kendi durum kaydında belirtilir.
+    """
+    futures = {
+        source: _submit(_executor, _run, source, keyword, court, page, deadline)
+        for source in only
+    }
+    wait(futures.values(), timeout=deadline)
+
+    decisions = []
+    status = {}
+    for source, future in futures.items():
+        if not future.done():
+            future.cancel()
+            status[source] = {"success": False, "error": "timeout"}
+            continue
+        try:
+            result, elapsed = future.result()
+        except Exception as e:
+            status[source] = {"success": False, "error": str(e)}
+            continue
+        items = [sources.normalize_decision(source, d) for d in result['decisions']]
+        decisions.extend(items)
+        status[source] = {
+            "success": True,
+            "total": result['total'],
+            "count": len(items),
+            "elapsed_ms": round(elapsed * 1000)
+        }
+
+    return {"decisions": decisions, "sources": status}
+
+
+def fetch_documents(source, ids, concurrency=DOCUMENTS_CONCURRENCY, limit=None, timeout=None):
+    """Kararları en fazla `concurrency` paralel istekle getirir.
+
+    Tamamlanan her karar için (id, metin, hata) üretir; sıra tamamlanma
+    sırasıdır, hata veren kararlar diğerlerini etkilemez. İstekler
+    çağıranın önceliğindedir (core.scheduler); istemci beklediği için
+    POST /documents etkileşimli, harvest.py arka plandadır.
+    """
+    fetch = sources.DOCUMENTS[source]
+    concurrency = max(1, min(concurrency, DOCUMENTS_CONCURRENCY, len(ids) or 1))
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='documents') as executor:
+        futures = {_submit(executor, fetch, doc_id, limit=limit, timeout=timeout): doc_id for doc_id in ids}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, str(e)
+
+
+# Akış modunda kaynaktan tek seferde istenen sonuç sayısı
+STREAM_PAGE_SIZE = int(os.environ.get('STREAM_PAGE_SIZE', 100))
+
+
+def _search_page(source, keyword, court, page, page_size):
+    if source == 'yargitay':
+        return sources.yargitay_search(keyword, court=court, page=page, page_size=page_size)
+    if source == 'aym':
+        return sources.aym_search(keyword, page=page)
+    return sources.danistay_search(keyword, page=page, page_size=page_size)
+
+
+def iter_search(source, keyword, court='YARGITAYKARARI', limit=1000, page_size=STREAM_PAGE_SIZE):
+    """Kaynağı sayfa sayfa dolaşıp kararları tek tek üretir.
+
+    Bir sayfa tüketilirken sonraki sayfa arka planda istenir. İlk öğe
+    {"total": ...} bilgisidir, ardından ortak şemadaki kararlar gelir.
+    Kaynak sayfa boyutunu sınırlıyorsa (istenenden kısa sayfa) sonraki
+    sayfalar gelen satır sayısına göre istenir; akış boş sayfada, limit ya
+    da toplam sonuç sayısına ulaşıldığında biter.
+    """
+    if source == 'aym':
+        # AYM sayfa boyutu sabittir
+        page_size = sources.AYM_PAGE_SIZE
+    page_size = max(1, min(page_size, limit))
+    future = _submit(_executor, _search_page, source, keyword, court, 1, page_size)
+    first = True
+    received = 0
+    sent = 0
+    while True:
+        result = future.result()
+        if first:
+            yield {"total": result['total']}
+            first = False
+        decisions = result['decisions']
+        received += len(decisions)
+        last = not decisions or sent + len(decisions) >= limit or received >= result['total']
+        if not last:
+            page_size = next_page_size(page_size, len(decisions))
+            future = _submit(_executor, _search_page, source, keyword, court, received // page_size + 1, page_size)
+        for d in decisions[:limit - sent]:
+            yield sources.normalize_decision(source, d)
+        sent += min(len(decisions), limit - sent)
+        if last:
+            return
+
+
+def next_page_size(page_size, received):
+    """Kaynak istenenden kısa sayfa döndürdüyse sayfa boyutu onun sınırına iner."""
+    return received if 0 < received < page_size else page_size
+
+
+# ==================== UÇ YANITLARI ====================
+def search_all_request(args):
+    """/search/all parametrelerinden search_all argümanları; geçersizse ValueError."""
+    keyword = args.get('keyword', '')
+    if not keyword:
+        raise ValueError("keyword parameter required")
+    try:
+        deadline = float(args.get('timeout', DEFAULT_DEADLINE))
+    except ValueError:
+        deadline = math.nan
+    # nan/inf ve sıfır ya da negatif süreler geçersiz
+    if not (math.isfinite(deadline) and deadline > 0):
+        raise ValueError("timeout saniye cinsinden pozitif bir sayı olmalı")
+    only = [s for s in args.get('sources', '').split(',') if s in SOURCES]
+    return {
+        "keyword": keyword,
+        "court": args.get('court', 'YARGITAYKARARI'),
+        "page": int_arg(args, 'page', 1),
+        # Kaynak başına süre sınırı, en fazla MAX_DEADLINE
+        "deadline": min(deadline, MAX_DEADLINE),
+        "only": only or SOURCES
+    }
+
+
+def search_all_payload(result):
+    return {
+        "success": any(status['success'] for status in result['sources'].values()),
+        "decisions": result['decisions'],
+        "sources": result['sources']
+    }
+
+
+def search_all_response(args):
+    """/search/all yanıtı: (durum kodu, sözlük)."""
+    try:
+        request = search_all_request(args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    return 200, search_all_payload(search_all(**request))
+
+
+def stream_request(args):
+    """/search/stream parametrelerinden iter_search argümanları; geçersizse ValueError."""
+    keyword = args.get('keyword', '')
+    source = args.get('source', 'yargitay')
+    if not keyword:
+        raise ValueError("keyword parameter required")
+    if source not in SOURCES:
+        raise ValueError("source must be yargitay, danistay or aym")
+    return {
+        "source": source,
+        "keyword": keyword,
+        "court": args.get('court', 'YARGITAYKARARI'),
+        "limit": min(max(int_arg(args, 'limit', 1000), 1), MAX_STREAM_LIMIT)
+    }
+
+
+def stream_line(item):
+    return encoding.dumps(item) + b'\n'
+
+
+def stream_end(count, error=None):
+    """Akışın son satırı: karar sayısı ve (varsa) hata."""
+    if error is not None:
+        return stream_line({"success": False, "error": str(error), "count": count})
+    return stream_line({"success": True, "done": True, "count": count})
+
+
+def stream_response(args):
+    """/search/stream yanıtı: (400, hata sözlüğü) ya da (200, NDJSON satırları üreteci)."""
+    try:
+        request = stream_request(args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+    def generate():
+        count = 0
+        try:
+            for item in iter_search(**request):
+                if 'source' in item:
+                    count += 1
+                yield stream_line(item)
+        except Exception as e:
+            yield stream_end(count, e)
+            return
+        yield stream_end(count)
+
+    return 200, generate()
@@ -0,0 +1,272 @@
+"""Kaynak sunuculara kalıcı (keep-alive) bağlantı havuzu üzerinden HTTP istemcisi.
+
+Her istekte yeni bir TCP bağlantısı ve TLS el sıkışması yapmak yerine, her
+host için açık bağlantılar bir havuzda tutulup tekrar kullanılır.
+"""
+import http.client
+import json
+import os
+import queue
+import ssl
+import threading
+import time
+import urllib.parse
+
+from core import metrics
+from core.breaker import get_breaker, is_failure
+
+POOL_SIZE = int(os.environ.get('UPSTREAM_POOL_SIZE', 8))
+DEFAULT_TIMEOUT = float(os.environ.get('UPSTREAM_TIMEOUT', 30))
+
+# Host bazında zaman aşımları (saniye)
+HOST_TIMEOUTS = {
+    'bedesten.adalet.gov.tr': 30,
+    'karararama.danistay.gov.tr': 30,
+    'www.mevzuat.gov.tr': 30,
+    'normkararlarbilgibankasi.anayasa.gov.tr': 30,
+}
+
+# Host bazında havuz boyutları; listede olmayanlar POOL_SIZE kullanır
+HOST_POOL_SIZES = {}
+
+# Sertifika doğrulaması yapılamayan hostlar
+INSECURE_HOSTS = {'karararama.danistay.gov.tr'}
+
+MAX_REDIRECTS = 5
+
+# Yeniden kullanılan bağlantı karşı tarafça kapatılmışsa görülen hatalar
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 ConnectionResetError, BrokenPipeError)
+
+_contexts = {}
+_contexts_lock = threading.Lock()
+
+
+def _ssl_context(insecure):
+    """SSL bağlamını ilk HTTPS bağlantısında oluşturur; sertifika deposunu yüklemek
+    pahalı olduğundan soğuk başlangıçta yapılmaz."""
+    context = _contexts.get(insecure)
+    if context is None:
+        with _contexts_lock:
+            context = _contexts.get(insecure)
+            if context is None:
+                context = ssl.create_default_context()
+                if insecure:
+                    # SSL context for APIs that need it
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                _contexts[insecure] = context
+    return context
+
+
+class HTTPError(Exception):
+    """Kaynak sunucu 4xx/5xx döndürdüğünde fırlatılır."""
+
+    def __init__(self, url, status, reason):
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.url = url
+        self.status = status
+        self.reason = reason
+
+
+class Response:
+    def __init__(self, url, status, reason, headers, body):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def text(self, errors='ignore'):
+        return self.body.decode('utf-8', errors=errors)
+
+    def json(self):
+        return json.loads(self.body.decode())
+
+
+class HostPool:
+    """Tek bir (scheme, host, port) için açık bağlantı havuzu."""
+
+    def __init__(self, scheme, host, port, size, timeout):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        if self.scheme == 'https':
+            context = _ssl_context(self.host in INSECURE_HOSTS)
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def acquire(self):
+        """Boşta bir bağlantı döndürür; yoksa yenisini açar. (bağlantı, yeniden_mi)"""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(scheme, host, port):
+    key = (scheme, host, port)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = HostPool(scheme, host, port, HOST_POOL_SIZES.get(host, POOL_SIZE),
+                                HOST_TIMEOUTS.get(host, DEFAULT_TIMEOUT))
+                _pools[key] = pool
+    return pool
+
+
+def configure(host, pool_size=None, timeout=None):
+    """Bir hostun havuz boyutunu ve/veya zaman aşımını değiştirir."""
+    if pool_size is not None:
+        HOST_POOL_SIZES[host] = pool_size
+    if timeout is not None:
+        HOST_TIMEOUTS[host] = timeout
+    # Mevcut havuz bir sonraki istekte yeni ayarlarla oluşturulur
+    with _pools_lock:
+        for key in [k for k in _pools if k[1] == host]:
+            _pools.pop(key).close()
+
+
+def close_all():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def remaining(deadline):
+    """deadline'a (time.monotonic) kalan süre; deadline yoksa None, süre dolduysa TimeoutError."""
+    if deadline is None:
+        return None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise TimeoutError("istek süresi doldu")
+    return left
+
+
+def _send(pool, method, target, data, headers, timeout):
+    """İsteği havuzdaki bir bağlantıyla gönderir ve yanıtı tamamen okur.
+
+    Bağlantı, ilk bayt ve indirme süreleri metrics'e kaydedilir.
+    """
+    for attempt in range(2):
+        conn, reused = pool.acquire()
+        conn.timeout = timeout
+        connect = None
+        try:
+            if conn.sock is None:
+                start = time.perf_counter()
+                conn.connect()
+                connect = time.perf_counter() - start
+            else:
+                conn.sock.settimeout(timeout)
+            start = time.perf_counter()
+            conn.request(method, target, body=data, headers=headers)
+            resp = conn.getresponse()
+            ttfb = time.perf_counter() - start
+            start = time.perf_counter()
+            body = resp.read()
+            download = time.perf_counter() - start
+        except _STALE_ERRORS:
+            conn.close()
+            # Boşta beklerken kapatılmış bağlantı: yeni bağlantıyla bir kez daha dene
+            if reused and attempt == 0:
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            pool.release(conn)
+        metrics.record_upstream(pool.host, pool.port, connect, ttfb, download, len(body))
+        return resp, body
+
+
+def request(method, url, data=None, headers=None, timeout=None):
+    """URL'e istek gönderir ve Response döndürür; 4xx/5xx için HTTPError fırlatır."""
+    headers = dict(headers or {})
+    # timeout çağıranın toplam süresidir: sırada bekleme ve yönlendirmeler de bu süreden düşer
+    deadline = time.monotonic() + timeout if timeout else None
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        pool = get_pool(parts.scheme, parts.hostname, port)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+
+        # Hostun bütçesinden yer alınır (gerekirse öncelik sırasıyla beklenir); zamanlayıcı
+        # ilk istekte yüklenir (soğuk başlangıç)
+        from core import scheduler
+        with scheduler.slot(parts.hostname, port, remaining(deadline)):
+            # Devre açıksa kaynağa gidilmeden hata döner; zaman aşımı gözlenen gecikmeye göre kısalır
+            breaker = get_breaker(parts.hostname, port)
+            limit = HOST_TIMEOUTS.get(parts.hostname, DEFAULT_TIMEOUT)
+            left = remaining(deadline)
+            request_timeout = breaker.timeout(min(left, limit) if left is not None else limit)
+            breaker.before(request_timeout)
+            metrics.UPSTREAM_TIMEOUT.set(request_timeout, source=breaker.source)
+            started = time.perf_counter()
+            try:
+                resp, body = _send(pool, method, target, data, headers, request_timeout)
+            except Exception as e:
+                metrics.record_upstream_error(parts.hostname, port, e)
+                if is_failure(e):
+                    breaker.failure()
+                else:
+                    breaker.release()
+                raise
+            if resp.status >= 500:
+                breaker.failure()
+            else:
+                breaker.success(time.perf_counter() - started)
+
+        location = resp.getheader('Location')
+        if resp.status in (301, 302, 303, 307, 308) and location:
+            url = urllib.parse.urljoin(url, location)
+            if resp.status == 303 or (resp.status in (301, 302) and method == 'POST'):
+                method, data = 'GET', None
+                headers.pop('Content-Type', None)
+            continue
+
+        if resp.status >= 400:
+            error = HTTPError(url, resp.status, resp.reason)
+            metrics.record_upstream_error(parts.hostname, port, error)
+            raise error
+        return Response(url, resp.status, resp.reason, dict(resp.getheaders()), body)
+
+    raise HTTPError(url, resp.status, "Too many redirects")
+
+
+def get(url, headers=None, timeout=None):
+    return request('GET', url, headers=headers, timeout=timeout)
+
+
+def post_json(url, payload, headers=None, timeout=None):
+    return request('POST', url, data=json.dumps(payload).encode('utf-8'), headers=headers, timeout=timeout)
@@ -0,0 +1,265 @@
+"""Kaynak çağrıları, ayrıştırma ve önbellek için süreç içi ölçümler.
+
+Her kaynak isteği bağlantı kurma, ilk bayt (TTFB) ve indirme sürelerine,
+yanıt boyutuna ve hata sınıfına göre kaydedilir; ayrıştırma süreleri ve
+önbellek isabetleri de aynı kayıtta tutulur. render() Prometheus metin
+biçimini üretir (/metrics). Ölçümler süreç içidir; her gunicorn işçisi
+kendi değerlerini tutar.
+
+İstek başına döküm: start_request() ile başlatılan bir istekte kaydedilen
+süreler server_timing() ile Server-Timing başlığına çevrilir.
+"""
+import contextlib
+import contextvars
+import os
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+
+# SERVER_TIMING=1 her yanıta, "X-Server-Timing: 1" başlığı yalnızca o yanıta Server-Timing ekler
+SERVER_TIMING = os.environ.get('SERVER_TIMING', '') == '1'
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels[name] for name in self.labels), 0)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labels, key)} {value}')
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, value, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f'# TYPE {self.name} gauge'
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=TIME_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}   # etiketler -> [kova sayıları..., toplam, adet]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def count(self, **labels):
+        counts = self._values.get(tuple(labels[name] for name in self.labels))
+        return counts[-1] if counts else 0
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, counts in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, counts):
+                    labels = _format_labels(self.labels + ('le',), key + (repr(float(bound)),))
+                    lines.append(f'{self.name}_bucket{labels} {count}')
+                labels = _format_labels(self.labels + ('le',), key + ('+Inf',))
+                lines.append(f'{self.name}_bucket{labels} {counts[-1]}')
+                labels = _format_labels(self.labels, key)
+                lines.append(f'{self.name}_sum{labels} {counts[-2]:.6f}')
+                lines.append(f'{self.name}_count{labels} {counts[-1]}')
+        return lines
+
+
+_registry = []
+
+UPSTREAM_CONNECT = Histogram('yargi_upstream_connect_seconds', 'Kaynağa bağlantı (TCP+TLS) süresi', ('source',))
+UPSTREAM_TTFB = Histogram('yargi_upstream_ttfb_seconds', 'İstek gönderiminden yanıt başlığına kadar geçen süre',
+                          ('source',))
+UPSTREAM_DOWNLOAD = Histogram('yargi_upstream_download_seconds', 'Yanıt gövdesinin indirilme süresi', ('source',))
+UPSTREAM_BYTES = Histogram('yargi_upstream_response_bytes', 'Kaynak yanıt gövdesi boyutu', ('source',),
+                           BYTE_BUCKETS)
+UPSTREAM_ERRORS = Counter('yargi_upstream_errors_total', 'Kaynak isteği hataları', ('source', 'error'))
+PARSE_SECONDS = Histogram('yargi_parse_seconds', 'Kaynak yanıtı ayrıştırma süresi', ('source', 'parser'))
+PARSE_ERRORS = Counter('yargi_parse_errors_total', 'Ayrıştırma hataları', ('source', 'parser', 'error'))
+UPSTREAM_REJECTED = Counter('yargi_upstream_rejected_total', 'Devre açıkken gönderilmeden reddedilen istekler',
+                            ('source',))
+UPSTREAM_CIRCUIT_OPEN = Gauge('yargi_upstream_circuit_open', 'Devre durumu (0: kapalı, 1: açık/yarı açık)',
+                              ('source',))
+UPSTREAM_TIMEOUT = Gauge('yargi_upstream_timeout_seconds', 'Kaynak için kullanılan son zaman aşımı', ('source',))
+UPSTREAM_QUEUE_SECONDS = Histogram('yargi_upstream_queue_seconds', 'İsteğin host bütçesinde sıra bekleme süresi',
+                                   ('source', 'priority'))
+UPSTREAM_QUEUE_DEPTH = Gauge('yargi_upstream_queue_depth', 'Host bütçesinde sıra bekleyen istek sayısı',
+                             ('source', 'priority'))
+UPSTREAM_QUEUE_TIMEOUTS = Counter('yargi_upstream_queue_timeouts_total', 'Sıra beklerken süresi dolan istekler',
+                                  ('source', 'priority'))
+UPSTREAM_IN_FLIGHT = Gauge('yargi_upstream_in_flight', 'Kaynakta süren istek sayısı', ('source',))
+MEVZUAT_REFRESH = Counter('yargi_mevzuat_refresh_total', 'Kanun ön ısıtma ve yenileme sonuçları', ('result',))
+CACHE_REQUESTS = Counter('yargi_cache_requests_total', 'Önbellek aramaları', ('cache', 'result'))
+REQUEST_SECONDS = Histogram('yargi_request_seconds', 'Uç nokta yanıt süresi', ('route', 'status'))
+
+
+def render():
+    """Bütün ölçümleri Prometheus metin biçiminde döndürür."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# ==================== KAYNAK ADLARI ====================
+_sources = {}
+
+
+def register_source(base_url, name):
+    """Bir kaynağın adresini (host:port) ölçümlerde kullanılacak adla eşler."""
+    parts = urllib.parse.urlsplit(base_url)
+    _sources[(parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))] = name
+
+
+def source_for(host, port):
+    return _sources.get((host, port), host)
+
+
+def error_class(exc):
+    """Hatayı sınırlı sayıda etikete indirger: timeout, connection, ssl, http_4xx, ..."""
+    status = getattr(exc, 'status', None)
+    if isinstance(status, int):
+        return f'http_{status // 100}xx'
+    if isinstance(exc, (socket.timeout, TimeoutError)):
+        return 'timeout'
+    if isinstance(exc, ssl.SSLError):
+        return 'ssl'
+    if isinstance(exc, (ConnectionError, socket.gaierror)):
+        return 'connection'
+    if isinstance(exc, ValueError):
+        return 'invalid_response'
+    if isinstance(exc, OSError):
+        return 'connection'
+    return type(exc).__name__
+
+
+# ==================== KAYIT ====================
+def record_upstream(host, port, connect, ttfb, download, size):
+    source = source_for(host, port)
+    if connect is not None:
+        UPSTREAM_CONNECT.observe(connect, source=source)
+        timing(f'{source}-connect', connect)
+    UPSTREAM_TTFB.observe(ttfb, source=source)
+    UPSTREAM_DOWNLOAD.observe(download, source=source)
+    UPSTREAM_BYTES.observe(size, source=source)
+    timing(f'{source}-ttfb', ttfb)
+    timing(f'{source}-download', download)
+
+
+def record_upstream_error(host, port, exc):
+    UPSTREAM_ERRORS.inc(source=source_for(host, port), error=error_class(exc))
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+    timing(f'cache-{cache}', None, 'hit' if hit else 'miss')
+
+
+@contextlib.contextmanager
+def parse(source, parser):
+    """Bloğun süresini ayrıştırma ölçümü olarak kaydeder; hataları sınıflandırır."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        PARSE_ERRORS.inc(source=source, parser=parser, error=error_class(e))
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        PARSE_SECONDS.observe(elapsed, source=source, parser=parser)
+        timing(f'{source}-parse', elapsed)
+
+
+# ==================== SERVER-TIMING ====================
+_timings = contextvars.ContextVar('server_timings', default=None)
+
+
+def start_request():
+    """Bu istek (ve ondan kopyalanan bağlamlar) için süre dökümünü başlatır."""
+    return _timings.set([])
+
+
+def end_request(token):
+    _timings.reset(token)
+
+
+def timing(name, seconds, description=None):
+    entries = _timings.get()
+    if entries is not None:
+        entries.append((name, seconds, description))
+
+
+def server_timing_enabled(headers):
+    return SERVER_TIMING or headers.get('X-Server-Timing') == '1'
+
+
+def server_timing(total=None):
+    """Kaydedilen süreleri ada göre toplayıp Server-Timing başlık değeri üretir."""
+    durations = {}
+    descriptions = {}
+    for name, seconds, description in _timings.get() or ():
+        if seconds is not None:
+            durations[name] = (durations.get(name) or 0) + seconds
+        else:
+            durations.setdefault(name, None)
+        if description:
+            descriptions[name] = description
+    if total is not None:
+        durations['total'] = total
+    parts = []
+    for name, seconds in durations.items():
+        part = name
+        if name in descriptions:
+            part += f';desc="{descriptions[name]}"'
+        if seconds is not None:
+            part += f';dur={seconds * 1000:.1f}'
+        parts.append(part)
+    return ', '.join(parts)
@@ -0,0 +1,647 @@
+"""mevzuat.gov.tr kanun metinlerini indirip yapısal olarak ayrıştırma.
+
+Bir kanunun HTML'i bir kez indirilip tek geçişte kitap/kısım/bölüm/madde
+hiyerarşisine, maddeler de fıkra ve bentlere ayrılır. Her madde önceden
+JSON'a çevrilir; sonuç kanun numarasıyla önbelleğe alınır ve hem /mevzuat
+hem /mevzuat/madde tarafından kullanılır.
+
+MEVZUAT_SNAPSHOT_DIR ayarlıysa ayrıştırılmış kanunlar bu dizine sıkıştırılmış
+anlık görüntü olarak yazılır; yeni işçiler kanunu indirmek yerine buradan
+yükler. Yeniden denetlemede (refresh_kanun) metnin özeti önceki sürümle
+aynıysa kanun yeniden ayrıştırılmaz.
+"""
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+
+from core import http, metrics
+from core.cache import STALE_CACHE_TTL, TTLCache
+from core.responses import int_arg
+from core.singleflight import coalesce
+from core.text import html_to_text
+
+MEVZUAT_BASE_URL = os.environ.get('MEVZUAT_BASE_URL', 'https://www.mevzuat.gov.tr')
+MEVZUAT_URL = MEVZUAT_BASE_URL + "/anasayfa/MevzuatFihristDetayIframe?MevzuatTur=1&MevzuatNo={kanun_no}&MevzuatTertip=5"
+metrics.register_source(MEVZUAT_BASE_URL, 'mevzuat')
+
+HEADERS = {
+    'Accept': 'text/html',
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+# "MADDE 5-", "Madde 5/A –", "EK MADDE 3-", "Geçici Madde 1 –"
+MADDE_BASI_RE = re.compile(
+    r'^(?:(?P<tur>EK|Ek|GEÇİCİ|Geçici)\s+)?(?:MADDE|Madde)\s+(?P<no>\d+)'
+    r'(?:\s*/\s*(?P<harf>[A-ZÇĞİÖŞÜa-zçğıöşü])\b)?\s*[-–—]\s*'
+)
+# "BİRİNCİ KİTAP", "ON İKİNCİ BÖLÜM"
+BASLIK_RE = re.compile(r'^(?:[A-ZÇĞİÖŞÜ]+\s+){1,3}(?P<tur>KİTAP|KISIM|BÖLÜM)$')
+FIKRA_RE = re.compile(r'^\((\d+)\)\s*')
+BENT_RE = re.compile(r'^([a-zçğıöşü])\)\s+')
+ALT_BENT_RE = re.compile(r'^(\d+)\.\s+')
+TITLE_RE = re.compile(r'<(?:div[^>]*class="[^"]*mevzuatBaslik[^"]*"|h1)[^>]*>(.*?)</(?:div|h1)>', re.S | re.I)
+
+MADDE_TURLERI = {'EK': 'ek', 'Ek': 'ek', 'GEÇİCİ': 'gecici', 'Geçici': 'gecici', None: 'madde'}
+YAPI_TURLERI = {'KİTAP': 'kitap', 'KISIM': 'kisim', 'BÖLÜM': 'bolum'}
+
+# Madde başlığı en fazla bu kadar karakterdir; daha uzun satırlar metindir
+MADDE_BASLIGI_MAX = 120
+
+# /mevzuat/madde isteğinde verilen madde numaraları: "5", "5/A", "ek-1", "gecici-3"
+MADDE_NO_RE = re.compile(
+    r'^(?:(?P<tur>ek|gecici|geçici)\s*[-\s]?\s*)?(?P<no>\d+)(?:\s*/\s*(?P<harf>[a-zçğıöşü]))?$'
+)
+# "10-15" gibi asıl madde aralıkları
+MADDE_ARALIK_RE = re.compile(r'^(\d+)\s*[-–]\s*(\d+)$')
+
+# Maddeler JSON'a çevrilirken dışarıda bırakılan iç alanlar
+IC_ALANLAR = frozenset({'sira', 'ofset'})
+
+# Sık kullanılan kanunların numaraları
+KANUN_NUMARALARI = {
+    "TCK": "5237",      # Türk Ceza Kanunu
+    "CMK": "5271",      # Ceza Muhakemesi Kanunu
+    "TMK": "4721",      # Türk Medeni Kanunu
+    "TBK": "6098",      # Türk Borçlar Kanunu
+    "HMK": "6100",      # Hukuk Muhakemeleri Kanunu
+    "İİK": "2004",      # İcra ve İflas Kanunu
+    "IIK": "2004",      # İcra ve İflas Kanunu (alternatif)
+    "TTK": "6102",      # Türk Ticaret Kanunu
+    "İK": "4857",       # İş Kanunu
+    "IK": "4857",       # İş Kanunu (alternatif)
+    "ANAYASA": "2709",  # Anayasa
+    "VUK": "213",       # Vergi Usul Kanunu
+    "KVK": "5520",      # Kurumlar Vergisi Kanunu
+    "GVK": "193",       # Gelir Vergisi Kanunu
+    "KVKK": "6698",     # Kişisel Verilerin Korunması Kanunu
+    "SGK": "5510",      # Sosyal Sigortalar ve Genel Sağlık Sigortası Kanunu
+}
+
+# Karar metinlerinde geçen tam kanun adları (atıf çıkarımı için)
+KANUN_ADLARI = {
+    "Türk Ceza Kanunu": "5237",
+    "Ceza Muhakemesi Kanunu": "5271",
+    "Türk Medeni Kanunu": "4721",
+    "Türk Borçlar Kanunu": "6098",
+    "Hukuk Muhakemeleri Kanunu": "6100",
+    "İcra ve İflas Kanunu": "2004",
+    "Türk Ticaret Kanunu": "6102",
+    "İş Kanunu": "4857",
+    "Anayasa": "2709",
+    "Vergi Usul Kanunu": "213",
+    "Kurumlar Vergisi Kanunu": "5520",
+    "Gelir Vergisi Kanunu": "193",
+    "Kişisel Verilerin Korunması Kanunu": "6698",
+    "Sosyal Sigortalar ve Genel Sağlık Sigortası Kanunu": "5510",
+}
+
+# /mevzuat sayfa başına madde sayısı
+MEVZUAT_PER_PAGE = 50
+MEVZUAT_MAX_PER_PAGE = 500
+
+CACHE_TTL = int(os.environ.get('MEVZUAT_CACHE_TTL', 6 * 3600))
+
+# Ayrıştırılmış kanunların disk anlık görüntüleri; boşsa kapalı
+SNAPSHOT_DIR = os.environ.get('MEVZUAT_SNAPSHOT_DIR', '')
+SNAPSHOT_VERSION = 1
+
+_cache = TTLCache(
+    maxsize=int(os.environ.get('MEVZUAT_CACHE_SIZE', 32)),
+    ttl=CACHE_TTL,
+    stale_ttl=STALE_CACHE_TTL
+)
+
+
+class Kanun:
+    """Ayrıştırılmış kanun: başlık, yapı, maddeler ve maddelerin önceden JSON'a çevrilmiş hali."""
+
+    def __init__(self, kanun_no, title, maddeler, yapi, full_text, surum=None):
+        self.kanun_no = kanun_no
+        self.title = title
+        self.maddeler = maddeler
+        self.yapi = yapi
+        self.full_text = full_text
+        # Değişiklik denetimi için metin özeti ve kaynağın ETag/Last-Modified başlıkları
+        self.surum = surum or {"hash": metin_ozeti(full_text)}
+        # Kaynakla en son karşılaştırıldığı an (time.time())
+        self.denetlendi = time.time()
+        # Aralık yanıtları bu JSON parçalarını birleştirir, yeniden serileştirmez
+        self.maddeler_json = [
+            json.dumps({k: v for k, v in m.items() if k not in IC_ALANLAR},
+                       ensure_ascii=False, separators=(',', ':'))
+            for m in maddeler
+        ]
+        # Her madde türü için (numara, harf) sırasına dizilmiş anahtarlar ve
+        # maddelerin listedeki konumları; aramalar ikili aramayla yapılır
+        self._sirali = {}
+        for i, m in enumerate(maddeler):
+            self._sirali.setdefault(m['tur'], []).append((tuple(m['sira']), i))
+        for tablo in self._sirali.values():
+            tablo.sort()
+        self._anahtarlar = {tur: [key for key, _ in tablo] for tur, tablo in self._sirali.items()}
+        self._asil = self._sirali.get('madde', [])
+        self._asil_keys = self._anahtarlar.get('madde', [])
+
+    def bul(self, tur, no, harf=''):
+        """Maddenin listedeki konumunu döndürür, bulunamazsa None."""
+        keys = self._anahtarlar.get(tur, [])
+        i = bisect.bisect_left(keys, (no, harf))
+        if i < len(keys) and keys[i] == (no, harf):
+            return self._sirali[tur][i][1]
+        return None
+
+    def metin(self, i):
+        """i. maddenin metni; ofset tablosundan kesilip boşlukları daraltılır."""
+        start, end = self.maddeler[i]['ofset']
+        return re.sub(r'\s+', ' ', self.full_text[start:end].strip())
+
+    def madde(self, madde_no):
+        """Madde metnini döndürür ("5", "5/A", "ek-1", "gecici-1"), bulunamazsa None."""
+        key = parse_madde_no(madde_no)
+        i = None if key is None else self.bul(*key)
+        return None if i is None else self.metin(i)
+
+    def secim(self, spec):
+        """"1,5,10-15" gibi bir seçimi madde konumlarına çevirir.
+
+        Dönüş: (konumlar, bulunamayanlar). Konumlar istek sırasındadır,
+        tekrar edenler bir kez yer alır.
+        """
+        konumlar = []
+        bulunamayan = []
+        for parca in spec.split(','):
+            parca = parca.strip()
+            if not parca:
+                continue
+            aralik = MADDE_ARALIK_RE.match(parca)
+            if aralik:
+                bulunan = self.aralik(int(aralik.group(1)), int(aralik.group(2)))
+            else:
+                key = parse_madde_no(parca)
+                i = None if key is None else self.bul(*key)
+                bulunan = [] if i is None else [i]
+            if not bulunan:
+                bulunamayan.append(parca)
+            konumlar.extend(bulunan)
+        return list(dict.fromkeys(konumlar)), bulunamayan
+
+    def aralik(self, baslangic=None, bitis=None, tur='madde'):
+        """Numarası [baslangic, bitis] aralığındaki maddelerin konumlarını döndürür.
+
+        Asıl maddelerde aralık ikili aramayla bulunur; "5/A" gibi ara
+        maddeler 5 ile 6 arasında yer alır. Ek ve geçici maddeler
+        tur='ek' / tur='gecici' ile kendi numaralarına göre seçilir.
+        """
+        if tur != 'madde':
+            return [i for i, m in enumerate(self.maddeler) if m['tur'] == tur
+                    and (baslangic is None or m['sira'][0] >= baslangic)
+                    and (bitis is None or m['sira'][0] <= bitis)]
+        lo = 0 if baslangic is None else bisect.bisect_left(self._asil_keys, (baslangic, ''))
+        hi = len(self._asil) if bitis is None else bisect.bisect_right(self._asil_keys, (bitis, '\uffff'))
+        return [i for _, i in self._asil[lo:hi]]
+
+
+def _madde_key(tur, no, harf):
+    key = f"{no}/{harf}" if harf else str(no)
+    return key if tur == 'madde' else f"{tur}-{key}"
+
+
+def parse_madde_no(madde_no):
+    """İstekteki madde numarasını (tur, no, harf) anahtarına çevirir, geçersizse None."""
+    match = MADDE_NO_RE.match(str(madde_no).strip().lower())
+    if not match:
+        return None
+    tur = {'ek': 'ek', 'gecici': 'gecici', 'geçici': 'gecici', None: 'madde'}[match.group('tur')]
+    harf = (match.group('harf') or '').upper()
+    return tur, int(match.group('no')), harf
+
+
+def parse_structure(lines):
+    """Satırlardan kanun yapısını ve maddeleri tek geçişte çıkarır.
+
+    Dönüş: (maddeler, yapi). Her madde; anahtarı, başlığı, bağlı olduğu
+    kitap/kısım/bölüm, tam metni ve fıkra/bent ağacını içerir. Satırlar
+    metnin '\n' ile bölünmüş hali olmalıdır: her maddenin metindeki
+    [başlangıç, bitiş) ofseti de aynı geçişte 'ofset' alanına yazılır. yapi,
+    kitap/kısım/bölüm başlıklarını ilk ve son maddeleriyle birlikte verir.
+    """
+    maddeler = []
+    yapi = []
+    ust = {'KİTAP': None, 'KISIM': None, 'BÖLÜM': None}
+    baslik_bekleyen = None   # başlık satırı henüz gelmemiş yapı düğümü
+    madde_basligi = ""
+    madde = fikra = bent = None
+
+    def madde_basi_mi(i):
+        return i < len(lines) and MADDE_BASI_RE.match(lines[i]) is not None
+
+    def madde_basligi_mi(line):
+        # Başlıksız maddelerde madde başından önceki satır önceki maddenin son fıkrası/bendidir
+        return (len(line) <= MADDE_BASLIGI_MAX and not line.endswith(('.', ':', ';', ',', '!', '?'))
+                and not (FIKRA_RE.match(line) or BENT_RE.match(line) or ALT_BENT_RE.match(line)))
+
+    pos = 0
+    for i, line in enumerate(lines):
+        line_start = pos
+        pos += len(line) + 1
+        heading = BASLIK_RE.match(line)
+        if heading:
+            tur = heading.group('tur')
+            node = {"tur": YAPI_TURLERI[tur], "ad": line, "baslik": "", "ilk_madde": None, "son_madde": None}
+            yapi.append(node)
+            ust[tur] = node
+            # Üst düzey yeni bir başlık alt düzeyleri kapatır
+            if tur == 'KİTAP':
+                ust['KISIM'] = ust['BÖLÜM'] = None
+            elif tur == 'KISIM':
+                ust['BÖLÜM'] = None
+            baslik_bekleyen = node
+            madde = None
+            continue
+
+        start = MADDE_BASI_RE.match(line)
+        if start:
+            tur = MADDE_TURLERI[start.group('tur')]
+            no = int(start.group('no'))
+            harf = (start.group('harf') or '').upper()
+            madde = {
+                "no": _madde_key(tur, no, harf),
+                "tur": tur,
+                "sira": [no, harf],
+                "baslik": madde_basligi,
+                "kitap": ust['KİTAP'] and ust['KİTAP']['ad'],
+                "kisim": ust['KISIM'] and ust['KISIM']['ad'],
+                "bolum": ust['BÖLÜM'] and ust['BÖLÜM']['ad'],
+                "text": line,
+                "fikralar": [],
+                "ofset": [line_start, line_start + len(line)]
+            }
+            maddeler.append(madde)
+            for node in ust.values():
+                if node is not None:
+                    node['ilk_madde'] = node['ilk_madde'] or madde['no']
+                    node['son_madde'] = madde['no']
+            baslik_bekleyen = None
+            madde_basligi = ""
+            fikra = bent = None
+            line = line[start.end():]
+            if not line:
+                continue
+        elif madde_basi_mi(i + 1) and madde_basligi_mi(line):
+            # Madde başından hemen önceki (metin olamayacak) satır o maddenin başlığıdır
+            madde_basligi = line
+            continue
+        elif baslik_bekleyen is not None and not baslik_bekleyen['baslik']:
+            baslik_bekleyen['baslik'] = line
+            continue
+        elif madde is None:
+            continue
+        else:
+            madde['text'] += '\n' + line
+            madde['ofset'][1] = line_start + len(line)
+
+        fikra_match = FIKRA_RE.match(line)
+        bent_match = BENT_RE.match(line)
+        alt_match = ALT_BENT_RE.match(line)
+        if fikra_match:
+            fikra = {"no": int(fikra_match.group(1)), "text": line[fikra_match.end():], "bentler": []}
+            madde['fikralar'].append(fikra)
+            bent = None
+        elif bent_match and fikra is not None:
+            bent = {"no": bent_match.group(1), "text": line[bent_match.end():], "alt_bentler": []}
+            fikra['bentler'].append(bent)
+        elif alt_match and bent is not None:
+            bent['alt_bentler'].append({"no": int(alt_match.group(1)), "text": line[alt_match.end():]})
+        elif fikra is None:
+            # Numarasız (tek fıkralı) madde
+            fikra = {"no": None, "text": line, "bentler": []}
+            madde['fikralar'].append(fikra)
+        elif bent is not None and bent['alt_bentler']:
+            bent['alt_bentler'][-1]['text'] += ' ' + line
+        elif bent is not None:
+            bent['text'] += ' ' + line
+        else:
+            fikra['text'] += ' ' + line
+
+    return maddeler, yapi
+
+
+def metin_ozeti(full_text):
+    return hashlib.sha256(full_text.encode('utf-8')).hexdigest()[:32]
+
+
+def _kanun_metni(html):
+    """HTML'den (başlık, düz metin)."""
+    title = ""
+    title_match = TITLE_RE.search(html)
+    if title_match:
+        title = html_to_text(title_match.group(1)).replace('\n', ' ')
+    return title, html_to_text(html)
+
+
+def parse_kanun(kanun_no, html, surum=None):
+    """Kanun HTML'ini bir kez ayrıştırıp Kanun nesnesi üretir."""
+    title, full_text = _kanun_metni(html)
+    return _kanun_from_text(kanun_no, title, full_text, surum)
+
+
+def _kanun_from_text(kanun_no, title, full_text, surum=None):
+    maddeler, yapi = parse_structure(full_text.split('\n'))
+    return Kanun(kanun_no, title, maddeler, yapi, full_text, surum)
+
+
+# ==================== ANLIK GÖRÜNTÜ ====================
+def snapshot_path(kanun_no):
+    """Kanunun anlık görüntü dosyası; kapalıysa ya da numara geçersizse None."""
+    if not SNAPSHOT_DIR or not str(kanun_no).isdigit():
+        return None
+    return os.path.join(SNAPSHOT_DIR, f'kanun-{kanun_no}.json.gz')
+
+
+def save_snapshot(kanun):
+    """Kanunu sıkıştırılmış JSON olarak yazar; madde metinleri ofsetlerden geri kurulduğu için yazılmaz."""
+    path = snapshot_path(kanun.kanun_no)
+    if path is None:
+        return
+    data = {
+        "v": SNAPSHOT_VERSION,
+        "kanun_no": kanun.kanun_no,
+        "title": kanun.title,
+        "surum": kanun.surum,
+        "yapi": kanun.yapi,
+        "maddeler": [{k: v for k, v in m.items() if k != 'text'} for m in kanun.maddeler],
+        "full_text": kanun.full_text,
+    }
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    # Okuyan işçiler yarım dosya görmesin diye geçici dosyaya yazılıp yer değiştirilir
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with gzip.open(tmp, 'wt', encoding='utf-8', compresslevel=6) as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def snapshot_age(kanun_no):
+    """Anlık görüntünün son denetlenmesinden bu yana geçen saniye; yoksa None."""
+    path = snapshot_path(kanun_no)
+    try:
+        return time.time() - os.path.getmtime(path) if path else None
+    except OSError:
+        return None
+
+
+def load_snapshot(kanun_no, max_age=None):
+    """Anlık görüntüden Kanun yükler; yoksa, `max_age`'den eskiyse ya da okunamazsa None."""
+    age = snapshot_age(kanun_no)
+    if age is None or (max_age is not None and age > max_age):
+        return None
+    try:
+        with gzip.open(snapshot_path(kanun_no), 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError, EOFError):
+        return None
+    if data.get('v') != SNAPSHOT_VERSION:
+        return None
+    full_text = data['full_text']
+    maddeler = data['maddeler']
+    for m in maddeler:
+        m['text'] = full_text[m['ofset'][0]:m['ofset'][1]]
+    kanun = Kanun(data['kanun_no'], data['title'], maddeler, data['yapi'], full_text, data['surum'])
+    kanun.denetlendi = time.time() - age
+    return kanun
+
+
+def _touch_snapshot(kanun):
+    # Değişmeyen kanunun yalnızca denetim zamanı güncellenir
+    path = snapshot_path(kanun.kanun_no)
+    if path is None:
+        return
+    try:
+        os.utime(path)
+    except OSError:
+        try:
+            save_snapshot(kanun)
+        except OSError:
+            pass
+
+
+# ==================== YÜKLEME ====================
+def get_kanun(kanun_no):
+    """Kanunu önbellekten döndürür; yoksa anlık görüntüden yükler ya da indirip ayrıştırır."""
+    kanun_no = str(kanun_no).strip()
+    kanun = _cache.get(kanun_no)
+    metrics.record_cache('mevzuat', kanun is not None)
+    if kanun is None:
+        try:
+            kanun = _load_kanun(kanun_no)
+        except Exception:
+            # mevzuat.gov.tr erişilemiyorsa süresi dolmuş ayrıştırılmış kanun kullanılır
+            kanun = _cache.get_stale(kanun_no) or load_snapshot(kanun_no)
+            if kanun is None:
+                raise
+            return kanun
+        _cache.set(kanun_no, kanun)
+    return kanun
+
+
+def refresh_kanun(kanun_no):
+    """Kanunu kaynaktan yeniden denetleyip önbelleğe koyar.
+
+    Dönüş: 'new', 'changed' ya da 'unchanged'. Değişmeyen kanun yeniden
+    ayrıştırılmaz; önbellekteki (ya da anlık görüntüdeki) nesne kullanılır.
+    """
+    kanun_no = str(kanun_no).strip()
+    kanun, durum = _fetch_kanun(kanun_no)
+    _cache.set(kanun_no, kanun)
+    return durum
+
+
+def warm_kanun(kanun_no, max_age, fetch=True):
+    """Ön ısıtma: kanunu önbelleğe getirir, son denetimi `max_age`'den eskiyse kaynakla karşılaştırır.
+
+    Önbellekte yoksa ya da diskteki anlık görüntü daha yeniyse (başka bir
+    işçi yenilediyse) anlık görüntü yüklenir. fetch=False iken kaynağa
+    gidilmez. Dönüş: 'cached', 'snapshot', 'missing' ya da refresh_kanun
+    sonucu.
+    """
+    kanun_no = str(kanun_no).strip()
+    kanun = _cache.get(kanun_no)
+    durum = 'cached'
+    age = snapshot_age(kanun_no)
+    if age is not None and (kanun is None or time.time() - age > kanun.denetlendi):
+        yuklenen = load_snapshot(kanun_no)
+        if yuklenen is not None:
+            kanun = yuklenen
+            _cache.set(kanun_no, kanun)
+            durum = 'snapshot'
+    if fetch and (kanun is None or time.time() - kanun.denetlendi >= max_age):
+        return refresh_kanun(kanun_no)
+    if kanun is None:
+        return 'missing'
+    return durum
+
+
+@coalesce
+def _load_kanun(kanun_no):
+    # Aynı kanun için eşzamanlı istekler tek indirme/ayrıştırmayı paylaşır
+    kanun = load_snapshot(kanun_no, max_age=CACHE_TTL)
+    if kanun is not None:
+        metrics.CACHE_REQUESTS.inc(cache='mevzuat', result='snapshot')
+        return kanun
+    return _fetch_kanun(kanun_no)[0]
+
+
+@coalesce
+def _fetch_kanun(kanun_no):
+    onceki = _cache.get_stale(kanun_no) or load_snapshot(kanun_no)
+    headers = dict(HEADERS)
+    if onceki is not None:
+        # Kaynak ETag/Last-Modified veriyorsa koşullu istekle gövde hiç indirilmez
+        if onceki.surum.get('etag'):
+            headers['If-None-Match'] = onceki.surum['etag']
+        if onceki.surum.get('last_modified'):
+            headers['If-Modified-Since'] = onceki.surum['last_modified']
+    response = http.get(MEVZUAT_URL.format(kanun_no=kanun_no), headers=headers)
+    if response.status == 304 and onceki is not None:
+        _touch_snapshot(onceki)
+        onceki.denetlendi = time.time()
+        return onceki, 'unchanged'
+
+    surum = {"etag": response.headers.get('ETag'), "last_modified": response.headers.get('Last-Modified')}
+    with metrics.parse('mevzuat', 'kanun'):
+        title, full_text = _kanun_metni(response.text())
+        surum['hash'] = metin_ozeti(full_text)
+        if onceki is not None and onceki.surum.get('hash') == surum['hash']:
+            onceki.surum = surum
+            _touch_snapshot(onceki)
+            onceki.denetlendi = time.time()
+            return onceki, 'unchanged'
+        kanun = _kanun_from_text(kanun_no, title, full_text, surum)
+    try:
+        save_snapshot(kanun)
+    except OSError:
+        # Anlık görüntü yazılamıyorsa (ör. salt okunur dosya sistemi) kanun yalnızca bellekte tutulur
+        pass
+    kanun.denetlendi = time.time()
+    return kanun, 'new' if onceki is None else 'changed'
+
+
+# ==================== YANITLAR ====================
+# /mevzuat ve /mevzuat/madde yanıtları Flask uygulamasında, Vercel fonksiyonlarında
+# ve (aio.run_blocking ile) ASGI modunda kullanılır: (durum kodu, sözlük ya da hazır JSON metni)
+def sayfa_yaniti(args):
+    """Sorgu parametrelerinden /mevzuat yanıtı (bkz. kanun_sayfasi)."""
+    return kanun_sayfasi(
+        query=args.get('query', ''),
+        kanun_no=args.get('no', ''),
+        tur=args.get('tur', 'madde'),
+        baslangic=int_arg(args, 'from'),
+        bitis=int_arg(args, 'to'),
+        page=int_arg(args, 'page', 1),
+        per_page=int_arg(args, 'per_page', MEVZUAT_PER_PAGE),
+        yapi=bool(args.get('yapi'))
+    )
+
+
+def kanun_sayfasi(query='', kanun_no='', tur='madde', baslangic=None, bitis=None,
+                  page=1, per_page=MEVZUAT_PER_PAGE, yapi=False):
+    """Kanun maddelerini (from/to aralığı, sayfalı) listeleyen /mevzuat yanıtı."""
+    query = query.strip().upper()
+
+    # Kısaltma kontrolü
+    if query in KANUN_NUMARALARI:
+        kanun_no = KANUN_NUMARALARI[query]
+
+    if not kanun_no and not query:
+        return 400, {"error": "query veya no parameter required"}
+
+    page = max(page, 1)
+    per_page = min(max(per_page, 1), MEVZUAT_MAX_PER_PAGE)
+
+    if tur not in ('madde', 'ek', 'gecici', 'hepsi'):
+        return 400, {"error": "tur madde, ek, gecici veya hepsi olmalı"}
+
+    if not kanun_no:
+        return 200, {"success": False, "error": "Kanun numarası bulunamadı"}
+
+    try:
+        kanun = get_kanun(kanun_no)
+        if tur == 'hepsi':
+            secilen = range(len(kanun.maddeler))
+        else:
+            secilen = kanun.aralik(baslangic, bitis, tur)
+        sayfa = secilen[(page - 1) * per_page:page * per_page]
+
+        meta = {
+            "success": True,
+            "kanun_no": kanun_no,
+            "title": kanun.title,
+            "toplam_madde": len(secilen),
+            "madde_sayisi": len(sayfa),
+            "page": page,
+            "per_page": per_page,
+            "source": "mevzuat.gov.tr"
+        }
+        if yapi:
+            meta["yapi"] = kanun.yapi
+
+        # Maddeler ayrıştırma sırasında JSON'a çevrildi; burada yalnızca birleştirilir
+        return 200, (json.dumps(meta, ensure_ascii=False)[:-1]
+                     + ', "maddeler": [' + ','.join(kanun.maddeler_json[i] for i in sayfa) + ']}')
+    except Exception as e:
+        return 200, {"success": False, "error": str(e)}
+
+
+def madde_yaniti(kanun, madde_no):
+    """Tek maddenin ya da "1,5,10-15" gibi bir seçimin tam metnini veren /mevzuat/madde yanıtı."""
+    kanun = kanun.strip().upper()
+    madde_no = madde_no.strip()
+
+    # Kısaltmayı numaraya çevir
+    kanun_no = KANUN_NUMARALARI.get(kanun, kanun)
+
+    if not kanun_no or not madde_no:
+        return 400, {"error": "kanun ve madde parametreleri gerekli"}
+
+    try:
+        # Kanun bir kez indirilip ayrıştırılır, sonraki maddeler önbellekten gelir
+        parsed = get_kanun(kanun_no)
+
+        if ',' not in madde_no and not MADDE_ARALIK_RE.match(madde_no):
+            madde_text = parsed.madde(madde_no)
+            if madde_text is None:
+                return 200, {"success": False, "error": f"Madde {madde_no} bulunamadı"}
+
+            return 200, {
+                "success": True,
+                "kanun": kanun,
+                "kanun_no": kanun_no,
+                "madde": madde_no,
+                "content": madde_text,
+                "source": "mevzuat.gov.tr"
+            }
+
+        konumlar, bulunamayan = parsed.secim(madde_no)
+        if len(konumlar) > MEVZUAT_MAX_PER_PAGE:
+            return 400, {"error": f"en fazla {MEVZUAT_MAX_PER_PAGE} madde istenebilir"}
+        if not konumlar:
+            return 200, {"success": False, "error": f"Madde {madde_no} bulunamadı"}
+
+        return 200, {
+            "success": True,
+            "kanun": kanun,
+            "kanun_no": kanun_no,
+            "madde": madde_no,
+            "maddeler": [
+                {"madde": parsed.maddeler[i]['no'], "content": parsed.metin(i)}
+                for i in konumlar
+            ],
+            "bulunamayan": bulunamayan,
+            "source": "mevzuat.gov.tr"
+        }
+
+    except Exception as e:
+        return 200, {"success": False, "error": str(e)}
@@ -0,0 +1,203 @@
+"""Flask (app.py), ASGI (asgi.py) ve Vercel (api/) giriş noktalarının ortak yanıt akışı.
+
+Uç gövdeleri core modüllerindedir ve (durum kodu, sözlük ya da hazır JSON
+metni) döndürür. Önbelleğe alınan uçların anahtarı, süresi ve
+Cache-Control değeri CACHED'dedir; önbellek isabeti, süresi dolmuş yanıt
+sunma, ETag/304 ve sıkıştırma burada yapılır. Giriş noktaları yalnızca
+render() sonucunu (durum, gövde, başlıklar) kendi yanıt nesnesine çevirir.
+"""
+import os
+
+from core import metrics
+from core.cache import cache_key, etag_matches, make_cache
+from core.encoding import Body, BodyCache, compress, compressible, dumps, negotiate
+
+# Yanıt önbelleği süreleri (saniye); kararlar değişmediği için uzun tutulur
+DOCUMENT_CACHE_TTL = int(os.environ.get('DOCUMENT_CACHE_TTL', 7 * 24 * 3600))
+SEARCH_CACHE_TTL = int(os.environ.get('SEARCH_CACHE_TTL', 300))
+
+DOCUMENT_CACHE_CONTROL = f'public, max-age={DOCUMENT_CACHE_TTL}, immutable'
+SEARCH_CACHE_CONTROL = f'public, max-age={SEARCH_CACHE_TTL}'
+
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 2048))
+
+JSON_TYPE = 'application/json'
+
+# Karar uçlarında anahtara yalnızca istekte varsa giren aralık parametreleri (core.documents.parse_range)
+RANGE_PARAMS = (('offset', None), ('length', None), ('para', None))
+
+
+# / yanıtı
+SERVICE_INFO = {
+    "service": "Yargı API v2.0",
+    "endpoints": [
+        "/search - Yargıtay kararları ara",
+        "/search/all - Yargıtay, Danıştay ve AYM'de birlikte ara",
+        "/search/stream - Arama sonuçlarını NDJSON olarak akıt",
+        "/search/local - Daha önce getirilmiş kararlarda yerel tam metin arama",
+        "/document - Karar içeriği getir (offset/length ya da para=3-7 ile tam metnin bir parçası)",
+        "/documents (POST) - Birden çok karar içeriğini birlikte getir",
+        "/danistay - Danıştay kararları ara",
+        "/danistay/document - Danıştay karar içeriği",
+        "/mevzuat - Kanun maddeleri (from/to aralığı, sayfalı, fıkra/bent yapısıyla)",
+        "/mevzuat/madde - Kanun maddesi içeriği (madde=1,5,10-15 ile birden çok madde)",
+        "/mevzuat/madde/atiflar - Maddeye atıf yapan kararlar ya da bir kararın atıf yaptığı maddeler",
+        "/aym - Anayasa Mahkemesi kararları ara (page ile sayfalı)",
+        "/aym/document - Anayasa Mahkemesi karar metni",
+        "/metrics - Kaynak gecikme, hata ve önbellek ölçümleri (Prometheus)"
+    ],
+    "sources": [
+        "Bedesten API (Yargıtay)",
+        "karararama.danistay.gov.tr (Danıştay)",
+        "mevzuat.gov.tr (Mevzuat)",
+        "normkararlarbilgibankasi.anayasa.gov.tr (AYM)"
+    ]
+}
+
+
+class Cached:
+    """Önbelleğe alınan bir ucun anahtarı (namespace + parametreler), süresi ve Cache-Control'ü.
+
+    Varsayılanı None olan parametreler yalnızca istekte varsa (adıyla
+    birlikte) anahtara girer. cacheable verilirse yalnızca onu sağlayan
+    başarılı yanıtlar saklanır.
+    """
+
+    def __init__(self, namespace, params, ttl, cache_control, cacheable=None):
+        self.namespace = namespace
+        self.params = params
+        self.ttl = ttl
+        self.cache_control = cache_control
+        self.cacheable = cacheable
+        self.name = ':'.join(namespace)
+
+    def key(self, args):
+        return self.namespace + cache_key(args, self.params)
+
+
+CACHED = {
+    '/search': Cached(('search', 'yargitay'), (('keyword', ''), ('court', 'YARGITAYKARARI'), ('page', '1')),
+                      SEARCH_CACHE_TTL, SEARCH_CACHE_CONTROL),
+    '/search/all': Cached(('search', 'all'), (('keyword', ''), ('court', 'YARGITAYKARARI'), ('page', '1'),
+                                              ('sources', ''), ('timeout', '')),
+                          SEARCH_CACHE_TTL, SEARCH_CACHE_CONTROL,
+                          # Bir kaynağın hata verdiği kısmi sonuçlar önbelleğe alınmaz
+                          cacheable=lambda body: all(status['success'] for status in body['sources'].values())),
+    '/document': Cached(('document', 'yargitay'), (('id', ''),) + RANGE_PARAMS,
+                        DOCUMENT_CACHE_TTL, DOCUMENT_CACHE_CONTROL),
+    '/danistay': Cached(('search', 'danistay'), (('keyword', ''), ('page', '1')),
+                        SEARCH_CACHE_TTL, SEARCH_CACHE_CONTROL),
+    '/danistay/document': Cached(('document', 'danistay'), (('id', ''),) + RANGE_PARAMS,
+                                 DOCUMENT_CACHE_TTL, DOCUMENT_CACHE_CONTROL),
+    '/aym': Cached(('search', 'aym'), (('keyword', ''), ('page', '1')), SEARCH_CACHE_TTL, SEARCH_CACHE_CONTROL),
+    '/aym/document': Cached(('document', 'aym'), (('id', ''),) + RANGE_PARAMS,
+                            DOCUMENT_CACHE_TTL, DOCUMENT_CACHE_CONTROL),
+}
+
+
+def document_key(source, doc_id):
+    """/document (aralıksız) önbellek anahtarı; POST /documents aynı girdileri kullanır."""
+    return ('document', source, doc_id)
+
+
+class Reply:
+    """Uç sonucu: durum, sözlük/JSON metni, (varsa) kodlanmış gövde ve önbellek durumu (HIT/MISS/STALE)."""
+
+    __slots__ = ('status', 'payload', 'body', 'cache', 'cache_control')
+
+    def __init__(self, status, payload, body=None, cache=None, cache_control=None):
+        self.status = status
+        self.payload = payload
+        self.body = body
+        self.cache = cache
+        self.cache_control = cache_control
+
+
+class ResponseCache:
+    """Yanıt önbelleği ve önbellekteki yanıtların bir kez kodlanmış (ve sıkıştırılmış) gövdeleri."""
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE, ttl=SEARCH_CACHE_TTL):
+        self.cache = make_cache(maxsize=maxsize, ttl=ttl)
+        self.bodies = BodyCache(maxsize=maxsize)
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def get_stale(self, key):
+        return self.cache.get_stale(key)
+
+    def set(self, key, payload, ttl=None):
+        self.cache.set(key, payload, ttl)
+
+    def lookup(self, route, key):
+        """Önbellekteki yanıt (HIT) ya da None; isabet ölçülür."""
+        payload = self.cache.get(key)
+        metrics.record_cache(route.name, payload is not None)
+        if payload is None:
+            return None
+        return Reply(200, payload, self.bodies.get(key, payload), 'HIT', route.cache_control)
+
+    def store(self, route, key, status, payload):
+        """Uçtan gelen yanıtı önbelleğe alır.
+
+        Kaynak hata verdiyse (ya da devresi açıksa) süresi dolmuş yanıt
+        sunulur (STALE, Cache-Control: no-cache).
+        """
+        if status != 200 or not isinstance(payload, dict) or not payload.get('success'):
+            stale = self.cache.get_stale(key) if status == 200 else None
+            if stale is None:
+                return Reply(status, payload)
+            metrics.CACHE_REQUESTS.inc(cache=route.name, result='stale')
+            return Reply(200, stale, cache='STALE', cache_control='no-cache')
+        if route.cacheable is None or route.cacheable(payload):
+            self.cache.set(key, payload, route.ttl)
+            return Reply(200, payload, self.bodies.get(key, payload), 'MISS', route.cache_control)
+        return Reply(200, payload, cache='MISS', cache_control=route.cache_control)
+
+
+def render(reply, accept_encoding=None, if_none_match=None):
+    """Yanıtı (durum, gövde, başlıklar) olarak kodlar.
+
+    Gövde Accept-Encoding'e göre sıkıştırılır. Önbelleğe alınabilen (HIT/MISS)
+    yanıtlara güçlü ETag ve Cache-Control eklenir; If-None-Match eşleşirse
+    gövdesiz 304 döner.
+    """
+    body = reply.body
+    if body is None:
+        payload = reply.payload
+        body = Body(payload.encode('utf-8') if isinstance(payload, str) else dumps(payload))
+    data, content_encoding, etag = body.encode(accept_encoding)
+    headers = {'Content-Type': JSON_TYPE, 'Vary': 'Accept-Encoding'}
+    if content_encoding:
+        headers['Content-Encoding'] = content_encoding
+    if reply.cache:
+        headers['X-Cache'] = reply.cache
+    if reply.cache_control:
+        headers['Cache-Control'] = reply.cache_control
+        if reply.cache != 'STALE':
+            etag = f'"{etag}"'
+            headers['ETag'] = etag
+            if etag_matches(if_none_match, etag):
+                return 304, b'', {'ETag': etag, 'Cache-Control': reply.cache_control}
+    return reply.status, data, headers
+
+
+def render_text(text, content_type, accept_encoding=None):
+    """Düz metin yanıt (ör. /metrics): (gövde, başlıklar); büyükse sıkıştırılır."""
+    data = text.encode('utf-8')
+    headers = {'Content-Type': content_type}
+    if compressible(content_type, len(data)):
+        headers['Vary'] = 'Accept-Encoding'
+        content_encoding = negotiate(accept_encoding)
+        if content_encoding:
+            data = compress(data, content_encoding)
+            headers['Content-Encoding'] = content_encoding
+    return data, headers
+
+
+def int_arg(args, name, default=None):
+    """Sorgu parametresini tam sayıya çevirir; yoksa ya da geçersizse varsayılan."""
+    try:
+        return int(args[name])
+    except (KeyError, TypeError, ValueError):
+        return default
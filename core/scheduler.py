@@ -0,0 +1,410 @@
+"""Kaynak istekleri için merkezi zamanlayıcı: host başına eşzamanlılık ve hız bütçesi, öncelik sınıfları.
+
+core.http ve core.aio her isteği göndermeden önce hostun bütçesinden bir
+yer alır. Yer yoksa istek kuyrukta bekler; kuyruk önce önceliğe, sonra
+geliş sırasına göre boşalır. İki sınıf vardır:
+
+- interactive (varsayılan): bir istemcinin beklediği bütün istekler; tek
+  karar ve arama sayfaları gibi /search/stream sayfaları ve POST /documents
+  kararları da bu sınıftadır.
+- background: kimsenin beklemediği işler; kanun ön ısıtması (core.warmup)
+  ve toplu indirme (harvest.py).
+
+Arka plan istekleri host bütçesinin INTERACTIVE_RESERVE kadar yerini
+etkileşimli isteklere bırakır; böylece toplu iş sürerken gelen etkileşimli
+istek boş bir yer bulur, toplu iş ise kalan kapasiteyi kullanır.
+
+Hız sınırı (saniyedeki istek) jeton kovasıyla uygulanır; kova en fazla bir
+saniyelik jeton biriktirir. Bütçeler süreç içidir; her gunicorn/uvicorn
+işçisi kendi bütçesini tutar.
+
+Öncelik bağlama (contextvars) bağlıdır:
+
+    with scheduler.background():
+        sources.yargitay_document(doc_id)
+
+Sırada bekleme QUEUE_TIMEOUT ile, isteğe zaman aşımı verilmişse onunla da
+sınırlıdır; süresi dolan çağıran için kaynağa gidilmez.
+
+Birleştirilmiş (core.singleflight) çağrılar başlatanın önceliğiyle çalışır;
+daha öncelikli bir çağıran katılırsa (join) çağrının sıradaki ve sonraki
+istekleri o önceliğe yükselir. Böylece ön ısıtmanın başlattığı indirmeyi
+bekleyen kullanıcı isteği arka plan sırasında kalmaz.
+"""
+import collections
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+
+from core import metrics
+
+INTERACTIVE, BACKGROUND = 'interactive', 'background'
+_RANKS = {INTERACTIVE: 0, BACKGROUND: 1}
+
+# Listede olmayan hostlar için eşzamanlı istek ve saniyedeki istek sınırı (0: sınırsız)
+DEFAULT_CONCURRENCY = int(os.environ.get('UPSTREAM_MAX_CONCURRENCY', 16))
+DEFAULT_RPS = float(os.environ.get('UPSTREAM_RPS', 0))
+
+# Arka plan isteklerinin kullanamayacağı, etkileşimli isteklere ayrılan yer sayısı
+INTERACTIVE_RESERVE = int(os.environ.get('UPSTREAM_INTERACTIVE_RESERVE', 2))
+
+# Kuyrukta en fazla bekleme (saniye); aşılırsa istek kaynağa gitmeden hata verir
+QUEUE_TIMEOUT = float(os.environ.get('UPSTREAM_QUEUE_TIMEOUT', 30))
+
+# Host başına (eşzamanlılık, saniyedeki istek)
+HOST_BUDGETS = {
+    'bedesten.adalet.gov.tr': (16, 20),
+    'karararama.danistay.gov.tr': (8, 10),
+    'normkararlarbilgibankasi.anayasa.gov.tr': (8, 10),
+    'www.mevzuat.gov.tr': (4, 5),
+}
+
+
+def _parse_budgets(value):
+    """"host=eşzamanlılık/rps,..." biçimindeki UPSTREAM_BUDGETS ayarı."""
+    budgets = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        host, _, budget = item.partition('=')
+        concurrency, _, rps = budget.partition('/')
+        budgets[host.strip()] = (int(concurrency), float(rps or 0))
+    return budgets
+
+
+HOST_BUDGETS.update(_parse_budgets(os.environ.get('UPSTREAM_BUDGETS', '')))
+
+
+class QueueTimeout(Exception):
+    """İstek kuyrukta QUEUE_TIMEOUT süresinden (ya da çağıranın kalan süresinden) uzun beklediğinde fırlatılır."""
+
+    def __init__(self, source, waited):
+        super().__init__(f"{source} kaynağı için sıra beklenirken süre doldu ({waited:.1f} sn)")
+        self.source = source
+        self.waited = waited
+
+
+# ==================== ÖNCELİK ====================
+_priority = contextvars.ContextVar('upstream_priority', default=INTERACTIVE)
+
+
+def current_priority():
+    flight = _flight.get()
+    return flight.priority if flight is not None else _priority.get()
+
+
+@contextlib.contextmanager
+def priority(name):
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def background():
+    """Blok içindeki (ve bu bağlamdan başlatılan iş parçacığı/görevlerdeki) istekler arka plan önceliğinde."""
+    return priority(BACKGROUND)
+
+
+# ==================== BİRLEŞTİRİLMİŞ ÇAĞRILAR ====================
+class Flight:
+    """Birleştirilmiş bir çağrının önceliği ve bu çağrı adına sırada bekleyen istekler."""
+
+    __slots__ = ('priority', 'waiters', 'lock')
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.waiters = set()
+        self.lock = threading.Lock()
+
+
+_flight = contextvars.ContextVar('upstream_flight', default=None)
+
+
+def flight():
+    """Yeni birleştirilmiş çağrının Flight'ı; iç içe çağrılar dıştakini paylaşır."""
+    return _flight.get() or Flight(current_priority())
+
+
+@contextlib.contextmanager
+def flying(flight):
+    """Blok içindeki istekler flight'ın (yükseltilebilir) önceliğiyle sıraya girer."""
+    token = _flight.set(flight)
+    try:
+        yield
+    finally:
+        _flight.reset(token)
+
+
+def join(flight):
+    """Çağrıya katılanın önceliği daha yüksekse çağrıyı ve sıradaki isteklerini yükseltir."""
+    priority = current_priority()
+    with flight.lock:
+        if _RANKS.get(priority, 1) >= _RANKS.get(flight.priority, 1):
+            return
+        flight.priority = priority
+        waiters = list(flight.waiters)
+    for budget, waiter in waiters:
+        budget._promote(waiter, priority)
+
+
+# ==================== HOST BÜTÇESİ ====================
+class _Waiter:
+    __slots__ = ('priority', 'enqueued', 'queued', 'granted', 'cancelled', 'notify')
+
+    def __init__(self, priority, notify):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.queued = False
+        self.granted = False
+        self.cancelled = False
+        self.notify = notify
+
+
+class HostBudget:
+    """Tek bir hostun eşzamanlılık ve hız bütçesi; bekleyenler öncelik kuyruğundadır."""
+
+    def __init__(self, source, concurrency, rps):
+        self.source = source
+        self.concurrency = max(concurrency, 1)
+        self.rps = rps
+        self.active = 0
+        self._tokens = max(rps, 1)
+        self._refilled = time.monotonic()
+        self._queue = []
+        self._seq = itertools.count()
+        self._depth = collections.Counter()
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def _limit(self, priority):
+        if priority == BACKGROUND:
+            return max(self.concurrency - INTERACTIVE_RESERVE, 1)
+        return self.concurrency
+
+    def _dispatch(self):
+        """Bütçe elverdiğince kuyruğun başındakilere yer verir (kilit tutulurken).
+
+        Yer verilen bekleyenleri döndürür; jeton yetmediyse sonraki jetonun
+        zamanına bir kez daha denemek üzere zamanlayıcı kurulur.
+        """
+        granted = []
+        while self._queue:
+            rank, _, waiter = self._queue[0]
+            # İptal edilen ya da yükseltilip yeniden sıraya giren bekleyenin eski kaydı atlanır
+            if waiter.cancelled or waiter.granted or rank != _RANKS.get(waiter.priority, 1):
+                heapq.heappop(self._queue)
+                continue
+            # Kuyruk öncelik sırasında olduğundan baştaki geçemiyorsa arkasındakiler de geçemez
+            if self.active >= self._limit(waiter.priority):
+                return granted
+            if self.rps:
+                now = time.monotonic()
+                self._tokens = min(self._tokens + (now - self._refilled) * self.rps, max(self.rps, 1))
+                self._refilled = now
+                if self._tokens < 1:
+                    self._schedule((1 - self._tokens) / self.rps)
+                    return granted
+                self._tokens -= 1
+            heapq.heappop(self._queue)
+            self._depth[waiter.priority] -= 1
+            self.active += 1
+            waiter.granted = True
+            granted.append(waiter)
+        return granted
+
+    def _schedule(self, delay):
+        if self._timer is None:
+            self._timer = threading.Timer(delay, self._tick)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _tick(self):
+        with self._lock:
+            self._timer = None
+            granted = self._dispatch()
+            self._gauges()
+        self._wake(granted)
+
+    def _enqueue(self, waiter):
+        heapq.heappush(self._queue, (_RANKS.get(waiter.priority, 1), next(self._seq), waiter))
+        self._depth[waiter.priority] += 1
+        waiter.queued = True
+
+    def _promote(self, waiter, priority):
+        """Bekleyeni daha yüksek öncelikle yeniden sıraya koyar (join)."""
+        with self._lock:
+            if waiter.granted or waiter.cancelled or _RANKS.get(priority, 1) >= _RANKS.get(waiter.priority, 1):
+                return
+            if not waiter.queued:
+                # Henüz sıraya girmedi: _enter yeni öncelikle koyar
+                waiter.priority = priority
+                return
+            self._depth[waiter.priority] -= 1
+            waiter.priority = priority
+            self._enqueue(waiter)
+            granted = self._dispatch()
+            self._gauges()
+        self._wake(granted)
+
+    def _cancel(self, waiter):
+        waiter.cancelled = True
+        self._depth[waiter.priority] -= 1
+
+    def _gauges(self):
+        metrics.UPSTREAM_IN_FLIGHT.set(self.active, source=self.source)
+        for name in _RANKS:
+            metrics.UPSTREAM_QUEUE_DEPTH.set(self._depth[name], source=self.source, priority=name)
+
+    def _granted(self, waiter):
+        waited = time.monotonic() - waiter.enqueued
+        metrics.UPSTREAM_QUEUE_SECONDS.observe(waited, source=self.source, priority=waiter.priority)
+        metrics.timing(f'{self.source}-queue', waited)
+
+    def _timed_out(self, waiter):
+        waited = time.monotonic() - waiter.enqueued
+        metrics.UPSTREAM_QUEUE_TIMEOUTS.inc(source=self.source, priority=waiter.priority)
+        return QueueTimeout(self.source, waited)
+
+    @staticmethod
+    def _wake(waiters):
+        for waiter in waiters:
+            waiter.notify()
+
+    def _enter(self, waiter, flight=None):
+        if flight is not None:
+            # Öncelik flight'tan okunur ve bekleyen aynı kilitle kaydedilir; arada gelen join kaçmaz
+            with flight.lock:
+                waiter.priority = flight.priority
+                flight.waiters.add((self, waiter))
+        with self._lock:
+            self._enqueue(waiter)
+            granted = self._dispatch()
+            self._gauges()
+        self._wake(w for w in granted if w is not waiter)
+
+    def _leave(self, waiter):
+        """Süresi dolan bekleyeni kuyruktan çıkarır; bu arada yer verilmişse False."""
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._cancel(waiter)
+            self._gauges()
+        return True
+
+    def _forget(self, waiter, flight):
+        if flight is not None:
+            with flight.lock:
+                flight.waiters.discard((self, waiter))
+
+    def acquire(self, priority=INTERACTIVE, timeout=QUEUE_TIMEOUT, flight=None):
+        """Bütçeden bir yer alır; gerekirse bekler. Sonunda release() çağrılmalıdır.
+
+        flight verilirse öncelik onundur ve beklerken join ile yükseltilebilir.
+        """
+        event = threading.Event()
+        waiter = _Waiter(priority, event.set)
+        self._enter(waiter, flight)
+        try:
+            if not waiter.granted and not event.wait(timeout) and self._leave(waiter):
+                raise self._timed_out(waiter)
+        finally:
+            self._forget(waiter, flight)
+        self._granted(waiter)
+
+    async def acquire_async(self, priority=INTERACTIVE, timeout=QUEUE_TIMEOUT, flight=None):
+        """acquire() karşılığı; olay döngüsünü bloklamadan bekler."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def notify():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = _Waiter(priority, notify)
+        self._enter(waiter, flight)
+        try:
+            if not waiter.granted:
+                try:
+                    await asyncio.wait_for(future, timeout)
+                except asyncio.TimeoutError:
+                    if self._leave(waiter):
+                        raise self._timed_out(waiter) from None
+                except asyncio.CancelledError:
+                    # Beklerken iptal: yer verilmişse geri bırakılır, verilmemişse kuyruktan çıkar
+                    if not self._leave(waiter):
+                        self.release()
+                    raise
+        finally:
+            self._forget(waiter, flight)
+        self._granted(waiter)
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+            granted = self._dispatch()
+            self._gauges()
+        self._wake(granted)
+
+
+_budgets = {}
+_budgets_lock = threading.Lock()
+
+
+def get_budget(host, port):
+    key = (host, port)
+    budget = _budgets.get(key)
+    if budget is None:
+        with _budgets_lock:
+            budget = _budgets.get(key)
+            if budget is None:
+                concurrency, rps = HOST_BUDGETS.get(host, (DEFAULT_CONCURRENCY, DEFAULT_RPS))
+                budget = _budgets[key] = HostBudget(metrics.source_for(host, port), concurrency, rps)
+    return budget
+
+
+def configure(host, concurrency=None, rps=None):
+    """Bir hostun bütçesini değiştirir; yeni değerler bir sonraki istekte geçerli olur."""
+    old_concurrency, old_rps = HOST_BUDGETS.get(host, (DEFAULT_CONCURRENCY, DEFAULT_RPS))
+    HOST_BUDGETS[host] = (old_concurrency if concurrency is None else concurrency,
+                          old_rps if rps is None else rps)
+    with _budgets_lock:
+        for key in [k for k in _budgets if k[0] == host]:
+            budget = _budgets[key]
+            with budget._lock:
+                budget.concurrency, budget.rps = max(HOST_BUDGETS[host][0], 1), HOST_BUDGETS[host][1]
+                granted = budget._dispatch()
+            budget._wake(granted)
+
+
+def _queue_timeout(timeout):
+    return QUEUE_TIMEOUT if timeout is None else min(timeout, QUEUE_TIMEOUT)
+
+
+@contextlib.contextmanager
+def slot(host, port, timeout=None):
+    """İstek süresince hostun bütçesinden bir yer tutar (core.http).
+
+    Sırada en fazla QUEUE_TIMEOUT, çağıranın kalan süresi (timeout) daha
+    kısaysa o kadar beklenir.
+    """
+    budget = get_budget(host, port)
+    budget.acquire(current_priority(), _queue_timeout(timeout), _flight.get())
+    try:
+        yield
+    finally:
+        budget.release()
+
+
+@contextlib.asynccontextmanager
+async def aslot(host, port, timeout=None):
+    """slot() karşılığı (core.aio)."""
+    budget = get_budget(host, port)
+    await budget.acquire_async(current_priority(), _queue_timeout(timeout), _flight.get())
+    try:
+        yield
+    finally:
+        budget.release()
@@ -0,0 +1,71 @@
+"""Vercel fonksiyonları (api/*.py) için ortak istek işleyici.
+
+Her fonksiyon JSONHandler'dan türeyip yalnızca get(params) yazar; uç
+gövdeleri (core.sources.search_response, core.documents.document_response,
+core.mevzuat.sayfa_yaniti ...) Flask ve ASGI uygulamalarıyla aynıdır.
+Fonksiyonlar yalnızca ihtiyaç duydukları modülleri içe aktarır, böylece
+soğuk başlangıçta Flask ve kullanılmayan ayrıştırıcılar yüklenmez.
+
+route verilen uçlar core.responses.CACHED'deki anahtar ve sürelerle
+önbelleğe alınır; kaynak hata verirse süresi dolmuş yanıt sunulur.
+ETag/304, Cache-Control ve sıkıştırma core.responses.render() ile yapılır.
+"""
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler
+
+from core import metrics
+from core.responses import CACHED, Reply, ResponseCache, render
+
+_cache = ResponseCache(maxsize=512)
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    # Alt sınıflar ayarlar: core.responses.CACHED anahtarı (None ise önbelleğe alınmaz)
+    route = None
+    methods = 'GET, OPTIONS'
+
+    def get(self, params):
+        """(durum kodu, sözlük ya da hazır JSON metni) döndürür; alt sınıflar yazar."""
+        return 405, {"error": "yöntem desteklenmiyor"}
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', self.methods)
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+    def do_GET(self):
+        self._started = time.perf_counter()
+        token = metrics.start_request()
+        try:
+            query = urllib.parse.urlparse(self.path).query
+            params = {name: values[0] for name, values in urllib.parse.parse_qs(query).items()}
+            try:
+                reply = self._reply(params)
+            except Exception as e:
+                reply = Reply(500, {"success": False, "error": str(e)})
+            self.send_reply(reply)
+        finally:
+            metrics.end_request(token)
+
+    def _reply(self, params):
+        if self.route is None:
+            return Reply(*self.get(params))
+        route = CACHED[self.route]
+        key = route.key(params)
+        return _cache.lookup(route, key) or _cache.store(route, key, *self.get(params))
+
+    def send_reply(self, reply):
+        status, data, headers = render(reply, self.headers.get('Accept-Encoding'), self.headers.get('If-None-Match'))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(data)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if metrics.server_timing_enabled(self.headers):
+            self.send_header('Server-Timing', metrics.server_timing(total=time.perf_counter() - self._started))
+        self.end_headers()
+        self.wfile.write(data)
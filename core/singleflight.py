@@ -0,0 +1,129 @@
+"""Aynı anahtarlı eşzamanlı çağrıları tek bir kaynak isteğinde birleştirme (single-flight).
+
+Bir çağrı sürerken aynı anahtarla gelen diğer çağrılar yeni istek açmaz;
+ilk çağrının sonucunu (ya da hatasını) bekleyip paylaşır. Birleştirme süreç
+içindedir; her gunicorn işçisi kendi uçuştaki çağrılarını tutar.
+
+Ortak çağrının kaynak istekleri başlatanın önceliğiyle sıraya girer
+(core.scheduler); etkileşimli bir çağrı arka plan işinin (ör. ön ısıtma)
+başlattığı çağrıya katılırsa çağrı etkileşimli önceliğe yükseltilir.
+"""
+import functools
+import inspect
+import threading
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error', 'waiters', 'flight')
+
+    def __init__(self, flight):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+        self.flight = flight
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """fn(*args, **kwargs) sonucunu döndürür; aynı key için tek çağrı yapılır."""
+        from core import scheduler
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(scheduler.flight())
+            else:
+                call.waiters += 1
+        if not leader:
+            scheduler.join(call.flight)
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            with scheduler.flying(call.flight):
+                call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+_group = SingleFlight()
+
+
+class AsyncSingleFlight:
+    """SingleFlight'ın asyncio karşılığı; çağrılar olay döngüsü başına birleştirilir."""
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        import asyncio
+        from core import scheduler
+        key = (id(asyncio.get_running_loop()), key)
+        call = self._calls.get(key)
+        if call is None:
+            flight = scheduler.flight()
+            # Görev bağlamı oluşturulurken kopyalanır: istekleri flight'ın önceliğiyle sıraya girer
+            with scheduler.flying(flight):
+                task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._calls[key] = (task, flight)
+            task.add_done_callback(functools.partial(self._done, key))
+        else:
+            task, flight = call
+            scheduler.join(flight)
+        # Bekleyenlerden biri iptal edilse de ortak çağrı diğerleri için sürer
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self):
+        return len(self._calls)
+
+
+_async_group = AsyncSingleFlight()
+
+
+def coalesce(fn):
+    """Aynı argümanlarla eşzamanlı yapılan çağrıları birleştiren dekoratör.
+
+    Anahtar, varsayılanları doldurulmuş argümanlardan üretilir; `timeout`
+    sonucu değiştirmediği için anahtara katılmaz. Eşyordam (async) işlevler
+    aynı olay döngüsündeki eşzamanlı çağrılarla birleştirilir.
+    """
+    signature = inspect.signature(fn)
+
+    def make_key(args, kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return (fn.__module__, fn.__qualname__,
+                tuple((name, value) for name, value in bound.arguments.items() if name != 'timeout'))
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            return await _async_group.do(make_key(args, kwargs), fn, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return _group.do(make_key(args, kwargs), fn, *args, **kwargs)
+    return wrapper
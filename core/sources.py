@@ -0,0 +1,401 @@
+"""Yargıtay (Bedesten), Danıştay ve AYM arama/karar istekleri ve sonuç ayrıştırma."""
+import functools
+import os
+import re
+import urllib.parse
+
+from core import corpus, http, metrics
+from core.responses import int_arg
+from core.singleflight import coalesce
+from core.text import b64_html_to_text, html_to_text
+
+# Kaynak adresleri; ölçüm ve testlerde yerel bir sunucuya yönlendirilebilir (bkz. bench/)
+BEDESTEN_BASE_URL = os.environ.get('BEDESTEN_BASE_URL', 'https://bedesten.adalet.gov.tr')
+DANISTAY_BASE_URL = os.environ.get('DANISTAY_BASE_URL', 'https://karararama.danistay.gov.tr')
+AYM_BASE_URL = os.environ.get('AYM_BASE_URL', 'https://normkararlarbilgibankasi.anayasa.gov.tr')
+
+BEDESTEN_SEARCH_URL = f"{BEDESTEN_BASE_URL}/emsal-karar/searchDocuments"
+BEDESTEN_DOCUMENT_URL = f"{BEDESTEN_BASE_URL}/emsal-karar/getDocumentContent"
+DANISTAY_SEARCH_URL = f"{DANISTAY_BASE_URL}/aramalist"
+DANISTAY_DOCUMENT_URL = DANISTAY_BASE_URL + "/getDokuman?id={doc_id}&arananKelime="
+
+metrics.register_source(BEDESTEN_BASE_URL, 'yargitay')
+metrics.register_source(DANISTAY_BASE_URL, 'danistay')
+metrics.register_source(AYM_BASE_URL, 'aym')
+
+BEDESTEN_HEADERS = {
+    'Content-Type': 'application/json',
+    'AdaletApplicationName': 'UyapMevzuat',
+    'Origin': 'https://mevzuat.adalet.gov.tr',
+    'Referer': 'https://mevzuat.adalet.gov.tr/'
+}
+
+DANISTAY_HEADERS = {
+    'Content-Type': 'application/json; charset=UTF-8',
+    'Accept': 'application/json, text/plain, */*',
+    'X-Requested-With': 'XMLHttpRequest'
+}
+
+DANISTAY_DOCUMENT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml',
+    'User-Agent': 'Mozilla/5.0'
+}
+
+# /document, /danistay/document ve /aym/document yanıtlarındaki en fazla karakter sayısı
+CONTENT_LIMITS = {'yargitay': 8000, 'danistay': 10000, 'aym': 20000}
+
+AYM_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml',
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Accept-Language': 'tr-TR,tr;q=0.9'
+}
+
+
+# ==================== YARGITAY (BEDESTEN) ====================
+# İstek gövdeleri/adresleri ve ayrıştırıcılar ayrıdır; senkron işlevler core.http,
+# ASGI modu (core.asources) core.aio ile aynı istekleri yapıp aynı ayrıştırıcıları kullanır.
+def yargitay_search_body(keyword, court='YARGITAYKARARI', page=1, page_size=10,
+                         birim=None, date_from=None, date_to=None):
+    data = {
+        "data": {
+            "pageSize": page_size,
+            "pageNumber": page,
+            "itemTypeList": [court],
+            "phrase": keyword,
+            "sortFields": ["KARAR_TARIHI"],
+            "sortDirection": "desc"
+        },
+        "applicationName": "UyapMevzuat",
+        "paging": True
+    }
+    if birim:
+        data["data"]["birimAdi"] = birim
+    if date_from:
+        data["data"]["kararTarihiStart"] = f"{date_from}T00:00:00.000Z"
+    if date_to:
+        data["data"]["kararTarihiEnd"] = f"{date_to}T23:59:59.999Z"
+    return data
+
+
+def parse_yargitay_search(response):
+    with metrics.parse('yargitay', 'search'):
+        result = response.json()
+        decisions = [
+            {
+                "id": d.get('documentId'),
+                "daire": d.get('birimAdi'),
+                "esasNo": d.get('esasNo'),
+                "kararNo": d.get('kararNo'),
+                "tarih": d.get('kararTarihiStr')
+            }
+            for d in result.get('data', {}).get('emsalKararList', [])
+        ]
+    return {"total": result.get('data', {}).get('total', 0), "decisions": decisions}
+
+
+def yargitay_document_body(doc_id):
+    return {"data": {"documentId": doc_id}, "applicationName": "UyapMevzuat"}
+
+
+def parse_yargitay_document(response, limit=None):
+    with metrics.parse('yargitay', 'document'):
+        content_b64 = response.json().get('data', {}).get('content', '')
+        return b64_html_to_text(content_b64, limit)
+
+
+@coalesce
+def yargitay_search(keyword, court='YARGITAYKARARI', page=1, page_size=10,
+                    birim=None, date_from=None, date_to=None, timeout=None):
+    """Bedesten searchDocuments: {"total", "decisions"} döndürür.
+
+    birim daireyle ("9. Hukuk Dairesi"), date_from/date_to (YYYY-MM-DD)
+    karar tarihiyle sınırlar.
+    """
+    data = yargitay_search_body(keyword, court, page, page_size, birim, date_from, date_to)
+    response = http.post_json(BEDESTEN_SEARCH_URL, data, headers=BEDESTEN_HEADERS, timeout=timeout)
+    return parse_yargitay_search(response)
+
+
+@coalesce
+def yargitay_document(doc_id, limit=None, timeout=None):
+    """Bedesten getDocumentContent: kararın temizlenmiş düz metni (en fazla `limit` karakter)."""
+    response = http.post_json(BEDESTEN_DOCUMENT_URL, yargitay_document_body(doc_id),
+                              headers=BEDESTEN_HEADERS, timeout=timeout)
+    return parse_yargitay_document(response, limit)
+
+
+# ==================== DANIŞTAY ====================
+def danistay_search_body(keyword, page=1, page_size=10):
+    return {
+        "data": {
+            "andKelimeler": [f'"{keyword}"'],
+            "orKelimeler": [],
+            "notAndKelimeler": [],
+            "notOrKelimeler": [],
+            "pageSize": page_size,
+            "pageNumber": page
+        }
+    }
+
+
+def parse_danistay_search(response):
+    decisions = []
+    with metrics.parse('danistay', 'search'):
+        result = response.json()
+        if result.get('data') and result['data'].get('data'):
+            for d in result['data']['data']:
+                decisions.append({
+                    "id": d.get('id'),
+                    "daire": d.get('dpiDaire'),
+                    "esasNo": d.get('esasNo'),
+                    "kararNo": d.get('kararNo'),
+                    "tarih": d.get('kararTarihi'),
+                    "konu": d.get('konu', '')[:200] if d.get('konu') else ''
+                })
+
+    return {"total": result.get('data', {}).get('recordsTotal', 0), "decisions": decisions}
+
+
+def parse_danistay_document(response, limit=None):
+    with metrics.parse('danistay', 'document'):
+        return html_to_text(response.body, limit)
+
+
+@coalesce
+def danistay_search(keyword, page=1, page_size=10, timeout=None):
+    """Danıştay aramalist: {"total", "decisions"} döndürür."""
+    response = http.post_json(DANISTAY_SEARCH_URL, danistay_search_body(keyword, page, page_size),
+                              headers=DANISTAY_HEADERS, timeout=timeout)
+    return parse_danistay_search(response)
+
+
+@coalesce
+def danistay_document(doc_id, limit=None, timeout=None):
+    """Danıştay getDokuman: kararın temizlenmiş düz metni (en fazla `limit` karakter)."""
+    url = DANISTAY_DOCUMENT_URL.format(doc_id=doc_id)
+    response = http.get(url, headers=DANISTAY_DOCUMENT_HEADERS, timeout=timeout)
+    return parse_danistay_document(response, limit)
+
+
+# ==================== ANAYASA MAHKEMESİ ====================
+# AYM /Ara sayfa başına karar sayısı
+AYM_PAGE_SIZE = 10
+
+# Karar kimliği, sitedeki karar sayfasının yoludur: "ND/2021/45"
+AYM_ID_RE = re.compile(r'^[A-Za-z]+(?:/[\w.-]+)+$')
+
+# Karar sayfasında metni içeren kapsayıcıların sınıf/id adları; bulunamazsa bütün sayfa kullanılır
+AYM_DOCUMENT_MARKERS = ('KararMetni', 'kararmetni', 'karar-metni')
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+@functools.lru_cache(maxsize=None)
+def _aym_xpaths():
+    # lxml yalnızca AYM sayfası ayrıştırılırken yüklenir (soğuk başlangıç)
+    from lxml import etree
+    return (
+        etree.XPath(f"//div[{_has_class('bulunankararsayisi')}]"),
+        etree.XPath(f"//div[{_has_class('birkarar')}]"),
+        etree.XPath(f".//div[{_has_class('bkararbaslik')}]"),
+        etree.XPath(f".//div[{_has_class('kararbilgileri')}]//text()"),
+        etree.XPath(".//a/@href"),
+    )
+
+
+_AYM_EK_NO_RE = re.compile(r'E\.\s*\d+/\d+\s*,\s*K\.\s*\d+/\d+')
+
+
+def parse_aym_search(html):
+    """AYM /Ara sonuç sayfasından toplam sayı ve kararları çıkarır.
+
+    Sayfanın yalnızca sonuç bölümünden itibaren olan kısmı lxml ile
+    ayrıştırılır; başlık, menü ve betikler için ağaç kurulmaz.
+    """
+    start = html.find('bulunankararsayisi')
+    if start < 0:
+        start = html.find('birkarar')
+    if start < 0:
+        return {"total": 0, "decisions": []}
+    import lxml.html
+    total_xpath, karar_xpath, baslik_xpath, bilgi_xpath, link_xpath = _aym_xpaths()
+    root = lxml.html.fromstring(html[html.rfind('<', 0, start):])
+
+    # Karar sayısını bul
+    total = 0
+    bulunan = total_xpath(root)
+    if bulunan:
+        match = re.search(r'(\d+)\s*Karar', bulunan[0].text_content())
+        if match:
+            total = int(match.group(1))
+
+    decisions = []
+    for karar in karar_xpath(root):
+        # Başlık ve E.K. numarası
+        ek_no = ""
+        baslik = baslik_xpath(karar)
+        if baslik:
+            ek_match = _AYM_EK_NO_RE.search(baslik[0].text_content())
+            if ek_match:
+                ek_no = ek_match.group(0)
+
+        # Karar bilgileri: metin parçalarının 3.'sü sonuç, 4.'sü tarih
+        parts = bilgi_xpath(karar)
+        sonuc = parts[2].strip() if len(parts) > 2 else ""
+        tarih = parts[3].replace('Karar Tarihi:', '').strip() if len(parts) > 3 else ""
+
+        # Link
+        doc_id = ""
+        doc_url = ""
+        links = link_xpath(karar)
+        if links:
+            doc_url = urllib.parse.urljoin(AYM_BASE_URL + '/', links[0])
+            doc_id = urllib.parse.urlsplit(doc_url).path.strip('/')
+
+        decisions.append({
+            "id": doc_id,
+            "esas_karar_no": ek_no,
+            "tarih": tarih,
+            "sonuc": sonuc,
+            "url": doc_url
+        })
+
+    return {"total": total, "decisions": decisions}
+
+
+def parse_aym_document(html, limit=None):
+    """AYM karar sayfasının düz metni; biliniyorsa yalnızca karar metni kapsayıcısından itibaren."""
+    for marker in AYM_DOCUMENT_MARKERS:
+        start = html.find(marker)
+        if start >= 0:
+            html = html[html.rfind('<', 0, start):]
+            break
+    return html_to_text(html, limit)
+
+
+def aym_search_url(keyword, page=1):
+    url = f"{AYM_BASE_URL}/Ara?KelimeAra[]={urllib.parse.quote(keyword)}"
+    if page > 1:
+        url += f"&page={page}"
+    return url
+
+
+def aym_document_url(doc_id):
+    if not AYM_ID_RE.match(doc_id) or '..' in doc_id:
+        raise ValueError(f"Geçersiz AYM karar kimliği: {doc_id}")
+    return f"{AYM_BASE_URL}/{doc_id}"
+
+
+def parse_aym_search_response(response):
+    with metrics.parse('aym', 'search'):
+        return parse_aym_search(response.text())
+
+
+def parse_aym_document_response(response, limit=None):
+    with metrics.parse('aym', 'document'):
+        return parse_aym_document(response.text(), limit)
+
+
+@coalesce
+def aym_search(keyword, page=1, timeout=None):
+    """AYM norm denetimi araması: {"total", "decisions"} döndürür (sayfa başına AYM_PAGE_SIZE)."""
+    response = http.get(aym_search_url(keyword, page), headers=AYM_HEADERS, timeout=timeout)
+    return parse_aym_search_response(response)
+
+
+@coalesce
+def aym_document(doc_id, limit=None, timeout=None):
+    """AYM karar sayfası: kararın düz metni (en fazla `limit` karakter)."""
+    response = http.get(aym_document_url(doc_id), headers=AYM_HEADERS, timeout=timeout)
+    return parse_aym_document_response(response, limit)
+
+
+# Kaynak adından arama ve karar metni fonksiyonu
+SEARCHES = {'yargitay': yargitay_search, 'danistay': danistay_search, 'aym': aym_search}
+DOCUMENTS = {'yargitay': yargitay_document, 'danistay': danistay_document, 'aym': aym_document}
+
+
+# ==================== ORTAK KARAR ŞEMASI ====================
+_AYM_EK_RE = re.compile(r'E\.\s*(\d+/\d+)\s*,\s*K\.\s*(\d+/\d+)')
+
+
+def normalize_decision(source, d):
+    """Kaynağa özgü karar kaydını ortak şemaya çevirir."""
+    if source == 'aym':
+        match = _AYM_EK_RE.search(d.get('esas_karar_no', ''))
+        return {
+            "source": source,
+            "id": d.get('id') or None,
+            "daire": "Anayasa Mahkemesi",
+            "esasNo": match.group(1) if match else None,
+            "kararNo": match.group(2) if match else None,
+            "tarih": d.get('tarih'),
+            "ozet": d.get('sonuc', ''),
+            "url": d.get('url')
+        }
+    return {
+        "source": source,
+        "id": d.get('id'),
+        "daire": d.get('daire'),
+        "esasNo": d.get('esasNo'),
+        "kararNo": d.get('kararNo'),
+        "tarih": d.get('tarih'),
+        "ozet": d.get('konu', ''),
+        "url": None
+    }
+
+
+# ==================== UÇ YANITLARI ====================
+# /search, /danistay ve /aym gövdeleri Flask uygulamasında, Vercel fonksiyonlarında
+# ve (core.asources.search_response ile) ASGI modunda ortaktır
+def search_request(source, args):
+    """Sorgu parametrelerinden {source}_search argümanları; keyword yoksa ValueError."""
+    keyword = args.get('keyword', '')
+    if not keyword:
+        raise ValueError("keyword parameter required")
+    request = {"keyword": keyword, "page": int_arg(args, 'page', 1)}
+    if source == 'yargitay':
+        request["court"] = args.get('court', 'YARGITAYKARARI')
+    elif source == 'aym':
+        request["page"] = max(request["page"], 1)
+    return request
+
+
+def search_payload(source, result, page):
+    """Kaynağın arama sonucundan uç yanıtı."""
+    if source == 'aym':
+        return {
+            "success": True,
+            "total": result['total'],
+            "page": page,
+            "page_size": AYM_PAGE_SIZE,
+            "decisions": result['decisions'],
+            "source": "Anayasa Mahkemesi"
+        }
+    payload = {"success": True, "total": result['total'], "decisions": result['decisions']}
+    if source == 'danistay':
+        payload["source"] = "Danıştay"
+    return payload
+
+
+def corpus_decisions(source, decisions):
+    """Yerel derleme eklenecek künyeler; AYM kayıtları ortak şemaya çevrilir."""
+    if source == 'aym':
+        return [normalize_decision(source, d) for d in decisions]
+    return decisions
+
+
+def search_response(source, args):
+    """/search, /danistay ve /aym yanıtı: (durum kodu, sözlük); künyeler yerel derleme eklenir."""
+    try:
+        request = search_request(source, args)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    try:
+        result = SEARCHES[source](**request)
+    except Exception as e:
+        return 200, {"success": False, "error": str(e)}
+    corpus.ingest_decisions(source, corpus_decisions(source, result['decisions']))
+    return 200, search_payload(source, result, request['page'])
@@ -0,0 +1,131 @@
+"""HTML'den düz metne tek geçişli, artımlı dönüştürücü.
+
+Etiketler ve script/style içerikleri atılır, boşluklar akış sırasında
+daraltılır ve blok öğeleri satır sonu olarak korunur. İstenen karakter
+sınırına ulaşıldığında girdinin geri kalanı hiç çözümlenmez.
+"""
+import base64
+import codecs
+from html.parser import HTMLParser
+
+CHUNK_SIZE = 64 * 1024
+
+# Paragraf/satır sonu üreten etiketler
+BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li',
+    'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'title',
+    'tr', 'ul',
+})
+
+# İçeriği tamamen atlanan etiketler
+SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template'})
+
+
+class TextExtractor(HTMLParser):
+    """feed() ile parça parça beslenen, sınırı dolunca duran metin çıkarıcı."""
+
+    def __init__(self, limit=None):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.done = False
+        self._parts = []
+        self._length = 0
+        self._skip = 0
+        self._space = False
+        self._break = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag in BLOCK_TAGS:
+            self._break = True
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._break = True
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in BLOCK_TAGS:
+            self._break = True
+
+    def handle_data(self, data):
+        if self._skip or self.done:
+            return
+        words = data.split()
+        if not words:
+            if data:
+                self._space = True
+            return
+
+        if self._length:
+            if self._break:
+                self._emit('\n')
+            elif self._space or data[0].isspace():
+                self._emit(' ')
+        self._emit(' '.join(words))
+        self._break = False
+        self._space = data[-1].isspace()
+
+    def _emit(self, text):
+        if self.limit is not None and self._length + len(text) >= self.limit:
+            text = text[:self.limit - self._length]
+            self.done = True
+        self._parts.append(text)
+        self._length += len(text)
+
+    def feed(self, data):
+        if not self.done:
+            super().feed(data)
+
+    def text(self):
+        return ''.join(self._parts).rstrip()
+
+
+def html_to_text(html, limit=None):
+    """HTML'i (str, bytes ya da str parçaları) düz metne çevirir."""
+    extractor = TextExtractor(limit)
+    if isinstance(html, (bytes, bytearray)):
+        html = _decode_chunks(html)
+    elif isinstance(html, str):
+        html = _str_chunks(html)
+    for chunk in html:
+        extractor.feed(chunk)
+        if extractor.done:
+            break
+    else:
+        extractor.close()
+    return extractor.text()
+
+
+def b64_html_to_text(content_b64, limit=None):
+    """Base64 kodlu HTML'i tamamını çözmeden, parça parça düz metne çevirir."""
+    return html_to_text(_b64_chunks(content_b64), limit)
+
+
+def _str_chunks(text):
+    for i in range(0, len(text), CHUNK_SIZE):
+        yield text[i:i + CHUNK_SIZE]
+
+
+def _decode_chunks(data):
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    view = memoryview(data)
+    for i in range(0, len(view), CHUNK_SIZE):
+        yield decoder.decode(view[i:i + CHUNK_SIZE])
+    yield decoder.decode(b'', final=True)
+
+
+def _b64_chunks(content_b64):
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    if isinstance(content_b64, str):
+        content_b64 = content_b64.encode('ascii', errors='ignore')
+    if b'\n' in content_b64 or b' ' in content_b64:
+        content_b64 = content_b64.translate(None, b' \t\r\n')
+    # 4'ün katı uzunluktaki parçalar bağımsız olarak çözülebilir
+    step = CHUNK_SIZE - CHUNK_SIZE % 4
+    for i in range(0, len(content_b64), step):
+        yield decoder.decode(base64.b64decode(content_b64[i:i + step]))
+    yield decoder.decode(b'', final=True)
@@ -0,0 +1,127 @@
+"""Sık kullanılan kanunların (KANUN_NUMARALARI) önceden indirilip ayrıştırılması.
+
+start() arka planda bir iş parçacığı başlatır: anlık görüntüsü olan kanunlar
+diskten yüklenir, olmayanlar sınırlı paralellikle indirilip ayrıştırılır.
+Sonrasında son denetimi MEVZUAT_REFRESH_INTERVAL saniyeden eski olan
+kanunlar kaynakla karşılaştırılır; yalnızca değişenler yeniden ayrıştırılır.
+
+MEVZUAT_SNAPSHOT_DIR'i paylaşan işçilerden yalnızca dizin kilidini alan
+kaynağa gider; diğerleri onun yazdığı anlık görüntüleri yükler.
+
+Zamanlanmış iş (cron) olarak da çalıştırılabilir:
+    python -m core.warmup --refresh
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows: dizin kilidi yok, her işçi kendisi denetler
+    fcntl = None
+
+from core import metrics, mevzuat, scheduler
+
+WARMUP_CONCURRENCY = int(os.environ.get('MEVZUAT_WARMUP_CONCURRENCY', 2))
+REFRESH_INTERVAL = int(os.environ.get('MEVZUAT_REFRESH_INTERVAL', 3600))
+
+_lock_file = None
+_started = False
+_start_lock = threading.Lock()
+
+
+def kanunlar():
+    """Ön ısıtılacak kanun numaraları (kısaltmaların tekrarları ayıklanmış)."""
+    return sorted(set(mevzuat.KANUN_NUMARALARI.values()), key=int)
+
+
+def _kaynak_sahibi():
+    """Bu süreç kaynağı denetleyecekse True; anlık görüntü dizinindeki kilidi bir kez alır ve tutar."""
+    global _lock_file
+    if not mevzuat.SNAPSHOT_DIR or fcntl is None or _lock_file is not None:
+        return True
+    try:
+        os.makedirs(mevzuat.SNAPSHOT_DIR, exist_ok=True)
+        f = open(os.path.join(mevzuat.SNAPSHOT_DIR, '.warmup.lock'), 'w')
+    except OSError:
+        return True
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return False
+    _lock_file = f
+    return True
+
+
+def _log_exception(message, *args):
+    # logging yalnızca hata olduğunda yüklenir (Vercel soğuk başlangıcı)
+    import logging
+    logging.getLogger(__name__).exception(message, *args)
+
+
+def warm(kanun_nolari=None, max_age=REFRESH_INTERVAL, concurrency=WARMUP_CONCURRENCY):
+    """Kanunları en fazla `concurrency` paralel indirmeyle ısıtır; kanun başına sonuç listesi döndürür."""
+    kanun_nolari = kanun_nolari or kanunlar()
+    fetch = _kaynak_sahibi()
+
+    def one(kanun_no):
+        start = time.perf_counter()
+        try:
+            # Ön ısıtma toplu iştir: kaynak bütçesinde etkileşimli isteklerin arkasında bekler
+            with scheduler.background():
+                durum = mevzuat.warm_kanun(kanun_no, max_age, fetch=fetch)
+            error = None
+        except Exception as e:
+            _log_exception("%s sayılı kanun ısıtılamadı", kanun_no)
+            durum, error = 'error', str(e)
+        metrics.MEVZUAT_REFRESH.inc(result=durum)
+        result = {"kanun_no": kanun_no, "result": durum, "seconds": round(time.perf_counter() - start, 3)}
+        if error:
+            result["error"] = error
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        return list(executor.map(one, kanun_nolari))
+
+
+def _loop(interval, concurrency):
+    # Yenileme zamanı gelen kanunlar aralığın dörtte biri içinde yakalanır
+    while True:
+        try:
+            warm(max_age=interval, concurrency=concurrency)
+        except Exception:
+            _log_exception("ön ısıtma turu tamamlanamadı")
+        time.sleep(max(interval / 4, 60))
+
+
+def start(interval=REFRESH_INTERVAL, concurrency=WARMUP_CONCURRENCY):
+    """Ön ısıtma ve periyodik yenilemeyi arka planda başlatır (süreç başına bir kez)."""
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_loop, args=(interval, concurrency), name='mevzuat-warmup', daemon=True).start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="KANUN_NUMARALARI kanunlarını indirip anlık görüntülerini yazar")
+    parser.add_argument('kanun', nargs='*', help="kanun numaraları ya da kısaltmaları (varsayılan: KANUN_NUMARALARI)")
+    parser.add_argument('--refresh', action='store_true', help="son denetim zamanına bakmadan kaynakla karşılaştır")
+    parser.add_argument('--concurrency', type=int, default=WARMUP_CONCURRENCY, help="paralel indirme sayısı")
+    args = parser.parse_args(argv)
+
+    kanun_nolari = [mevzuat.KANUN_NUMARALARI.get(k.upper(), k) for k in args.kanun]
+    results = warm(kanun_nolari or None, max_age=0 if args.refresh else REFRESH_INTERVAL,
+                   concurrency=args.concurrency)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 1 if any(r['result'] == 'error' for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
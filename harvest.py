@@ -0,0 +1,261 @@
+"""Yargıtay/Danıştay/AYM kararlarını toplu olarak yerel, sıkıştırılmış bir depoya indirir.
+
+Örnek:
+    python harvest.py --source yargitay --keyword "tazminat" --birim "9. Hukuk Dairesi" \\
+        --from 2023-01-01 --to 2023-12-31 --out corpus/ --workers 8 --rate 5
+
+Depo yapısı (--out dizini):
+    shard-00000.jsonl.gz   Her satır bir karar (künye + tam metin); yalnızca sona eklenir
+    ids.tsv                İndirilmiş kararların dizini: source, id, shard
+    checkpoint.json        Her iş için alınan sonuç sayısı ve sayfa boyutu
+
+Yarıda kesilen bir çalıştırma aynı parametrelerle yeniden başlatıldığında
+kaldığı sayfadan devam eder; dizinde bulunan kararlar tekrar indirilmez.
+Kaynak sayfa boyutunu sınırlıyorsa (istenenden kısa sayfa) sonraki sayfalar
+gelen satır sayısına göre istenir (federated.iter_search gibi); iş yalnızca
+boş sayfada ya da toplam sonuç sayısına ulaşıldığında tamamlanmış sayılır.
+Hata veren kararları tamamlamak için --restart ile yeniden çalıştırmak
+yeterlidir: sayfalar baştan dolaşılır, yalnızca eksik kararlar indirilir.
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core import federated, scheduler, sources
+
+SHARD_RECORDS = 5000
+
+
+class RateLimiter:
+    """İş parçacıkları arasında paylaşılan saniyede en fazla `rate` istek sınırı."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Store:
+    """gzip JSONL parçalarından ve id dizininden oluşan, sona eklemeli depo."""
+
+    def __init__(self, path, shard_records=SHARD_RECORDS):
+        self.path = path
+        self.shard_records = shard_records
+        os.makedirs(path, exist_ok=True)
+        self.index_path = os.path.join(path, 'ids.tsv')
+        self.ids = set()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    parts = line.rstrip('\n').split('\t')
+                    if len(parts) >= 2:
+                        self.ids.add((parts[0], parts[1]))
+        # Her çalıştırma yeni bir parçayla başlar; önceki çalıştırmanın yarım
+        # kalmış son gzip üyesi yeni kayıtları etkilemez.
+        self._shard = len(glob.glob(os.path.join(path, 'shard-*.jsonl.gz')))
+        self._count = 0
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def _shard_name(self):
+        return f'shard-{self._shard:05d}.jsonl.gz'
+
+    def append(self, records):
+        """Kayıtları tek bir gzip üyesi olarak yazar, ardından dizine ekler."""
+        if not records:
+            return
+        if self._count >= self.shard_records:
+            self._shard += 1
+            self._count = 0
+        name = self._shard_name()
+        with gzip.open(os.path.join(self.path, name), 'at', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(f"{record['source']}\t{record['id']}\t{name}\n")
+                self.ids.add((record['source'], record['id']))
+        self._count += len(records)
+
+
+def iter_store(path):
+    """Depodaki kayıtları okur; yarım kalmış son gzip üyeleri atlanır."""
+    seen = set()
+    for shard in sorted(glob.glob(os.path.join(path, 'shard-*.jsonl.gz'))):
+        try:
+            with gzip.open(shard, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    key = (record['source'], record['id'])
+                    if key not in seen:
+                        seen.add(key)
+                        yield record
+        except (EOFError, gzip.BadGzipFile):
+            continue
+
+
+def _load_checkpoint(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_checkpoint(path, checkpoint):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+@scheduler.background()
+def _search(args, page, page_size, limiter):
+    limiter.wait()
+    if args.source == 'yargitay':
+        return sources.yargitay_search(args.keyword, court=args.court, page=page, page_size=page_size,
+                                       birim=args.birim, date_from=args.date_from, date_to=args.date_to)
+    if args.source == 'aym':
+        return sources.aym_search(args.keyword, page=page)
+    return sources.danistay_search(args.keyword, page=page, page_size=page_size)
+
+
+@scheduler.background()
+def _fetch(args, decision, limiter):
+    fetch = sources.DOCUMENTS[args.source]
+    for attempt in range(args.retries + 1):
+        limiter.wait()
+        try:
+            text = fetch(decision['id'])
+            break
+        except Exception:
+            if attempt == args.retries:
+                raise
+            time.sleep(2 ** attempt)
+    return {
+        "source": args.source,
+        "id": str(decision['id']),
+        "daire": decision.get('daire'),
+        "esasNo": decision.get('esasNo'),
+        "kararNo": decision.get('kararNo'),
+        "tarih": decision.get('tarih'),
+        "text": text,
+        "fetched_at": time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def harvest(args, log=print):
+    store = Store(args.out)
+    checkpoint_path = os.path.join(args.out, 'checkpoint.json')
+    checkpoint = _load_checkpoint(checkpoint_path)
+    job = json.dumps([args.source, args.keyword, args.court, args.birim, args.date_from, args.date_to],
+                     ensure_ascii=False)
+    state = checkpoint.setdefault(job, {"page": 0, "done": False})
+    if state["done"] and not args.restart:
+        log(f"iş zaten tamamlanmış: {job}")
+        return state
+
+    limiter = RateLimiter(args.rate)
+    if args.restart:
+        page_size, received = args.page_size, 0
+    else:
+        # Eski kontrol noktalarında yalnızca sayfa numarası vardır
+        page_size = state.get("page_size", args.page_size)
+        received = state.get("received", state["page"] * page_size)
+    page = received // page_size + 1
+    pages = stored = skipped = failed = 0
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        # Bir sayfanın kararları indirilirken sonraki arama sayfası önceden istenir
+        next_page = pool.submit(_search, args, page, page_size, limiter)
+        while True:
+            result = next_page.result()
+            rows = result['decisions']
+            received += len(rows)
+            decisions = [sources.normalize_decision(args.source, d) for d in rows]
+            decisions = [d for d in decisions if d.get('id')]
+            pages += 1
+            exhausted = not rows or received >= result['total']
+            last = exhausted or (args.max_pages and pages >= args.max_pages)
+            if not last:
+                page_size = federated.next_page_size(page_size, len(rows))
+                next_page = pool.submit(_search, args, received // page_size + 1, page_size, limiter)
+
+            todo = [d for d in decisions if (args.source, str(d['id'])) not in store]
+            skipped += len(decisions) - len(todo)
+            futures = [pool.submit(_fetch, args, d, limiter) for d in todo]
+            records = []
+            for future in futures:
+                try:
+                    records.append(future.result())
+                except Exception as e:
+                    failed += 1
+                    log(f"  hata: {e}", file=sys.stderr)
+            store.append(records)
+            stored += len(records)
+
+            state["page"] = page
+            state["received"] = received
+            state["page_size"] = page_size
+            state["done"] = exhausted
+            state["total"] = result['total']
+            _save_checkpoint(checkpoint_path, checkpoint)
+            log(f"sayfa {page}: {len(records)} kaydedildi, {stored} toplam, "
+                f"{skipped} zaten vardı, {failed} hata (kaynakta {result['total']})")
+            if last:
+                break
+            page = received // page_size + 1
+
+    state.update(stored=stored, skipped=skipped, failed=failed)
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Yargıtay/Danıştay/AYM kararlarını yerel depoya toplu indir")
+    parser.add_argument('--source', choices=('yargitay', 'danistay', 'aym'), default='yargitay')
+    parser.add_argument('--keyword', required=True, help="arama ifadesi")
+    parser.add_argument('--court', default='YARGITAYKARARI', help="Bedesten itemType")
+    parser.add_argument('--birim', help="daire adı, örn. \"9. Hukuk Dairesi\" (yalnızca yargitay)")
+    parser.add_argument('--from', dest='date_from', help="karar tarihi başlangıcı YYYY-MM-DD (yalnızca yargitay)")
+    parser.add_argument('--to', dest='date_to', help="karar tarihi sonu YYYY-MM-DD (yalnızca yargitay)")
+    parser.add_argument('--out', default='corpus', help="depo dizini")
+    parser.add_argument('--workers', type=int, default=8, help="paralel indirme sayısı")
+    parser.add_argument('--rate', type=float, default=5.0, help="saniyede en fazla istek (0: sınırsız)")
+    parser.add_argument('--page-size', type=int, default=100,
+                        help="kaynaktan tek seferde istenen sonuç (aym için sabit 10)")
+    parser.add_argument('--max-pages', type=int, default=0, help="bu çalıştırmada en fazla sayfa (0: hepsi)")
+    parser.add_argument('--retries', type=int, default=2, help="başarısız karar için yeniden deneme")
+    parser.add_argument('--restart', action='store_true', help="kontrol noktasını yok sayıp baştan başla")
+    args = parser.parse_args(argv)
+    if args.source == 'aym':
+        args.page_size = sources.AYM_PAGE_SIZE
+
+    def log(message, file=sys.stdout):
+        print(message, file=file, flush=True)
+
+    state = harvest(args, log=log)
+    log(json.dumps(state, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
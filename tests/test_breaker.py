@@ -0,0 +1,150 @@
+"""core.breaker: devre durumları, bekleme süresinin katlanması ve uyarlanan zaman aşımı."""
+import pytest
+
+from core import breaker
+from core.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class Saat:
+    """Elle ilerletilen time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def saat(monkeypatch):
+    saat = Saat()
+    monkeypatch.setattr(breaker, 'time', saat)
+    monkeypatch.setattr(breaker, 'FAILURE_THRESHOLD', 3)
+    monkeypatch.setattr(breaker, 'COOLDOWN', 10.0)
+    monkeypatch.setattr(breaker, 'MAX_COOLDOWN', 35.0)
+    return saat
+
+
+def acik():
+    devre = CircuitBreaker('deneme')
+    for _ in range(breaker.FAILURE_THRESHOLD):
+        devre.before(5)
+        devre.failure()
+    return devre
+
+
+def test_esik_dolunca_acilir(saat):
+    devre = CircuitBreaker('deneme')
+    for _ in range(breaker.FAILURE_THRESHOLD - 1):
+        devre.before(5)
+        devre.failure()
+    assert devre.state == CLOSED
+    devre.before(5)
+    devre.failure()
+    assert devre.state == OPEN
+
+    saat.now += 4
+    with pytest.raises(CircuitOpenError) as hata:
+        devre.before(5)
+    assert hata.value.retry_after == pytest.approx(6)
+
+
+def test_basari_hata_sayacini_sifirlar(saat):
+    devre = CircuitBreaker('deneme')
+    for _ in range(breaker.FAILURE_THRESHOLD - 1):
+        devre.failure()
+    devre.success(0.1)
+    devre.failure()
+    assert devre.state == CLOSED
+
+
+def test_yari_acikta_tek_deneme(saat):
+    devre = acik()
+    saat.now += 10
+    devre.before(5)
+    assert devre.state == HALF_OPEN
+    # Deneme sürerken ikinci istek reddedilir
+    with pytest.raises(CircuitOpenError):
+        devre.before(5)
+    # Takılı kalan deneme zaman aşımı kadar sonra bırakılır
+    saat.now += 5
+    devre.before(5)
+    assert devre.state == HALF_OPEN
+
+
+def test_deneme_basarili_olursa_kapanir(saat):
+    devre = acik()
+    saat.now += 10
+    devre.before(5)
+    devre.success(0.2)
+    assert devre.state == CLOSED
+    assert devre.cooldown == 10
+    devre.before(5)
+
+
+def test_deneme_basarisizsa_bekleme_katlanir(saat):
+    devre = acik()
+    beklemeler = []
+    for _ in range(4):
+        saat.now += devre.cooldown
+        devre.before(5)
+        devre.failure()
+        assert devre.state == OPEN
+        beklemeler.append(devre.cooldown)
+    # MAX_COOLDOWN ile sınırlı
+    assert beklemeler == [20, 35, 35, 35]
+
+    saat.now += 34
+    with pytest.raises(CircuitOpenError):
+        devre.before(5)
+    saat.now += 1
+    devre.before(5)
+    devre.success(0.1)
+    assert (devre.state, devre.cooldown) == (CLOSED, 10)
+
+
+def test_release_denemeyi_birakir(saat):
+    devre = acik()
+    saat.now += 10
+    devre.before(5)
+    # 4xx gibi devreyi etkilemeyen sonuç: durum değişmez, yeni deneme yapılabilir
+    devre.release()
+    assert devre.state == HALF_OPEN
+    devre.before(5)
+
+
+def test_zaman_asimi_gecikmeye_uyar(saat, monkeypatch):
+    monkeypatch.setattr(breaker, 'MIN_TIMEOUT', 2.0)
+    monkeypatch.setattr(breaker, 'TIMEOUT_FACTOR', 3.0)
+    devre = CircuitBreaker('deneme')
+    for _ in range(breaker.MIN_SAMPLES - 1):
+        devre.success(1.0)
+    # Yeterli örnek yokken ayarlı süre
+    assert devre.timeout(30) == 30
+    devre.success(1.0)
+    assert devre.timeout(30) == 3.0
+    assert devre.timeout(2.5) == 2.5
+
+    hizli = CircuitBreaker('hizli')
+    for _ in range(breaker.MIN_SAMPLES):
+        hizli.success(0.01)
+    assert hizli.timeout(30) == 2.0
+
+
+class _HTTPHatasi(Exception):
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+@pytest.mark.parametrize('hata, sayilir', [
+    (_HTTPHatasi(503), True),
+    (_HTTPHatasi(500), True),
+    (_HTTPHatasi(404), False),
+    (_HTTPHatasi(429), False),
+    (TimeoutError(), True),
+    (ConnectionResetError(), True),
+    (ValueError(), False),
+])
+def test_is_failure(hata, sayilir):
+    assert breaker.is_failure(hata) is sayilir
@@ -0,0 +1,65 @@
+"""core.citations: karar metnindeki madde atıfları ve ters dizin."""
+import pytest
+
+from core import citations
+
+
+def atif(kanun_no, kanun, madde, fikra=None, bent=None):
+    return {"kanun_no": kanun_no, "kanun": kanun, "madde": madde, "fikra": fikra, "bent": bent}
+
+
+@pytest.mark.parametrize('metin, beklenen', [
+    ("5237 sayılı TCK'nın 141. maddesi", [atif('5237', 'TCK', '141')]),
+    ("HMK m. 353/1-b", [atif('6100', 'HMK', '353', 1, 'b')]),
+    ("Türk Borçlar Kanunu'nun 49 ve 50. maddeleri", [atif('6098', 'TBK', '49'), atif('6098', 'TBK', '50')]),
+    ("İİK'nın geçici 1. maddesi", [atif('2004', 'İİK', 'gecici-1')]),
+    ("İş Kanunu'nun 25/II-e maddesi", [atif('4857', 'İK', '25', 2, 'e')]),
+    ("TCK'nın 53 üncü maddesinin 1. fıkrasının (b) bendi", [atif('5237', 'TCK', '53', 1, 'b')]),
+    ("TCK'nın 5/A maddesi", [atif('5237', 'TCK', '5/A')]),
+    ("6100 sayılı Kanun'un 353. maddesi", [atif('6100', 'HMK', '353')]),
+    ("TCK'nın 61 ve 62/1. maddeleri", [atif('5237', 'TCK', '61'), atif('5237', 'TCK', '62', 1)]),
+])
+def test_atif_bicimleri(metin, beklenen):
+    assert citations.extract_citations(metin) == beklenen
+
+
+def test_metindeki_sira_ve_tekrarlar():
+    metin = ("Sanığın eylemi TCK m. 141/2 kapsamındadır. HMK m. 353 uyarınca karar verilmiş, "
+             "TCK m. 141/2 yeniden tartışılmıştır.")
+    assert citations.extract_citations(metin) == [atif('5237', 'TCK', '141', 2), atif('6100', 'HMK', '353')]
+
+
+@pytest.mark.parametrize('metin', ["", "Atıf içermeyen karar metni.", "Kanunun 5/A maddesi"])
+def test_atif_yok(metin):
+    assert citations.extract_citations(metin) == []
+
+
+@pytest.mark.parametrize('madde_no, anahtar', [
+    ('141', '141'), ('5/a', '5/A'), ('gecici-1', 'gecici-1'), ('ek 3', 'ek-3'), ('x', None),
+])
+def test_madde_anahtari(madde_no, anahtar):
+    assert citations.madde_anahtari(madde_no) == anahtar
+
+
+def test_format_citation():
+    assert citations.format_citation(atif('5237', 'TCK', '141', 1, 'b')) == 'TCK m. 141/1-b'
+    assert citations.format_citation(atif('9999', None, '3')) == '9999 s. Kanun m. 3'
+
+
+def test_ters_dizin():
+    dizin = citations.CitationIndex()
+    dizin.add('yargitay', '1', citations.extract_citations("TCK'nın 141. maddesi ve TCK m. 141/2"), now=1)
+    dizin.add('danistay', '7', citations.extract_citations("TCK m. 141/2 ve HMK m. 353"), now=2)
+    # Aynı atıf yeniden eklenince tekrarlanmaz, ilk eklenme zamanı korunur
+    dizin.add('yargitay', '1', citations.extract_citations("TCK'nın 141. maddesi"), now=3)
+
+    # En son eklenen önce
+    sonuc = dizin.decisions('5237', '141')
+    assert sonuc == {"total": 2, "decisions": [
+        {"source": "danistay", "id": "7", "atiflar": ['TCK m. 141/2']},
+        {"source": "yargitay", "id": "1", "atiflar": ['TCK m. 141', 'TCK m. 141/2']},
+    ]}
+    assert dizin.decisions('5237', '141', fikra=2)['total'] == 2
+    assert dizin.decisions('5237', '141', limit=1, offset=1)['decisions'][0]['id'] == '1'
+    assert dizin.citations('danistay', '7') == [atif('5237', 'TCK', '141', 2), atif('6100', 'HMK', '353')]
+    assert dizin.count() == 4
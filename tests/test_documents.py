@@ -0,0 +1,124 @@
+"""core.documents: aralık parametreleri ve tam metinden parça okuma."""
+import pytest
+
+from core import documents, sources
+
+METIN = "Birinci paragraf.\n\nİkinci paragraf burada.\nÜçüncü.\n"
+
+
+@pytest.fixture
+def entry():
+    return {"text": METIN, "paragraphs": documents.paragraph_offsets(METIN)}
+
+
+def test_paragraf_ofsetleri():
+    assert documents.paragraph_offsets(METIN) == [[0, 17], [19, 42], [43, 50]]
+    assert documents.paragraph_offsets("") == []
+
+
+@pytest.mark.parametrize('args, beklenen', [
+    ({}, None),
+    ({'offset': '10'}, (10, None, None)),
+    ({'length': '5'}, (0, 5, None)),
+    ({'offset': '', 'length': ''}, (0, None, None)),
+    ({'para': '2'}, (0, None, (2, 2))),
+    ({'para': ' 1 - 3 ', 'offset': '4', 'length': '6'}, (4, 6, (1, 3))),
+])
+def test_parse_range(args, beklenen):
+    assert documents.parse_range(args) == beklenen
+
+
+@pytest.mark.parametrize('args, hata', [
+    ({'offset': 'x'}, 'tam sayı'),
+    ({'length': '1.5'}, 'tam sayı'),
+    ({'offset': '-1'}, 'negatif'),
+    ({'length': '0'}, 'negatif'),
+    ({'length': '-3'}, 'negatif'),
+    ({'para': '0'}, 'para'),
+    ({'para': '3-2'}, 'para'),
+    ({'para': '2-'}, 'para'),
+    ({'para': 'a'}, 'para'),
+])
+def test_parse_range_gecersiz(args, hata):
+    with pytest.raises(ValueError, match=hata):
+        documents.parse_range(args)
+
+
+def test_offset_length(entry):
+    parca = documents.read_range(entry, 19, 7)
+    assert parca['content'] == 'İkinci '
+    assert (parca['offset'], parca['length'], parca['total_length'], parca['next_offset']) == (19, 7, 51, 26)
+
+
+def test_metnin_sonu(entry):
+    parca = documents.read_range(entry, 40, 100)
+    assert parca['content'] == 'a.\nÜçüncü.\n'
+    assert parca['next_offset'] is None
+    # Metnin dışındaki ofset boş parça döndürür
+    parca = documents.read_range(entry, 500)
+    assert (parca['content'], parca['offset'], parca['length'], parca['next_offset']) == ('', 51, 0, None)
+
+
+def test_varsayilan_ve_en_fazla_uzunluk(entry, monkeypatch):
+    assert documents.read_range(entry, default_length=5)['content'] == 'Birin'
+    monkeypatch.setattr(documents, 'MAX_RANGE_LENGTH', 8)
+    parca = documents.read_range(entry, 0, 1000)
+    assert (parca['content'], parca['next_offset']) == ('Birinci ', 8)
+
+
+def test_paragraf_araligi(entry):
+    parca = documents.read_range(entry, para=(2, 3))
+    assert parca['content'] == 'İkinci paragraf burada.\nÜçüncü.'
+    assert (parca['offset'], parca['next_offset']) == (0, None)
+
+    # offset paragraf başına göredir, parça paragrafın sonunda biter
+    parca = documents.read_range(entry, 7, 100, para=(2, 2))
+    assert (parca['content'], parca['offset'], parca['next_offset']) == ('paragraf burada.', 7, None)
+    parca = documents.read_range(entry, 100, para=(2, 2))
+    assert (parca['content'], parca['offset'], parca['next_offset']) == ('', 23, None)
+
+
+def test_paragraf_icinde_sayfalama(entry):
+    # next_offset de paragraf başına göredir; aynı para ile sonraki parçayı verir
+    parca = documents.read_range(entry, 0, 10, para=(2, 3))
+    assert (parca['content'], parca['offset'], parca['next_offset']) == ('İkinci par', 0, 10)
+    parca = documents.read_range(entry, parca['next_offset'], 10, para=(2, 3))
+    assert (parca['content'], parca['offset'], parca['next_offset']) == ('agraf bura', 10, 20)
+    parca = documents.read_range(entry, 20, 100, para=(2, 3))
+    assert (parca['content'], parca['next_offset']) == ('da.\nÜçüncü.', None)
+
+
+def test_paragraf_sinirlari(entry):
+    # Son paragraftan büyük bitiş son paragrafa indirilir
+    assert documents.read_range(entry, para=(3, 9))['content'] == 'Üçüncü.'
+    # Olmayan paragraf boş parça
+    parca = documents.read_range(entry, para=(4, 5))
+    assert (parca['content'], parca['offset'], parca['next_offset']) == ('', 0, None)
+
+
+def test_document_response_gecersiz_aralik(monkeypatch):
+    def kaynak(doc_id, limit=None, timeout=None):
+        raise AssertionError('geçersiz istekte kaynağa gidilmemeli')
+
+    monkeypatch.setitem(sources.DOCUMENTS, 'yargitay', kaynak)
+    assert documents.document_response('yargitay', '1', {'offset': '-5'}) == (
+        400, {"error": "offset negatif, length sıfır ya da negatif olamaz"})
+    assert documents.document_response('yargitay', '', {}) == (400, {"error": "id parameter required"})
+    assert documents.document_response('aym', '../etc', {})[0] == 400
+
+
+def test_document_response_tam_metni_bir_kez_indirir(monkeypatch):
+    cagrilar = []
+
+    def kaynak(doc_id, limit=None, timeout=None):
+        cagrilar.append((doc_id, limit))
+        return 'x' * 9000
+
+    monkeypatch.setitem(sources.DOCUMENTS, 'yargitay', kaynak)
+    monkeypatch.setattr(documents, 'index_fetched', lambda *args: None)
+    code, payload = documents.document_response('yargitay', 'test-tam-metin', {})
+    assert code == 200 and len(payload['content']) == sources.CONTENT_LIMITS['yargitay']
+    code, payload = documents.document_response('yargitay', 'test-tam-metin', {'offset': '8990'})
+    assert (payload['content'], payload['total_length'], payload['next_offset']) == ('x' * 10, 9000, None)
+    # Sınırsız tek indirme; aralık önbellekteki kopyadan kesilir
+    assert cagrilar == [('test-tam-metin', None)]
@@ -0,0 +1,23 @@
+"""core.federated: /search/all parametreleri ve kısa sayfada sayfa boyutu."""
+import pytest
+
+from core import federated
+
+
+def test_search_all_request():
+    request = federated.search_all_request({'keyword': 'tazminat', 'timeout': '2.5', 'sources': 'aym,x'})
+    assert (request['deadline'], request['only']) == (2.5, ['aym'])
+    # Üstten MAX_DEADLINE ile sınırlı
+    request = federated.search_all_request({'keyword': 'tazminat', 'timeout': '1e9'})
+    assert (request['deadline'], request['only']) == (federated.MAX_DEADLINE, federated.SOURCES)
+
+
+@pytest.mark.parametrize('timeout', ['x', '', 'nan', 'inf', '-inf', '0', '-1'])
+def test_gecersiz_timeout(timeout):
+    code, payload = federated.search_all_response({'keyword': 'tazminat', 'timeout': timeout})
+    assert (code, payload) == (400, {"error": "timeout saniye cinsinden pozitif bir sayı olmalı"})
+
+
+@pytest.mark.parametrize('page_size, received, beklenen', [(100, 20, 20), (100, 100, 100), (100, 0, 100)])
+def test_next_page_size(page_size, received, beklenen):
+    assert federated.next_page_size(page_size, received) == beklenen
@@ -0,0 +1,49 @@
+"""harvest.py: sayfa boyutunu sınırlayan kaynakta toplu indirme ve kontrol noktası."""
+import argparse
+import json
+import os
+
+import pytest
+
+import harvest
+from bench import fixtures, upstream
+from core import sources
+
+
+@pytest.fixture
+def kaynak(monkeypatch):
+    """Sayfa boyutunu 20 ile sınırlayan, 95 sonuçlu yerel Danıştay."""
+    server, url = upstream.start(max_page_size=20)
+    monkeypatch.setattr(fixtures, 'DANISTAY_TOTAL', 95)
+    fixtures.danistay_search.cache_clear()
+    monkeypatch.setattr(sources, 'DANISTAY_SEARCH_URL', f"{url}/aramalist")
+    monkeypatch.setattr(sources, 'DANISTAY_DOCUMENT_URL', url + "/getDokuman?id={doc_id}&arananKelime=")
+    yield
+    server.shutdown()
+    server.server_close()
+    fixtures.danistay_search.cache_clear()
+
+
+def calistir(out, **kwargs):
+    args = argparse.Namespace(source='danistay', keyword='tazminat', court='YARGITAYKARARI', birim=None,
+                              date_from=None, date_to=None, out=str(out), workers=4, rate=0, page_size=100,
+                              max_pages=0, retries=0, restart=False)
+    vars(args).update(kwargs)
+    return harvest.harvest(args, log=lambda *a, **k: None)
+
+
+def test_kisa_sayfalar_butun_sonuclari_indirir(kaynak, tmp_path):
+    state = calistir(tmp_path)
+    assert (state['stored'], state['failed'], state['done']) == (95, 0, True)
+    assert len(list(harvest.iter_store(str(tmp_path)))) == 95
+    with open(os.path.join(tmp_path, 'checkpoint.json'), encoding='utf-8') as f:
+        kayit = next(iter(json.load(f).values()))
+    assert (kayit['received'], kayit['page_size'], kayit['done']) == (95, 20, True)
+
+
+def test_yarida_kalan_is_kaldigi_yerden_devam_eder(kaynak, tmp_path):
+    state = calistir(tmp_path, max_pages=2)
+    assert (state['stored'], state['done']) == (40, False)
+    state = calistir(tmp_path)
+    assert (state['stored'], state['skipped'], state['done']) == (55, 0, True)
+    assert len(list(harvest.iter_store(str(tmp_path)))) == 95
@@ -0,0 +1,151 @@
+"""core.mevzuat: yapı ayrıştırma, ofset tablosu ve madde seçimi."""
+import pytest
+
+from core import mevzuat
+
+METIN = "\n".join([
+    "BİRİNCİ KİTAP",
+    "Genel Hükümler",
+    "BİRİNCİ KISIM",
+    "Temel İlkeler",
+    "Amaç",
+    "MADDE 1- (1) Bu Kanunun amacı kişi hak ve özgürlüklerini korumaktır.",
+    "(2) Kanun şu hallerde uygulanır:",
+    "a) Türkiye'de işlenen suçlarda,",
+    "b) Yabancı ülkede işlenen suçlarda;",
+    "1. vatandaş tarafından,",
+    "2. yabancı tarafından.",
+    "Tanımlar",
+    "MADDE 2- Tek fıkralı madde",
+    "ikinci satırıyla devam eder.",
+    "Kapsam",
+    "MADDE 5- Beşinci madde.",
+    "Madde 5/A – Beşinci maddeden sonra eklenen madde.",
+    "MADDE 5/B- İkinci ek madde.",
+    "İKİNCİ KISIM",
+    "Uygulama",
+    "Uygulama alanı",
+    "MADDE 6- Altıncı madde.",
+    "MADDE 10- Onuncu madde.",
+    "MADDE 11- On birinci madde.",
+    "MADDE 12- On ikinci madde.",
+    "EK MADDE 1- Ek birinci madde.",
+    "GEÇİCİ MADDE 1- Geçici birinci madde.",
+])
+
+
+@pytest.fixture(scope='module')
+def kanun():
+    return mevzuat._kanun_from_text('9999', 'DENEME KANUNU', METIN)
+
+
+def numaralar(kanun, konumlar):
+    return [kanun.maddeler[i]['no'] for i in konumlar]
+
+
+def test_maddeler_ve_yapi(kanun):
+    assert [m['no'] for m in kanun.maddeler] == [
+        '1', '2', '5', '5/A', '5/B', '6', '10', '11', '12', 'ek-1', 'gecici-1']
+    birinci, ikinci = kanun.maddeler[0], kanun.maddeler[1]
+    assert birinci['baslik'] == 'Amaç'
+    assert birinci['kitap'] == 'BİRİNCİ KİTAP'
+    assert birinci['kisim'] == 'BİRİNCİ KISIM'
+    assert ikinci['baslik'] == 'Tanımlar'
+    assert kanun.maddeler[5]['kisim'] == 'İKİNCİ KISIM'
+    assert kanun.maddeler[5]['baslik'] == 'Uygulama alanı'
+
+    assert [(d['tur'], d['ad'], d['baslik'], d['ilk_madde'], d['son_madde']) for d in kanun.yapi] == [
+        ('kitap', 'BİRİNCİ KİTAP', 'Genel Hükümler', '1', 'gecici-1'),
+        ('kisim', 'BİRİNCİ KISIM', 'Temel İlkeler', '1', '5/B'),
+        ('kisim', 'İKİNCİ KISIM', 'Uygulama', '6', 'gecici-1'),
+    ]
+
+
+def test_fikra_ve_bentler(kanun):
+    fikralar = kanun.maddeler[0]['fikralar']
+    assert [f['no'] for f in fikralar] == [1, 2]
+    assert fikralar[0]['text'] == 'Bu Kanunun amacı kişi hak ve özgürlüklerini korumaktır.'
+    bentler = fikralar[1]['bentler']
+    assert [b['no'] for b in bentler] == ['a', 'b']
+    assert [(a['no'], a['text']) for a in bentler[1]['alt_bentler']] == [
+        (1, 'vatandaş tarafından,'), (2, 'yabancı tarafından.')]
+
+    # Numarasız tek fıkra, devam satırlarıyla birleşir
+    tek = kanun.maddeler[1]['fikralar']
+    assert tek == [{"no": None, "text": "Tek fıkralı madde ikinci satırıyla devam eder.", "bentler": []}]
+
+
+def test_ofsetler_madde_metnini_verir(kanun):
+    for m in kanun.maddeler:
+        start, end = m['ofset']
+        assert kanun.full_text[start:end] == m['text']
+    assert kanun.madde('2') == 'MADDE 2- Tek fıkralı madde ikinci satırıyla devam eder.'
+
+
+@pytest.mark.parametrize('madde_no, beklenen', [
+    ('1', 'MADDE 1-'),
+    ('5/A', 'Madde 5/A –'),
+    ('5/a', 'Madde 5/A –'),
+    ('5 / b', 'MADDE 5/B-'),
+    ('ek-1', 'EK MADDE 1-'),
+    ('ek 1', 'EK MADDE 1-'),
+    ('gecici-1', 'GEÇİCİ MADDE 1-'),
+    ('geçici-1', 'GEÇİCİ MADDE 1-'),
+])
+def test_madde(kanun, madde_no, beklenen):
+    assert kanun.madde(madde_no).startswith(beklenen)
+
+
+@pytest.mark.parametrize('madde_no', ['3', '5/C', 'ek-2', 'gecici-2', 'abc', ''])
+def test_olmayan_madde(kanun, madde_no):
+    assert kanun.madde(madde_no) is None
+
+
+def test_ara_maddeler_sirada(kanun):
+    # "5/A" ve "5/B" 5 ile 6 arasında sıralanır; 5 aralığı ara maddeleri de kapsar
+    assert numaralar(kanun, kanun.aralik(5, 5)) == ['5', '5/A', '5/B']
+    assert numaralar(kanun, kanun.aralik(5, 6)) == ['5', '5/A', '5/B', '6']
+    assert numaralar(kanun, kanun.aralik(3, 4)) == []
+    assert numaralar(kanun, kanun.aralik(11)) == ['11', '12']
+    assert numaralar(kanun, kanun.aralik(bitis=2)) == ['1', '2']
+    assert numaralar(kanun, kanun.aralik(tur='ek')) == ['ek-1']
+
+
+def test_secim(kanun):
+    konumlar, bulunamayan = kanun.secim('1,5,10-12')
+    assert numaralar(kanun, konumlar) == ['1', '5', '10', '11', '12']
+    assert bulunamayan == []
+
+
+def test_secim_istek_sirasi_ve_tekrarlar(kanun):
+    konumlar, bulunamayan = kanun.secim('12, 5/A, 1, 5-6, 12, gecici-1')
+    assert numaralar(kanun, konumlar) == ['12', '5/A', '1', '5', '5/B', '6', 'gecici-1']
+    assert bulunamayan == []
+
+
+def test_secim_bulunamayanlar(kanun):
+    konumlar, bulunamayan = kanun.secim('2,99,3-4,x,,5/C')
+    assert numaralar(kanun, konumlar) == ['2']
+    assert bulunamayan == ['99', '3-4', 'x', '5/C']
+
+
+def test_basliksiz_maddeler():
+    # Madde başından önceki fıkra, bent ya da cümle sonraki maddenin başlığı sayılmaz
+    kanun = mevzuat._kanun_from_text('9998', 'BAŞLIKSIZ KANUN', "\n".join([
+        "MADDE 1- (1) Birinci fıkra.",
+        "(2) İkinci fıkra:",
+        "a) birinci bent,",
+        "b) ikinci bent.",
+        "MADDE 2- İkinci madde",
+        "tek cümleyle biter.",
+        "MADDE 3- (1) Üçüncü madde.",
+        "Yürürlük",
+        "MADDE 4- Dördüncü madde.",
+    ]))
+    assert [m['baslik'] for m in kanun.maddeler] == ['', '', '', 'Yürürlük']
+    bentler = kanun.maddeler[0]['fikralar'][1]['bentler']
+    assert [(b['no'], b['text']) for b in bentler] == [('a', 'birinci bent,'), ('b', 'ikinci bent.')]
+    assert kanun.madde('2') == 'MADDE 2- İkinci madde tek cümleyle biter.'
+    for m in kanun.maddeler:
+        start, end = m['ofset']
+        assert kanun.full_text[start:end] == m['text']